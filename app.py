@@ -1,20 +1,16 @@
+# Only what every page needs is imported here. pandas, plotly and the model,
+# batch scoring and feature store modules (scipy) are imported by the pages
+# and functions that use them, so a new server process renders its first
+# page without loading them (see benchmarks/bench_app_startup.py).
 import streamlit as st
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
 import time
-import joblib
+import hashlib
 import os
-import nltk
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-import plotly.express as px
-import plotly.graph_objects as go
-from PIL import Image
-import base64
+import tempfile
+import weakref
+from text_clean import CLEAN_CACHE, clean_texts
+from lru_cache import LRUCache
 
 # Set page config for a better UI experience
 st.set_page_config(
@@ -538,123 +534,280 @@ def add_header():
     </div>
     """, unsafe_allow_html=True)
 
-# Function to clean text (same as in notebook)
-@st.cache_data
-def clean_text(text):
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'<.*?>', ' ', text)            # remove HTML tag
-    text = re.sub(r"n['']t", " not", text)        # convert n't -> not
-    text = re.sub(r'[^a-zA-Z\s]', ' ', text)      # keep letters/space
-    text = text.lower()                           # lowercase
-    text = re.sub(r'\s+', ' ', text).strip()      # remove extra spaces
-    return text
+# Display names of the evaluated models
+MODEL_DISPLAY_NAMES = {
+    "svm": "Support Vector Machine",
+    "nb": "Multinomial Naive Bayes",
+    "lr": "Logistic Regression Model"
+}
+
+# Test accuracy (%) of the notebook run the shipped models come from, shown
+# until an evaluation run exists (see evaluation.py)
+NOTEBOOK_ACCURACIES = {"svm": 78.27, "nb": 73.57, "lr": 78.17}
+
+# Confusion matrices (rows actual, columns predicted) of the same notebook run
+NOTEBOOK_CONFUSION_MATRICES = {
+    "svm": [[7822, 1011, 167], [1210, 6723, 1067], [203, 876, 6921]],
+    "nb": [[7520, 1100, 380], [1500, 6300, 1200], [480, 960, 6560]],
+    "lr": [[7792, 1031, 177], [1190, 6703, 1107], [223, 846, 6931]]
+}
+NOTEBOOK_CONFUSION_LABELS = ["positive", "neutral", "negative"]
+
+# Number of predictions kept in the cross-session prediction cache
+PREDICTION_CACHE_SIZE = int(os.environ.get("SENTIMENT_PREDICTION_CACHE_SIZE", "20000"))
 
-# Download NLTK resources
+# Load state of every artifact, shared by all sessions of this server process
 @st.cache_resource
-def download_nltk_resources():
+def get_model_status():
+    return {}
+
+# Load one artifact (see model_store.load_artifact: NumPy-only runtime for
+# models and the vectorizer exported by export_linear.py, the notebook's
+# pickle otherwise), shared by all sessions.
+# version (model_store.artifact_version) is only part of the cache key, so
+# re-exporting or replacing a pickle reloads the model and invalidates its
+# cached predictions.
+# Failures raise, so they are not cached and the next rerun retries.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_artifact(key, version):
+    from model_store import load_artifact
+    return load_artifact(key, mmap_mode="r")
+
+# Load a single model (or the vectorizer) the first time a page needs it
+def load_model(key):
+    from model_store import artifact_version
+    model_status = get_model_status()
+    start = time.perf_counter()
     try:
-        nltk.download('stopwords', quiet=True)
-    except:
-        st.warning("Could not download NLTK stopwords. Some functionality may be limited.")
+        version = artifact_version(key)
+        model = _load_artifact(key, version)
+    except Exception as e:
+        model_status[key] = {"loaded": False, "error": str(e)}
+        return None
+    if model_status.get(key, {}).get("version") != version:
+        model_status[key] = {"loaded": True, "seconds": time.perf_counter() - start,
+                             "version": version}
+    return model
 
-download_nltk_resources()
+# Load the vectorizer plus the requested models only
+def load_models(keys=("svm", "nb", "lr")):
+    vectorizer = load_model("vectorizer")
+    models = {key: load_model(key) for key in keys}
+    return models, vectorizer
 
-# Define model accuracy data (from notebook results)
-model_accuracies = {
-    "Support Vector Machine": 78.27,
-    "Multinomial Naive Bayes": 73.57,
-    "Logistic Regression Model": 78.17
-}
+# Stop the page when an artifact is missing instead of failing mid-render
+def stop_models_unavailable():
+    st.error("⚠️ Model files could not be loaded. Check the Model Status panel in the sidebar.")
+    st.stop()
+
+# Latest feature store entry (cleaned text + memory-mapped TF-IDF matrices
+# of the last notebook run, see feature_store.py), or None. store_version is
+# the store directory's mtime, so a newly built entry is picked up.
+@st.cache_resource(show_spinner=False)
+def _latest_training_features(store_version):
+    from feature_store import latest_features
+    return latest_features()
+
+def get_training_features():
+    from feature_store import FEATURE_DIR
+    if not os.path.isdir(FEATURE_DIR):
+        return None
+    return _latest_training_features(os.stat(FEATURE_DIR).st_mtime_ns)
 
-# Try to load models and vectorizer
+# Latest evaluation run (metrics.json, see evaluation.py), or None.
+# run_version is the evaluation directory's mtime, so a new run is picked up.
+@st.cache_data(show_spinner=False)
+def _latest_metrics(run_version):
+    from evaluation import load_metrics
+    return load_metrics()
+
+def get_metrics():
+    from evaluation import METRICS_DIR
+    if not os.path.isdir(METRICS_DIR):
+        return None
+    return _latest_metrics(os.stat(METRICS_DIR).st_mtime_ns)
+
+# Test accuracy (%) per model key: the latest evaluation run, the notebook's
+# results for models it did not evaluate
+def get_accuracies():
+    metrics = get_metrics()
+    accuracies = dict(NOTEBOOK_ACCURACIES)
+    if metrics:
+        accuracies.update({key: model["accuracy"] * 100 for key, model in metrics["models"].items()
+                           if key in accuracies})
+    return accuracies
+
+# Class probabilities of recently scored reviews, shared by all sessions
 @st.cache_resource
-def load_models():
-    models = {}
-    model_status = {}
-    
-    # In a real app, we'd load actual models
-    # For this demo, we'll simulate models and vectorizer
-    try:
-        # Simulating SVM model
-        models["svm"] = "svm_model"
-        model_status["svm"] = True
-    except:
-        model_status["svm"] = False
-        models["svm"] = None
-    
-    try:
-        # Simulating Naive Bayes model
-        models["nb"] = "naive_bayes_model"
-        model_status["nb"] = True
-    except:
-        model_status["nb"] = False
-        models["nb"] = None
-        
-    try:
-        # Simulating Logistic Regression model
-        models["lr"] = "logistic_regression_model"
-        model_status["lr"] = True
-    except:
-        model_status["lr"] = False
-        models["lr"] = None
-    
-    try:
-        # Simulating vectorizer
-        vectorizer = "tfidf_vectorizer"
-        model_status["vectorizer"] = True
-    except:
-        vectorizer = None
-        model_status["vectorizer"] = False
-    
-    return models, vectorizer, model_status
+def get_prediction_cache():
+    return LRUCache(max_entries=PREDICTION_CACHE_SIZE)
 
-models, vectorizer, model_status = load_models()
+# Prediction cache key: hash of the cleaned text + model id + the versions
+# of the model and vectorizer artifacts it was scored with
+def prediction_key(cleaned, model_name):
+    model_status = get_model_status()
+    text_hash = hashlib.blake2b(cleaned.encode(), digest_size=16).digest()
+    return (text_hash, model_name, model_status[model_name]["version"],
+            model_status["vectorizer"]["version"])
 
-# Function to predict sentiment with confidence
-def predict_sentiment(text, model_name):
-    # In a real app, we'd use the actual model prediction
-    # For this demo, we'll simulate predictions
-    cleaned_text = clean_text(text)
-    
-    # Simulated classification based on keywords in the text
-    text_lower = cleaned_text.lower()
-    positive_words = ['delicious', 'excellent', 'amazing', 'good', 'great', 'love', 'perfect', 'best', 'awesome', 'wonderful', 'fantastic', 'fresh', 'tasty', 'recommend']
-    negative_words = ['bad', 'terrible', 'awful', 'horrible', 'disappointing', 'worst', 'poor', 'nasty', 'stale', 'rotten', 'disgusting', 'waste', 'avoid', 'never']
-    
-    # Count sentiment words
-    pos_count = sum(1 for word in positive_words if word in text_lower)
-    neg_count = sum(1 for word in negative_words if word in text_lower)
-    
-    # Add some randomness to simulate model differences
-    if model_name == "svm":
-        pos_count = pos_count * (1 + np.random.uniform(-0.1, 0.1))
-        neg_count = neg_count * (1 + np.random.uniform(-0.1, 0.1))
-    elif model_name == "nb":
-        pos_count = pos_count * (1 + np.random.uniform(-0.15, 0.15))
-        neg_count = neg_count * (1 + np.random.uniform(-0.15, 0.15))
-    elif model_name == "lr":
-        pos_count = pos_count * (1 + np.random.uniform(-0.05, 0.05))
-        neg_count = neg_count * (1 + np.random.uniform(-0.05, 0.05))
-    
-    # Determine sentiment and confidence
-    if pos_count > neg_count:
-        sentiment = "positive"
-        confidence = 0.5 + min(0.49, (pos_count - neg_count) * 0.1)
-    elif neg_count > pos_count:
-        sentiment = "negative"
-        confidence = 0.5 + min(0.49, (neg_count - pos_count) * 0.1)
-    else:
-        # If no sentiment words found or equal counts, return neutral
-        sentiment = "neutral"
-        confidence = 0.5 + min(0.3, abs(pos_count - neg_count) * 0.05)
-    
-    # If mixed reviews (containing both positive and negative words)
-    if pos_count > 0 and neg_count > 0 and abs(pos_count - neg_count) <= 1:
-        sentiment = "neutral"
-        confidence = 0.5 + min(0.3, abs(pos_count - neg_count) * 0.05)
+# Clean a list of reviews; the clean_text stage time goes into timings
+def clean_batch(texts, timings=None):
+    # Interactive reviews repeat (examples, reruns), so go through the
+    # bounded clean_text cache (text_clean.CLEAN_CACHE)
+    start = time.perf_counter()
+    cleaned = clean_texts(texts, use_cache=True)
+    if timings is not None:
+        timings["clean_text"] = time.perf_counter() - start
+    return cleaned
+
+# TF-IDF transform already cleaned reviews; the vectorize stage time goes
+# into timings
+def vectorize_cleaned(cleaned, timings=None):
+    vectorizer = load_model("vectorizer")
+    if vectorizer is None:
+        stop_models_unavailable()
+    
+    start = time.perf_counter()
+    X = vectorizer.transform(cleaned)
+    if timings is not None:
+        timings["vectorize"] = time.perf_counter() - start
+    return X
+
+# Clean a list of reviews and TF-IDF transform them in one call.
+# If a timings dict is given, the clean_text and vectorize stage times
+# (in seconds) are stored in it.
+def vectorize_texts(texts, timings=None):
+    return vectorize_cleaned(clean_batch(texts, timings), timings)
+
+# Score many reviews per call: clean the whole list, look every review up in
+# the prediction cache, vectorize the misses with one transform() and run
+# predict_proba() once on that sparse matrix.
+# Returns the predicted labels (n_texts,), class probabilities
+# (n_texts, n_classes) in model.classes_ order and a cache-hit mask.
+def predict_batch(texts, model_name, timings=None):
+    model = load_model(model_name)
+    if model is None or load_model("vectorizer") is None:
+        stop_models_unavailable()
+    
+    cleaned = clean_batch(texts, timings)
+    cache = get_prediction_cache()
+    keys = [prediction_key(text, model_name) for text in cleaned]
+    rows = [cache.get(key) for key in keys]
+    cached = np.array([row is not None for row in rows], dtype=bool)
+    
+    if timings is not None:
+        timings["vectorize"] = timings["predict_proba"] = 0.0
+    misses = np.flatnonzero(~cached)
+    if len(misses):
+        X = vectorize_cleaned([cleaned[i] for i in misses], timings)
+        start = time.perf_counter()
+        miss_probs = model.predict_proba(X)
+        if timings is not None:
+            timings["predict_proba"] = time.perf_counter() - start
+        for i, row in zip(misses, miss_probs):
+            rows[i] = row.copy()
+            cache.put(keys[i], rows[i])
+    
+    probs = np.vstack(rows)
+    labels = model.classes_[probs.argmax(axis=1)]
+    return labels, probs, cached
+
+# Clean and vectorize one review once, then feed the same sparse row to
+# every loaded model (models with a cached prediction skip scoring, and if
+# all of them hit, vectorization is skipped too). Returns {model_key:
+# {"sentiment", "confidence", "seconds", "cached"}} where seconds is that
+# model's own predict_proba time.
+def predict_all_models(text, model_names=("svm", "nb", "lr"), timings=None):
+    models, vectorizer = load_models(model_names)
+    if vectorizer is None:
+        stop_models_unavailable()
+    cleaned = clean_batch([text], timings)[0]
+    cache = get_prediction_cache()
+    
+    if timings is not None:
+        timings["vectorize"] = 0.0
+    X = None
+    results = {}
+    for model_name in model_names:
+        model = models[model_name]
+        if model is None:
+            continue
+        key = prediction_key(cleaned, model_name)
+        probs = cache.get(key)
+        cached = probs is not None
+        seconds = 0.0
+        if not cached:
+            if X is None:
+                X = vectorize_cleaned([cleaned], timings)
+            start = time.perf_counter()
+            probs = model.predict_proba(X)[0].copy()
+            seconds = time.perf_counter() - start
+            cache.put(key, probs)
+        pred_idx = int(np.argmax(probs))
+        results[model_name] = {
+            "sentiment": model.classes_[pred_idx],
+            "confidence": float(probs[pred_idx]),
+            "seconds": seconds,
+            "cached": cached
+        }
     
-    return sentiment, confidence
+    if not results:
+        stop_models_unavailable()
+    if timings is not None:
+        timings["predict_proba"] = sum(r["seconds"] for r in results.values())
+    return results
+
+# Function to predict sentiment with confidence (and whether it was cached)
+def predict_sentiment(text, model_name, timings=None):
+    labels, probs, cached = predict_batch([text], model_name, timings)
+    return labels[0], float(probs[0].max()), bool(cached[0])
+
+# Per-stage latency of the scoring path, in display order
+LATENCY_STAGES = ["clean_text", "vectorize", "predict_proba", "render"]
+# Number of recent requests per session kept for the p50/p95 columns
+LATENCY_HISTORY_SIZE = 100
+
+# Remember this request's stage timings in the user's session, per page:
+# Try It scores one model and Compare all three, so their timings differ
+def record_latency(page, timings):
+    history = st.session_state.setdefault("latency_history", {}).setdefault(page, [])
+    history.append(dict(timings))
+    del history[:-LATENCY_HISTORY_SIZE]
+
+# Expandable breakdown of this request next to the p50/p95 of the session's
+# requests on the same page
+def render_latency_panel(page, timings):
+    import pandas as pd
+    history = st.session_state.get("latency_history", {}).get(page, [])
+    rows = []
+    for stage in LATENCY_STAGES + ["total"]:
+        if stage == "total":
+            current = sum(timings.get(s, 0.0) for s in LATENCY_STAGES)
+            samples = [sum(h.get(s, 0.0) for s in LATENCY_STAGES) for h in history]
+        else:
+            current = timings.get(stage, 0.0)
+            samples = [h[stage] for h in history if stage in h]
+        rows.append({
+            "Stage": stage,
+            "This request (ms)": round(current * 1000, 2),
+            "p50 (ms)": round(float(np.percentile(samples, 50)) * 1000, 2) if samples else None,
+            "p95 (ms)": round(float(np.percentile(samples, 95)) * 1000, 2) if samples else None
+        })
+    
+    cache = CLEAN_CACHE.stats()
+    predictions = get_prediction_cache().stats()
+    with st.expander("⏱️ Latency"):
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        st.caption(f"p50 / p95 over your last {len(history)} request(s) on this page in this session")
+        st.caption(
+            f"clean_text cache: {cache['hits']} hits · {cache['misses']} misses · "
+            f"{cache['evictions']} evictions · {cache['entries']} entries "
+            f"({cache['bytes'] / 1024:.0f} KB)"
+        )
+        st.caption(
+            f"prediction cache: {predictions['hits']} hits · {predictions['misses']} misses · "
+            f"{predictions['evictions']} evictions · {predictions['entries']} / {PREDICTION_CACHE_SIZE} entries"
+        )
 
 # Enhanced sidebar navigation
 def render_sidebar():
@@ -795,6 +948,7 @@ def render_sidebar():
         {"icon": "🧠", "label": "Model Information", "id": "models"},
         {"icon": "✨", "label": "Try It Yourself", "id": "try_it"},
         {"icon": "🔄", "label": "Compare Models", "id": "compare"},
+        {"icon": "📦", "label": "Bulk Scoring", "id": "bulk"},
         {"icon": "ℹ️", "label": "About Project", "id": "about"}
     ]
     
@@ -819,41 +973,54 @@ def render_sidebar():
     </div>
     """, unsafe_allow_html=True)
     
-    # Model status indicators with enhanced styling
+    # Model status indicators, filled in by render_model_status() after the
+    # page has run so models loaded on this click show up immediately
+    status_container = st.sidebar.container()
+    
+    # Pro tip section
+    st.sidebar.markdown("""
+    <div class="pro-tip">
+        <h4 style="color: white; margin: 0 0 0.8rem 0; display: flex; align-items: center; gap: 0.5rem; font-size: 1.1rem;">
+            <span style="font-size: 1.3rem;">💡</span>
+            Pro Tip
+        </h4>
+        <p style="color: rgba(255,255,255,0.9); margin: 0; font-size: 0.9rem; line-height: 1.5; font-weight: 400;">
+            Try comparing multiple review analyses to see how different AI models interpret the same text!
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    return st.session_state.page, status_container
+
+# Model status indicators with real load state and load time
+def render_model_status(container):
     status_items = [
         ("svm", "SVM Model"),
         ("nb", "Naive Bayes"),
         ("lr", "Logistic Regression"),
         ("vectorizer", "Vectorizer")
     ]
+    model_status = get_model_status()
     
     for key, label in status_items:
-        status = "🟢" if model_status.get(key, False) else "🔴"
-        check = "✓" if model_status.get(key, False) else "✗"
-        st.sidebar.markdown(f"""
+        state = model_status.get(key)
+        if state is None:
+            # Not needed by any page yet - loaded lazily on first use
+            status, check = "⚪", "lazy"
+        elif state["loaded"]:
+            status, check = "🟢", f"✓ {state['seconds']*1000:.0f} ms"
+        else:
+            status, check = "🔴", "✗"
+        container.markdown(f"""
         <div style="display: flex; align-items: center; justify-content: space-between; padding: 0.6rem 1rem; margin: 0.3rem 0; background: rgba(255,255,255,0.08); border-radius: 12px; backdrop-filter: blur(5px);">
             <div style="display: flex; align-items: center; gap: 0.8rem;">
                 <span style="font-size: 1rem;">{status}</span>
                 <span style="color: white; font-weight: 500; font-size: 0.9rem;">{label}</span>
             </div>
-            <span style="color: white; font-weight: 600; font-size: 1rem;">{check}</span>
+            <span style="color: white; font-weight: 600; font-size: 0.9rem;">{check}</span>
         </div>
         """, unsafe_allow_html=True)
-    
-    # Pro tip section
-    st.sidebar.markdown("""
-    <div class="pro-tip">
-        <h4 style="color: white; margin: 0 0 0.8rem 0; display: flex; align-items: center; gap: 0.5rem; font-size: 1.1rem;">
-            <span style="font-size: 1.3rem;">💡</span>
-            Pro Tip
-        </h4>
-        <p style="color: rgba(255,255,255,0.9); margin: 0; font-size: 0.9rem; line-height: 1.5; font-weight: 400;">
-            Try comparing multiple review analyses to see how different AI models interpret the same text!
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    return st.session_state.page
+
 def render_home():
     # Hero section
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -970,8 +1137,65 @@ def render_home():
         </div>
         """, unsafe_allow_html=True)
 
+# Where the shown metrics come from, and whether the served models changed
+# since they were evaluated
+def render_metrics_source(metrics):
+    if metrics is None:
+        st.caption("Accuracies and confusion matrices of the notebook run the shipped models come from. "
+                   "`python evaluation.py` scores the served models on the stored test split.")
+        return
+    from model_store import artifact_version
+    test_set = metrics["test_set"]
+    st.caption(f"Evaluation run v{metrics['version']:04d} on {test_set['rows']:,} test reviews "
+               f"({test_set.get('source', 'unknown source')}), each model scored once · "
+               f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(metrics['created']))}")
+    stale = [MODEL_DISPLAY_NAMES.get(key, key) for key, model in metrics["models"].items()
+             if model.get("artifact_version") is not None and model["artifact_version"] != artifact_version(key)]
+    if stale:
+        st.warning(f"{', '.join(stale)} changed since this evaluation; run `python evaluation.py` to refresh the metrics.")
+
+# Confusion matrix and per-class precision / recall of one model from the
+# latest evaluation run, the notebook's figures for models it did not evaluate
+def render_confusion_matrix(metrics, key, title, color_scale):
+    import plotly.express as px
+    model = metrics["models"].get(key) if metrics else None
+    if model is None:
+        if key not in NOTEBOOK_CONFUSION_MATRICES:
+            st.info("No evaluation of this model yet: `python evaluation.py` (or the notebook's export cell) "
+                    "scores the test set and stores its confusion matrix.")
+            return
+        matrix = np.array(NOTEBOOK_CONFUSION_MATRICES[key])
+        correct = np.diag(matrix)
+        model = {"labels": NOTEBOOK_CONFUSION_LABELS, "confusion_matrix": matrix, "report": {
+            label: {"precision": correct[i] / matrix[:, i].sum(), "recall": correct[i] / matrix[i].sum()}
+            for i, label in enumerate(NOTEBOOK_CONFUSION_LABELS)}}
+    labels = [label.title() for label in model["labels"]]
+    fig = px.imshow(
+        np.array(model["confusion_matrix"]),
+        labels=dict(x="Predicted", y="Actual", color="Count"),
+        x=labels,
+        y=labels,
+        color_continuous_scale=color_scale,
+        title=title
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    report = model["report"]
+    st.caption(" · ".join(f"{label.title()}: precision {report[label]['precision']:.1%}, "
+                          f"recall {report[label]['recall']:.1%}" for label in model["labels"]))
+
 # Model Performance Page
 def render_performance():
+    import pandas as pd
+    import plotly.graph_objects as go
+    
+    metrics = get_metrics()
+    accuracies = get_accuracies()
+    model_accuracies = {MODEL_DISPLAY_NAMES[key]: accuracy for key, accuracy in accuracies.items()}
+    
     st.markdown('<h2 class="sub-header">📊 Model Performance Dashboard</h2>', unsafe_allow_html=True)
     
     # Accuracy Leaderboard
@@ -1012,6 +1236,8 @@ def render_performance():
             </div>
             """, unsafe_allow_html=True)
     
+    render_metrics_source(metrics)
+    
     # Interactive Accuracy Comparison Chart
     st.markdown('<h2 class="sub-header">📈 Performance Comparison</h2>', unsafe_allow_html=True)
     
@@ -1036,7 +1262,7 @@ def render_performance():
         },
         xaxis_title="Machine Learning Models",
         yaxis_title="Accuracy (%)",
-        yaxis=dict(range=[70, 80]),
+        yaxis=dict(range=[max(0, min(accuracies.values()) - 4), min(100, max(accuracies.values()) + 2)]),
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
         font=dict(family="Poppins", size=14),
@@ -1062,7 +1288,7 @@ def render_performance():
         # Performance summary table
         performance_data = {
             "Model": ["Support Vector Machine", "Logistic Regression", "Multinomial Naive Bayes"],
-            "Accuracy": ["78.27%", "78.17%", "73.57%"],
+            "Accuracy": [f"{accuracies[key]:.2f}%" for key in ("svm", "lr", "nb")],
             "Best For": ["Clear positive/negative reviews", "Balanced performance", "Quick analysis"],
             "Speed": ["Medium", "Fast", "Very Fast"],
             "Memory": ["Medium", "Low", "Low"]
@@ -1071,30 +1297,30 @@ def render_performance():
         df = pd.DataFrame(performance_data)
         st.dataframe(df, use_container_width=True, hide_index=True)
         
-        st.markdown("""
+        st.markdown(f"""
         <div class="info-box">
             <h4 style="color: #20211A; margin: 0;">📊 Key Insights</h4>
             <ul style="margin: 0.5rem 0; color: #555;">
-                <li style="color: #E6E6FA;"><strong>SVM</strong> and <strong>Logistic Regression</strong> show nearly identical performance (78.27% vs 78.17%)</li>
+                <li style="color: #E6E6FA;"><strong>SVM</strong> and <strong>Logistic Regression</strong> show nearly identical performance ({accuracies["svm"]:.2f}% vs {accuracies["lr"]:.2f}%)</li>
                 <li style="color: #E6E6FA;"><strong>All models</strong> perform well above baseline (33.3% for random guessing)</li>
                 <li style="color: #E6E6FA;"><strong>Naive Bayes</strong> trades some accuracy for exceptional speed</li>
-                <li style="color: #E6E6FA;"><strong>Performance gap</strong> between best and worst model is only 4.7%</li>
+                <li style="color: #E6E6FA;"><strong>Performance gap</strong> between best and worst model is only {sorted_models[0][1] - sorted_models[-1][1]:.1f}%</li>
             </ul>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div style="text-align: center;">
             <div class="floating-element">
                 <div style="font-size: 8rem; filter: drop-shadow(0 8px 16px rgba(0, 0, 0, 0.1));">🏆</div>
             </div>
             <h3 style="color: #2c3e50; margin-top: 2rem;">Champion Model</h3>
             <div class="badge badge-success" style="font-size: 1.2rem; padding: 1rem 2rem;">
-                Support Vector Machine
+                {sorted_models[0][0]}
             </div>
             <p style="margin-top: 1rem; color: #E6E6FA; font-style: italic;">
-                Achieving 78.27% accuracy with excellent balance across all sentiment classes
+                Achieving {sorted_models[0][1]:.2f}% accuracy with excellent balance across all sentiment classes
             </p>
         </div>
         """, unsafe_allow_html=True)
@@ -1102,138 +1328,97 @@ def render_performance():
     # Training Dataset Information
     st.markdown('<h2 class="sub-header">📚 Training Data Overview</h2>', unsafe_allow_html=True)
     
+    # Class counts of the last training run when its features are stored,
+    # otherwise the notebook's balanced sample
+    features = get_training_features()
+    class_counts = features.meta["class_counts"] if features else {"positive": 100000, "negative": 80000, "neutral": 40000}
+    
     col1, col2, col3, col4 = st.columns(4)
     
 
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="overview" style="text-align: center;">
             <div style="font-size: 2.5rem; color: #4CAF50;">📈</div>
             <h4 style="color: #2c3e50; margin: 10px 0 5px 0; font-size: 1.2rem;">Positive Reviews</h4>
-            <div style="font-size: 2rem; font-weight: bold; color: #4CAF50; margin: 5px 0;">100,000</div>
+            <div style="font-size: 2rem; font-weight: bold; color: #4CAF50; margin: 5px 0;">{class_counts.get('positive', 0):,}</div>
             <p style="color: #666; font-size: 0.9rem;">4-5 star ratings</p>
         </div>
         """, unsafe_allow_html=True)
 
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div class="overview" style="text-align: center;">
             <div style="font-size: 2.5rem; color: #F44336;">📉</div>
             <h4 style="color: #2c3e50; margin: 10px 0 5px 0; font-size: 1.2rem;">Negative Review</h4>
-            <div style="font-size: 2rem; font-weight: bold; color: #F44336; margin: 5px 0;">80,000</div>
+            <div style="font-size: 2rem; font-weight: bold; color: #F44336; margin: 5px 0;">{class_counts.get('negative', 0):,}</div>
             <p style="color: #666; font-size: 0.9rem;">1-2 star ratings</p>
         </div>
         """, unsafe_allow_html=True)
 
 
     with col3:
-        st.markdown("""
+        st.markdown(f"""
         <div class="overview" style="text-align: center;">
             <div style="font-size: 2.5rem; color: #FF9800;">📊</div>
             <h4 style="color: #2c3e50; margin: 10px 0 5px 0; font-size: 1.2rem;">Neutral Reviews</h4>
-            <div style="font-size: 2rem; font-weight: bold; color: #FF9800; margin: 5px 0;">40,000</div>
+            <div style="font-size: 2rem; font-weight: bold; color: #FF9800; margin: 5px 0;">{class_counts.get('neutral', 0):,}</div>
             <p style="color: #666; font-size: 0.9rem;">3 star ratings</p>
         </div>
         """, unsafe_allow_html=True)
 
     with col4:
-        st.markdown("""
+        st.markdown(f"""
         <div class="overview" style="text-align: center;">
             <div style="font-size: 2.5rem; color: #667eea;">🎯</div>
             <h4 style="color: #2c3e50; margin: 10px 0 5px 0; font-size: 1.2rem;">Total Dataset</h4>
-            <div style="font-size: 2rem; font-weight: bold; color: #667eea; margin: 5px 0;">220,000</div>
+            <div style="font-size: 2rem; font-weight: bold; color: #667eea; margin: 5px 0;">{sum(class_counts.values()):,}</div>
             <p style="color: #666; font-size: 0.9rem;">balanced reviews</p>
         </div>
         """, unsafe_allow_html=True)
     
+    if features:
+        shapes, nnz, seconds = features.meta["shapes"], features.meta["nnz"], features.meta["seconds"]
+        st.caption(
+            f"Feature store {features.key[:12]}: train {shapes['train_x_vector'][0]:,} × "
+            f"{features.meta['n_features']:,} ({nnz['train_x_vector']:,} non-zeros), "
+            f"test {shapes['test_x_vector'][0]:,} reviews · cleaned in {seconds['clean']:.1f}s and "
+            f"vectorized in {seconds['vectorize']:.1f}s once, memory-mapped since"
+        )
+    
     # Confusion Matrix Visualization
     st.markdown('<h2 class="sub-header">🔄 Confusion Matrices</h2>', unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["SVM", "Logistic Regression", "Naive Bayes"])
     
-    # Sample confusion matrices (in a real app, these would be loaded from the model evaluation)
-    svm_cm = np.array([
-        [7822, 1011, 167],
-        [1210, 6723, 1067],
-        [203, 876, 6921]
-    ])
-    
-    lr_cm = np.array([
-        [7792, 1031, 177],
-        [1190, 6703, 1107],
-        [223, 846, 6931]
-    ])
-    
-    nb_cm = np.array([
-        [7520, 1100, 380],
-        [1500, 6300, 1200],
-        [480, 960, 6560]
-    ])
-    
     with tab1:
-        fig = px.imshow(
-            svm_cm,
-            labels=dict(x="Predicted", y="Actual", color="Count"),
-            x=['Positive', 'Neutral', 'Negative'],
-            y=['Positive', 'Neutral', 'Negative'],
-            color_continuous_scale='Blues',
-            title="SVM Confusion Matrix"
-        )
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        render_confusion_matrix(metrics, "svm", "SVM Confusion Matrix", 'Blues')
         
         st.markdown("""
         <div class="info-box">
             <h4 style="color: #E6E6FA; margin: 0;">🔍 SVM Analysis</h4>
             <p style="margin: 0.5rem 0; color: #E6E6FA;">
-                The SVM model shows excellent performance across all sentiment classes, with particularly strong accuracy on positive reviews (87.2% class precision). 
+                The SVM model shows excellent performance across all sentiment classes, with particularly strong precision on positive reviews. 
                 The model has minimal confusion between positive and negative classes, indicating good boundary separation.
             </p>
         </div>
         """, unsafe_allow_html=True)
     
     with tab2:
-        fig = px.imshow(
-            lr_cm,
-            labels=dict(x="Predicted", y="Actual", color="Count"),
-            x=['Positive', 'Neutral', 'Negative'],
-            y=['Positive', 'Neutral', 'Negative'],
-            color_continuous_scale='Purples',
-            title="Logistic Regression Confusion Matrix"
-        )
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        render_confusion_matrix(metrics, "lr", "Logistic Regression Confusion Matrix", 'Purples')
         
         st.markdown("""
         <div class="info-box">
             <h4 style="color: #E6E6FA; margin: 0;">🔍 Logistic Regression Analysis</h4>
             <p style="margin: 0.5rem 0; color: #E6E6FA;">
-                Logistic Regression shows very similar performance to SVM, with slightly better handling of negative reviews (1.5% improvement in recall).
+                Logistic Regression shows very similar performance to SVM, with slightly better handling of negative reviews.
                 This model offers a good balance between accuracy and computational efficiency.
             </p>
         </div>
         """, unsafe_allow_html=True)
     
     with tab3:
-        fig = px.imshow(
-            nb_cm,
-            labels=dict(x="Predicted", y="Actual", color="Count"),
-            x=['Positive', 'Neutral', 'Negative'],
-            y=['Positive', 'Neutral', 'Negative'],
-            color_continuous_scale='Greens',
-            title="Naive Bayes Confusion Matrix"
-        )
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        render_confusion_matrix(metrics, "nb", "Naive Bayes Confusion Matrix", 'Greens')
         
         st.markdown("""
         <div class="info-box">
@@ -1247,6 +1432,8 @@ def render_performance():
 
 # Model Information Page
 def render_models():
+    model_accuracies = {MODEL_DISPLAY_NAMES[key]: accuracy for key, accuracy in get_accuracies().items()}
+    
     st.markdown('<h2 class="sub-header">🧠 Machine Learning Models</h2>', unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["⚡ Support Vector Machine", "🎯 Naive Bayes", "📈 Logistic Regression"])
@@ -1520,8 +1707,6 @@ def render_try_it():
     # Analysis results
     if analyze_button and user_review:
         with st.spinner("🤖 AI is analyzing your review..."):
-            time.sleep(1.5)  # Simulate processing time
-            
             # Map model selection to model key
             model_map = {
                 "Support Vector Machine (Best Accuracy)": "svm",
@@ -1532,7 +1717,9 @@ def render_try_it():
             model_key = model_map[selected_model]
             
             # Get prediction
-            sentiment, confidence = predict_sentiment(user_review, model_key)
+            timings = {}
+            sentiment, confidence, cached = predict_sentiment(user_review, model_key, timings)
+            render_start = time.perf_counter()
             
             # Display results
             st.markdown('<h3 style="color: #2c3e50; margin-top: 2rem;">📊 Analysis Results</h3>', unsafe_allow_html=True)
@@ -1569,6 +1756,7 @@ def render_try_it():
                         <h3 style="color: #2c3e50; margin: 1rem 0;">
                             Confidence: {confidence*100:.1f}%
                         </h3>
+                        {'<span class="badge badge-success">⚡ Cached result</span>' if cached else ''}
                     </div>
                     <p style="text-align: center; color: #666; margin-top: 1rem; font-style: italic;">
                         {message}
@@ -1617,6 +1805,10 @@ def render_try_it():
                 </ul>
             </div>
             """, unsafe_allow_html=True)
+            
+            timings["render"] = time.perf_counter() - render_start
+            record_latency("try_it", timings)
+            render_latency_panel("try_it", timings)
     
     elif analyze_button and not user_review:
         st.warning("⚠️ Please enter a review before analyzing!")
@@ -1647,17 +1839,18 @@ def render_compare():
     
     if compare_button and comparison_review:
         with st.spinner("🤖 Running analysis across all models..."):
-            time.sleep(2)  # Simulate processing
-            
             st.markdown('<h3 style="color: #2c3e50; margin-top: 2rem;">📊 Comparison Results</h3>', unsafe_allow_html=True)
             
-            # Get predictions from all models
-            results = {}
-            for model_name, model_key in [("Support Vector Machine", "svm"), 
-                                         ("Naive Bayes", "nb"), 
-                                         ("Logistic Regression", "lr")]:
-                sentiment, confidence = predict_sentiment(comparison_review, model_key)
-                results[model_name] = {"sentiment": sentiment, "confidence": confidence}
+            # Get predictions from all models off a single vectorized row
+            model_names = {
+                "svm": "Support Vector Machine",
+                "nb": "Naive Bayes",
+                "lr": "Logistic Regression"
+            }
+            timings = {}
+            predictions = predict_all_models(comparison_review, tuple(model_names), timings)
+            render_start = time.perf_counter()
+            results = {model_names[key]: result for key, result in predictions.items()}
             
             # Display results in columns
             col1, col2, col3 = st.columns(3)
@@ -1666,6 +1859,7 @@ def render_compare():
                 col = [col1, col2, col3][idx]
                 sentiment = result["sentiment"]
                 confidence = result["confidence"]
+                latency = "⚡ cached" if result["cached"] else f"⏱️ {result['seconds'] * 1000:.2f} ms"
                 
                 # Determine styling
                 if sentiment == "positive":
@@ -1697,6 +1891,9 @@ def render_compare():
                             </div>
                             <div style="color: #666; font-size: 0.9rem;">Confidence</div>
                         </div>
+                        <div style="margin-top: 0.8rem; text-align: center; color: #666; font-size: 0.85rem;">
+                            {latency}
+                        </div>
                     </div>
                     """, unsafe_allow_html=True)
             
@@ -1728,6 +1925,7 @@ def render_compare():
                 """, unsafe_allow_html=True)
             
             # Confidence comparison chart
+            import plotly.graph_objects as go
             fig = go.Figure(data=[
                 go.Bar(
                     x=list(results.keys()),
@@ -1749,6 +1947,10 @@ def render_compare():
             )
             
             st.plotly_chart(fig, use_container_width=True)
+            
+            timings["render"] = time.perf_counter() - render_start
+            record_latency("compare", timings)
+            render_latency_panel("compare", timings)
     
     elif compare_button and not comparison_review:
         st.warning("⚠️ Please enter a review before comparing!")
@@ -1797,6 +1999,185 @@ def render_compare():
         </div>
         """, unsafe_allow_html=True)
 
+# Bulk Scoring Page
+def render_bulk_scoring():
+    import pandas as pd
+    from batch_scoring import DEFAULT_CHUNK_SIZE, detect_format, read_columns
+    
+    st.markdown('<h2 class="sub-header">📦 Bulk Scoring</h2>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="card">
+        <h3 style="color: #2c3e50; margin-top: 0;">📁 Score a Whole File of Reviews</h3>
+        <p style="color: #666; margin: 1rem 0;">
+            Upload a CSV or JSONL export (for example the Kaggle <code>Reviews.csv</code>). The file is read in
+            fixed-size chunks, each chunk is cleaned, vectorized and scored in one batch, and the results are
+            written to disk as they are produced - so memory use stays flat however large the file is.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    uploaded = st.file_uploader(
+        "Upload reviews (CSV or JSONL):",
+        type=["csv", "jsonl", "ndjson", "json"],
+        help="One review per row / line. Other columns are ignored, except an Id column which is kept.",
+        key="bulk_upload"
+    )
+    
+    if uploaded is not None:
+        fmt = detect_format(uploaded.name)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            encoding = st.selectbox(
+                "File encoding:",
+                ["latin1", "utf-8"],
+                help="The notebook reads the Kaggle Reviews.csv as latin1"
+            )
+        
+        try:
+            columns = read_columns(uploaded, fmt, encoding)
+        except Exception as e:
+            st.error(f"⚠️ Could not read the file header: {e}")
+            return
+        
+        with col2:
+            text_column = st.selectbox(
+                "Review text column:",
+                columns,
+                index=columns.index("Text") if "Text" in columns else 0
+            )
+        
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            model_names = {
+                "Support Vector Machine": "svm",
+                "Naive Bayes": "nb",
+                "Logistic Regression": "lr"
+            }
+            selected_model = st.selectbox("Choose an AI Model:", list(model_names), key="bulk_model")
+        
+        with col2:
+            chunk_size = st.number_input(
+                "Chunk size (rows):",
+                min_value=1000,
+                max_value=100000,
+                value=DEFAULT_CHUNK_SIZE,
+                step=1000
+            )
+        
+        with col3:
+            st.markdown('<div style="height: 1.75rem;"></div>', unsafe_allow_html=True)
+            score_button = st.button("🚀 Score File", type="primary", use_container_width=True)
+        
+        if score_button:
+            score_uploaded_file(uploaded, fmt, encoding, text_column, model_names[selected_model], int(chunk_size))
+    
+    result = st.session_state.get("bulk_result")
+    if result and os.path.exists(result["file"].path):
+        st.markdown('<h3 style="color: #2c3e50; margin-top: 2rem;">📊 Results</h3>', unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows scored", f"{result['rows']:,}")
+        col2.metric("Time", f"{result['seconds']:.1f} s")
+        col3.metric("Throughput", f"{result['rows'] / max(result['seconds'], 1e-9):,.0f} rows/s")
+        
+        st.dataframe(
+            pd.DataFrame({"Reviews": result["label_counts"]}).rename_axis("Sentiment"),
+            use_container_width=True
+        )
+        st.caption("First rows of the output:")
+        st.dataframe(result["preview"], use_container_width=True)
+        
+        st.download_button(
+            "⬇️ Download Results (CSV)",
+            data=result["file"].read,
+            file_name=result["file_name"],
+            mime="text/csv",
+            type="primary"
+        )
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# Temporary CSV of a bulk scoring run, kept in the session state. Deleted
+# when the next run replaces it, when the session is dropped or when the
+# server exits.
+class ScoredFile:
+    def __init__(self, path):
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def delete(self):
+        self._finalizer()
+
+# Stream an uploaded file through one model chunk by chunk, appending the
+# results to a temporary CSV; only one chunk is held in memory at a time
+def score_uploaded_file(uploaded, fmt, encoding, text_column, model_key, chunk_size):
+    import pandas as pd
+    from batch_scoring import iter_chunks, read_columns, score_chunk
+    
+    models, vectorizer = load_models((model_key,))
+    model = models[model_key]
+    if model is None or vectorizer is None:
+        stop_models_unavailable()
+    
+    # Replace the previous result of this session
+    previous = st.session_state.pop("bulk_result", None)
+    if previous:
+        previous["file"].delete()
+    
+    keep_columns = ["Id"] if "Id" in read_columns(uploaded, fmt, encoding) and text_column != "Id" else []
+    columns = keep_columns + [text_column]
+    label_counts = {}
+    preview = None
+    rows = 0
+    
+    progress = st.progress(0.0, text="Starting...")
+    start = time.perf_counter()
+    with tempfile.NamedTemporaryFile("w", prefix="bulk_scores_", suffix=".csv",
+                                     delete=False, newline="") as out:
+        try:
+            for chunk in iter_chunks(uploaded, fmt, columns, chunk_size, encoding):
+                result = score_chunk(chunk, text_column, model, vectorizer, keep_columns)
+                result.to_csv(out, header=rows == 0, index=False)
+                if preview is None:
+                    preview = result.head(10)
+                for label, count in result["label"].value_counts().items():
+                    label_counts[label] = label_counts.get(label, 0) + int(count)
+                rows += len(result)
+                
+                elapsed = time.perf_counter() - start
+                progress.progress(
+                    min(uploaded.tell() / max(uploaded.size, 1), 1.0),
+                    text=f"{rows:,} rows scored · {rows / elapsed:,.0f} rows/s"
+                )
+        except Exception as e:
+            out.close()
+            os.remove(out.name)
+            st.error(f"⚠️ Scoring failed after {rows:,} rows: {e}")
+            return
+    
+    seconds = time.perf_counter() - start
+    progress.progress(1.0, text=f"✅ {rows:,} rows scored in {seconds:.1f} s · {rows / max(seconds, 1e-9):,.0f} rows/s")
+    st.session_state.bulk_result = {
+        "file": ScoredFile(out.name),
+        "file_name": os.path.splitext(uploaded.name)[0] + f"_{model_key}_scores.csv",
+        "rows": rows,
+        "seconds": seconds,
+        "label_counts": label_counts,
+        "preview": preview if preview is not None else pd.DataFrame()
+    }
+
 # About Page
 def render_about():
     st.markdown('<h2 class="sub-header">ℹ️ About This Project</h2>', unsafe_allow_html=True)
@@ -2003,7 +2384,7 @@ def main():
     add_header()
     
     # Render sidebar and get selected page
-    selected_page = render_sidebar()
+    selected_page, status_container = render_sidebar()
     
     # Route to appropriate page
     if selected_page == "home":
@@ -2016,10 +2397,15 @@ def main():
         render_try_it()
     elif selected_page == "compare":
         render_compare()
+    elif selected_page == "bulk":
+        render_bulk_scoring()
     elif selected_page == "about":
         render_about()
     else:
         render_home()
+    
+    # Report load state after the page had a chance to load its models
+    render_model_status(status_container)
 
 # Run the app
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+"""Chunked scoring of review files (Kaggle Reviews.csv-shaped CSV, JSONL or Parquet).
+
+Files are read DEFAULT_CHUNK_SIZE rows at a time with only the needed
+columns, each chunk is cleaned with clean_texts(), vectorized with one
+transform() and scored with one predict_proba(), and the result chunk is
+handed back to the caller to be written out. Memory use depends on the chunk
+size, not on the size of the file.
+
+score_chunks() can spread the chunks over a ScoringPool of worker processes
+(see there for how the model arrays are shared); results come back in input
+order.
+
+Used by the app's Bulk Scoring page and score_reviews.py; does not import
+Streamlit.
+"""
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model_store import load_artifact
+from text_clean import clean_texts
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# File extension -> input format
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet"
+}
+
+
+# Input format from a file name (csv, jsonl or parquet)
+def detect_format(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type {extension!r}; expected one of {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+
+# Column names of a CSV / JSONL / Parquet file (binary file object), read
+# from its header, first record or schema; the file is rewound afterwards
+def read_columns(source, fmt, encoding="utf-8"):
+    source.seek(0)
+    try:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(source).schema_arrow.names
+        if fmt == "csv":
+            return list(pd.read_csv(source, nrows=0, encoding=encoding).columns)
+        line = source.readline().strip()
+        return list(json.loads(line.decode(encoding))) if line else []
+    finally:
+        source.seek(0)
+
+
+# DataFrames of at most chunk_size rows holding only `columns`
+def iter_chunks(source, fmt, columns, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    if fmt == "parquet":
+        # Only the requested columns are decoded, one record batch at a time
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+    if fmt == "csv":
+        reader = pd.read_csv(source, usecols=columns, chunksize=chunk_size, encoding=encoding)
+    elif fmt == "jsonl":
+        reader = pd.read_json(source, lines=True, chunksize=chunk_size, encoding=encoding, dtype=False)
+    else:
+        raise ValueError(f"Unknown input format {fmt!r}")
+    with reader:
+        for chunk in reader:
+            missing = [column for column in columns if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Column(s) {', '.join(missing)} not found in the input")
+            yield chunk[columns]
+
+
+# Clean, vectorize and score a batch of raw reviews with one transform() and
+# one predict_proba(); returns (predicted class indices, probabilities in
+# model.classes_ order)
+def score_texts(texts, model, vectorizer):
+    probs = model.predict_proba(vectorizer.transform(clean_texts(texts)))
+    return probs.argmax(axis=1), probs
+
+
+# Result rows of one input chunk: the keep_columns as they are, the predicted
+# label and one proba_<class> column per class
+def score_chunk(chunk, text_column, model, vectorizer, keep_columns=()):
+    label_idx, probs = score_texts(chunk[text_column].to_numpy(dtype=object), model, vectorizer)
+    return result_frame(chunk, keep_columns, model.classes_, label_idx, probs)
+
+
+# Result DataFrame of one chunk from the predicted class indices and the
+# class probabilities (stored as float32)
+def result_frame(chunk, keep_columns, classes, label_idx, probs):
+    result = chunk[list(keep_columns)].reset_index(drop=True)
+    result["label"] = classes[label_idx]
+    for i, name in enumerate(classes):
+        result[f"proba_{name}"] = probs[:, i].astype(np.float32)
+    return result
+
+
+# Artifacts of a worker process, loaded once by _init_worker
+_worker_artifacts = {}
+
+
+def _init_worker(model_key):
+    _worker_artifacts["model"] = load_artifact(model_key, mmap_mode="r")
+    _worker_artifacts["vectorizer"] = load_artifact("vectorizer", mmap_mode="r")
+
+
+# Only the texts travel to the worker and only the class indices (int8) and
+# probabilities travel back
+def _score_in_worker(texts):
+    label_idx, probs = score_texts(texts, _worker_artifacts["model"], _worker_artifacts["vectorizer"])
+    return label_idx.astype(np.int8), probs
+
+
+# Process pool scoring batches of raw review texts with one model.
+# Workers attach the artifacts once, in their initializer, with
+# mmap_mode="r": the exported artifacts are .npy files (weights, idf,
+# vocabulary bytes/ids, calibration tables) and the notebook pickles are
+# joblib dumps whose arrays are mapped the same way. The arrays are therefore
+# held once in the page cache however many workers run, instead of being
+# unpickled into every worker.
+# Workers are started with "spawn" rather than fork: forking a process that
+# runs other threads (a stdin reader, the Streamlit server) can leave a lock
+# held in the child and deadlock it; spawn behaves the same on every OS.
+class ScoringPool:
+    def __init__(self, model_key, workers):
+        self.classes_ = load_artifact(model_key).classes_
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_init_worker, initargs=(model_key,))
+
+    # (label_idx, probs) for each batch of texts, in input order; at most
+    # 2 * workers batches are in flight, so memory stays bounded however
+    # long the input is. Items of `batches` may be (texts, tag) pairs when
+    # tagged=True; the tag is handed back with the result.
+    def map(self, batches, tagged=False):
+        pending = deque()
+        for item in batches:
+            texts, tag = item if tagged else (item, None)
+            pending.append((self._pool.submit(_score_in_worker, texts), tag))
+            if len(pending) >= 2 * self.workers:
+                yield self._result(pending.popleft(), tagged)
+        while pending:
+            yield self._result(pending.popleft(), tagged)
+
+    @staticmethod
+    def _result(entry, tagged):
+        future, tag = entry
+        return (future.result(), tag) if tagged else future.result()
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Score an iterable of input chunks with model_key, yielding result chunks
+# in input order; with workers > 1 the chunks are scored by a ScoringPool
+def score_chunks(chunks, text_column, model_key, keep_columns=(), workers=1):
+    if workers <= 1:
+        model, vectorizer = load_artifact(model_key), load_artifact("vectorizer")
+        for chunk in chunks:
+            yield score_chunk(chunk, text_column, model, vectorizer, keep_columns)
+        return
+
+    keep_columns = list(keep_columns)
+    with ScoringPool(model_key, workers) as pool:
+        batches = ((chunk[text_column].to_numpy(dtype=object), chunk[keep_columns]) for chunk in chunks)
+        for (label_idx, probs), kept in pool.map(batches, tagged=True):
+            yield result_frame(kept, keep_columns, pool.classes_, label_idx, probs)
+
+
+# Appends result chunks to a CSV, JSONL or Parquet file (format from the
+# file extension)
+class ResultWriter:
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.format = detect_format(path)
+        self.encoding = encoding
+        self.rows = 0
+        self._parquet = None
+        self._file = None if self.format == "parquet" else open(path, "w", encoding=encoding, newline="")
+
+    def write(self, result):
+        if self.format == "csv":
+            result.to_csv(self._file, header=self.rows == 0, index=False)
+        elif self.format == "jsonl":
+            result.to_json(self._file, orient="records", lines=True, force_ascii=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(result, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        self.rows += len(result)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,86 @@
+"""Streamlit cold start: import-time profile and time to first render of app.py.
+
+  * import profile: `python -X importtime app.py` (the script runs in
+    Streamlit's bare mode and renders the home page); the cumulative time of
+    every top-level import is listed, largest first
+  * time to first render: a fresh interpreter imports Streamlit and runs the
+    whole script once for each page (what a new server process does for its
+    first session), best of --repeat runs
+
+Compare against another version of the app with --app, e.g.
+    git show HEAD~1:app.py > app_before.py
+    python -m benchmarks.bench_app_startup --app app_before.py
+
+Run from the repository root:
+    python -m benchmarks.bench_app_startup [--app app.py] [--repeat 5] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+from model_store import BASE_DIR
+
+PAGES = ("home", "performance", "try_it", "compare", "bulk", "about")
+
+RENDER = """
+import time
+start = time.perf_counter()
+import streamlit as st
+st.session_state["page"] = {page!r}
+import runpy
+runpy.run_path({app!r}, run_name="__main__")
+print(time.perf_counter() - start)
+"""
+
+# "import time:  self [us] | cumulative | imported package"; top-level
+# imports have no indentation before the package name
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+# (package, cumulative seconds) of the top-level imports, largest first
+def import_profile(app):
+    stderr = subprocess.run([sys.executable, "-X", "importtime", app], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            imports.append((match.group(4), int(match.group(2)) / 1e6))
+    return sorted(imports, key=lambda item: -item[1])
+
+
+# Seconds from interpreter start-up to the end of the first script run
+def first_render_seconds(app, page, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", RENDER.format(page=page, app=app)], cwd=BASE_DIR,
+                       capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py import profile and time to first render")
+    parser.add_argument("--app", default="app.py", help="app script (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per page, best is reported (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=15, help="imports listed (default: %(default)s)")
+    args = parser.parse_args()
+    app = os.path.abspath(os.path.join(BASE_DIR, args.app))
+
+    imports = import_profile(app)
+    print(f"Top-level imports of {os.path.basename(app)} (home page), cumulative:")
+    for package, seconds in imports[:args.top]:
+        print(f"  {package:<32}{seconds * 1000:>8.0f} ms")
+    print(f"  {'total':<32}{sum(seconds for _, seconds in imports) * 1000:>8.0f} ms")
+
+    print("\nTime to first render (fresh interpreter, import + one script run):")
+    for page in PAGES:
+        print(f"  {page:<12}{first_render_seconds(app, page, args.repeat) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
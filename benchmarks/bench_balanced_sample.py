@@ -0,0 +1,148 @@
+"""Labeling and balanced sampling: the notebook's DataFrame copies vs row indices.
+
+Each case starts from the full reviews DataFrame (the notebook's df_review,
+all columns) in a fresh interpreter and builds the balanced, shuffled
+sample of --sizes reviews per class:
+  * notebook: Rating.apply(map_sentiment) (a Python call per row), the
+    df_positive / df_negative / df_neutral copies, a sample of each,
+    concat and the shuffling sample(frac=1).reset_index(drop=True)
+  * vectorized: review_data.sentiment_codes (int8 table lookup, stored as
+    a categorical column) and review_data.balanced_reviews (row positions
+    drawn with the same random draws, Text and sentiment copied once)
+and reports the time of the labeling and of the sampling, and the peak RSS
+above the loaded DataFrame (VmHWM, reset after loading through
+/proc/self/clear_refs). Both cases must produce the same reviews in the
+same order.
+
+Without --parquet a synthetic Reviews-like file with the real dataset's
+rating counts (568,454 reviews) is generated.
+
+Run from the repository root:
+    python -m benchmarks.bench_balanced_sample [--parquet Reviews.parquet] [--sizes 100000 80000 40000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Reviews per rating 1-5 in Reviews.csv
+RATING_COUNTS = (52268, 29769, 42640, 80655, 363122)
+
+WORDS = ("the taste was great and my kids love these snacks but the price went up again so I might "
+         "switch brands after this order arrived stale and the box was crushed coffee tea chocolate "
+         "flavor good bad never again always buy fresh delicious awful okay decent").split()
+
+MEASURE = """
+import time
+import numpy as np
+import pandas as pd
+from review_data import SENTIMENTS, balanced_reviews, load_reviews, sentiment_codes
+
+
+def status_mb(field):
+    line = next(line for line in open("/proc/self/status") if line.startswith(field))
+    return int(line.split()[1]) / 1024
+
+
+def map_sentiment(rating):
+    if rating < 3:
+        return "negative"
+    elif rating == 3:
+        return "neutral"
+    else:
+        return "positive"
+
+
+df_review = load_reviews({path!r})
+sizes = {sizes!r}
+# Peak RSS from here on: reset VmHWM to the current RSS
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")
+base = status_mb("VmRSS")
+start = time.perf_counter()
+{label}
+labeled = time.perf_counter()
+{sample}
+sampled = time.perf_counter()
+peak = status_mb("VmHWM")
+digest = pd.util.hash_pandas_object(df_review_bal[["Text", "sentiment"]].astype(str), index=False).sum()
+print(labeled - start, sampled - labeled, peak - base, len(df_review_bal), digest)
+"""
+
+CASES = {
+    "notebook": (
+        "df_review['sentiment'] = df_review['Rating'].apply(map_sentiment)",
+        "df_positive = df_review[df_review['sentiment']=='positive']\n"
+        "df_negative = df_review[df_review['sentiment']=='negative']\n"
+        "df_neutral  = df_review[df_review['sentiment']=='neutral']\n"
+        "pos_review = df_positive.sample(n=sizes['positive'], random_state=42)\n"
+        "neg_review = df_negative.sample(n=sizes['negative'], random_state=42)\n"
+        "neu_review = df_neutral.sample(n=sizes['neutral'], random_state=42)\n"
+        "df_review_bal = pd.concat([pos_review, neg_review, neu_review])\n"
+        "df_review_bal = df_review_bal.sample(frac=1, random_state=42).reset_index(drop=True)"
+    ),
+    "vectorized": (
+        "sentiment_code = sentiment_codes(df_review['Rating'])\n"
+        "df_review['sentiment'] = pd.Categorical.from_codes(sentiment_code, SENTIMENTS)",
+        "df_review_bal = balanced_reviews(df_review, sentiment_code, sizes, random_state=42)"
+    )
+}
+
+
+# A Reviews-like Parquet file (review_data's converted layout: a "row"
+# column, rows clustered by Rating) with the real rating counts
+def synthetic_reviews(path, seed=42):
+    rng = np.random.default_rng(seed)
+    ratings = np.repeat(np.arange(1, 6, dtype=np.int8), RATING_COUNTS)
+    rows = len(ratings)
+    order = rng.permutation(rows).astype(np.int32)
+    bank = np.array([" ".join(rng.choice(WORDS, rng.integers(20, 150))) for _ in range(4000)], dtype=object)
+    df = pd.DataFrame({
+        "Id": order.astype(np.int64) + 1,
+        "ProductId": np.char.add("B00", rng.integers(0, 74258, rows).astype(str)),
+        "UserId": np.char.add("A", rng.integers(0, 256059, rows).astype(str)),
+        "ProfileName": np.char.add("user ", rng.integers(0, 218418, rows).astype(str)),
+        "HelpfulnessNumerator": rng.integers(0, 10, rows, dtype=np.int32),
+        "HelpfulnessDenominator": rng.integers(0, 10, rows, dtype=np.int32),
+        "Rating": ratings,
+        "Time": rng.integers(939340800, 1351209600, rows),
+        "Summary": bank[rng.integers(0, len(bank), rows)],
+        "Text": [text + f" #{i}" for i, text in enumerate(bank[rng.integers(0, len(bank), rows)])],
+        "row": order
+    })
+    df.to_parquet(path, index=False, row_group_size=65536)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notebook labeling / sampling vs vectorized lookup + row indices")
+    parser.add_argument("--parquet", help="Reviews.parquet from review_data.py (default: synthetic reviews)")
+    parser.add_argument("--sizes", type=int, nargs=3, default=[100000, 80000, 40000],
+                        metavar=("POSITIVE", "NEGATIVE", "NEUTRAL"),
+                        help="reviews sampled per class (default: %(default)s)")
+    args = parser.parse_args()
+    sizes = dict(zip(("positive", "negative", "neutral"), args.sizes))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.parquet
+        if path is None:
+            path = os.path.join(tmp, "reviews.parquet")
+            synthetic_reviews(path)
+
+        print(f"{'case':<11}{'label s':>9}{'sample s':>10}{'total s':>9}{'peak MB':>9}")
+        digests = {}
+        for case, (label, sample) in CASES.items():
+            code = MEASURE.format(path=path, sizes=sizes, label=label, sample=sample)
+            out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                                 text=True).stdout.split()
+            label_s, sample_s, peak = float(out[0]), float(out[1]), float(out[2])
+            digests[case] = (int(out[3]), out[4])
+            print(f"{case:<11}{label_s:>9.2f}{sample_s:>10.2f}{label_s + sample_s:>9.2f}{peak:>9.0f}")
+    print(f"same {digests['notebook'][0]:,} reviews in the same order: {len(set(digests.values())) == 1}")
+
+
+if __name__ == "__main__":
+    main()
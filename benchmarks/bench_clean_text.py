@@ -0,0 +1,68 @@
+"""Throughput of clean_texts() against Series.apply(clean_text).
+
+Uses the Text column of the Kaggle Reviews.csv when --csv is given,
+otherwise a synthetic corpus of the same size (568,454 reviews) built from
+review-like sentences with <br /> tags, apostrophes and punctuation.
+
+Run from the repository root:
+    python -m benchmarks.bench_clean_text [--csv Reviews.csv] [--rows 568454]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from text_clean import clean_text, clean_texts
+
+# Size of the Amazon Fine Food Reviews corpus
+CORPUS_ROWS = 568454
+
+SENTENCES = [
+    "I have bought several of the Vitality canned dog food products and have found them all to be of good quality.",
+    "Product arrived labeled as Jumbo Salted Peanuts...the peanuts were actually small sized unsalted.",
+    "This is a confection that has been around a few centuries.<br /><br />It's a light, pillowy citrus gelatin.",
+    "If you are looking for the secret ingredient in Robitussin I believe I have found it.",
+    "Great taffy at a great price.  There was a wide assortment of yummy taffy.",
+    "I didn't like it at all, and the box wasn’t even sealed!!! 2/10 would not buy again.",
+    "The flavor is okay &amp; the price ($4.99) is fair, but it's nothing special.",
+    "My kids can't get enough of these <a href=\"http://www.amazon.com/dp/B000\">crackers</a>."
+]
+
+
+def synthetic_corpus(rows, seed=42):
+    rng = random.Random(seed)
+    return pd.Series([" ".join(rng.choices(SENTENCES, k=rng.randint(1, 6))) for _ in range(rows)],
+                     name="Text")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_texts() vs Series.apply(clean_text)")
+    parser.add_argument("--csv", help="path to Reviews.csv (default: synthetic corpus)")
+    parser.add_argument("--rows", type=int, default=CORPUS_ROWS, help="reviews to clean (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, encoding="latin1", usecols=["Text"], nrows=args.rows)["Text"]
+    else:
+        texts = synthetic_corpus(args.rows)
+    print(f"{len(texts):,} reviews, {texts.str.len().mean():.0f} chars on average")
+
+    start = time.perf_counter()
+    expected = texts.apply(clean_text)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cleaned = clean_texts(texts)
+    batch_seconds = time.perf_counter() - start
+
+    if not cleaned.equals(expected):
+        raise SystemExit("clean_texts() output differs from clean_text()")
+
+    print(f"Series.apply(clean_text): {apply_seconds:7.2f}s  {len(texts) / apply_seconds:>10,.0f} reviews/s")
+    print(f"clean_texts(Series):      {batch_seconds:7.2f}s  {len(texts) / batch_seconds:>10,.0f} reviews/s")
+    print(f"speedup: {apply_seconds / batch_seconds:.1f}x, output identical")
+
+
+if __name__ == "__main__":
+    main()
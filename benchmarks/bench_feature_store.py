@@ -0,0 +1,80 @@
+"""Recomputing the notebook's features vs loading them from the feature store.
+
+Builds a 220,000-review balanced sample (synthetic text, or the Text column
+of Reviews.csv with --csv), splits it like the notebook and measures
+  * recompute: clean_texts() on train + test, fit_transform + transform
+    with the notebook's TfidfVectorizer settings
+  * first build: the same plus writing the store entry
+  * store hit: build_features() again (key hash + memory-mapped load), and
+    the first pass over both matrices (a sum of their values)
+
+Run from the repository root:
+    python -m benchmarks.bench_feature_store [--csv Reviews.csv] [--rows 220000]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+
+from benchmarks.bench_clean_text import synthetic_corpus
+from feature_store import build_features
+from text_clean import clean_texts
+
+# A handful of the notebook's stop words (the full list needs NLTK data)
+STOP_WORDS = ["the", "a", "and", "of", "to", "is", "it", "i", "this", "was",
+              "like", "good", "great", "taste", "flavor", "product", "amazon", "price"]
+
+
+def notebook_vectorizer():
+    return TfidfVectorizer(stop_words=STOP_WORDS, ngram_range=(1, 2), max_features=10000,
+                           min_df=5, max_df=0.7, sublinear_tf=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature recompute vs feature store load")
+    parser.add_argument("--csv", help="path to Reviews.csv (default: synthetic corpus)")
+    parser.add_argument("--rows", type=int, default=220000, help="reviews in the sample (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, encoding="latin1", usecols=["Text"], nrows=args.rows)["Text"].astype(str)
+    else:
+        texts = synthetic_corpus(args.rows)
+    labels = pd.Series(np.random.default_rng(42).choice(["negative", "neutral", "positive"], len(texts),
+                                                        p=[80 / 220, 40 / 220, 100 / 220]))
+    train_x, test_x, train_y, test_y = train_test_split(texts, labels, test_size=0.2, random_state=1,
+                                                        stratify=labels)
+    print(f"{len(train_x):,} train / {len(test_x):,} test reviews")
+
+    start = time.perf_counter()
+    vectorizer = notebook_vectorizer()
+    expected = vectorizer.fit_transform(clean_texts(train_x))
+    vectorizer.transform(clean_texts(test_x))
+    recompute = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        start = time.perf_counter()
+        build_features(train_x, train_y, test_x, test_y, notebook_vectorizer(), store_dir=store_dir)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = build_features(train_x, train_y, test_x, test_y, notebook_vectorizer(), store_dir=store_dir)
+        hit = time.perf_counter() - start
+        start = time.perf_counter()
+        features.train_x_vector.data.sum() + features.test_x_vector.data.sum()
+        touch = time.perf_counter() - start
+
+        if (features.train_x_vector != expected).nnz:
+            raise SystemExit("Stored train_x_vector differs from a fresh fit_transform")
+
+    print(f"recompute     {recompute:8.2f}s")
+    print(f"first build   {first:8.2f}s  (recompute + write)")
+    print(f"store hit     {hit:8.2f}s  ({recompute / hit:.0f}x faster) + {touch * 1000:.0f} ms first pass over the matrices")
+
+
+if __name__ == "__main__":
+    main()
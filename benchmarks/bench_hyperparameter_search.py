@@ -0,0 +1,110 @@
+"""Exhaustive grid vs hyperparameter_search's successive halving, wall clock.
+
+On a synthetic labeled corpus (benchmarks.bench_incremental.labeled_corpus),
+cleaned once and split into search-train / validation reviews, measures
+  * grid: every candidate of BENCH_SPACE as a GridSearchCV over a
+    TfidfVectorizer + model pipeline would run it - the vectorizer fitted
+    on the cleaned text again for each candidate, every candidate on all
+    search-train reviews, one after another
+  * halving: tokenize_stage once, then successive_halving() with --workers
+    processes (column selection of the cached counts per vectorizer
+    setting, candidates dropped per rung)
+and prints the number of model fits, the time and the best validation
+accuracy each found. The tokenization is timed separately: the pipeline
+caches it, so reruns and wider spaces skip it.
+
+Run from the repository root:
+    python -m benchmarks.bench_hyperparameter_search [--rows 40000] [--min-rows 3000] [--factor 3] [--workers 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_feature_store import STOP_WORDS
+from benchmarks.bench_incremental import labeled_corpus
+from evaluation import evaluate_model
+from hyperparameter_search import (THROUGHPUT_ROWS, VALIDATION_SIZE, EvaluationCache, candidates,
+                                   successive_halving, tokenize_stage)
+from review_data import SENTIMENTS
+from text_clean import clean_texts
+from training_pipeline import DEFAULT_CONFIG, StageResult, new_estimator, save_entry
+
+BENCH_SPACE = {
+    "vectorizer": {"ngram_range": [[1, 1], [1, 2]], "max_features": [2000, 10000], "min_df": [2, 5]},
+    "models": {"nb": {"alpha": [0.1, 1.0]}, "lr": {"C": [0.5, 1.0, 2.0]}}
+}
+
+
+# Every candidate with its own TfidfVectorizer on all search-train reviews;
+# returns (fits, seconds, best accuracy)
+def exhaustive_grid(pool, train_texts, train_y, val_texts, val_y):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    start = time.perf_counter()
+    best = 0.0
+    for vectorizer_params, kind, params in pool:
+        vectorizer = TfidfVectorizer(stop_words=STOP_WORDS, **dict(vectorizer_params,
+                                     ngram_range=tuple(vectorizer_params["ngram_range"])))
+        X = vectorizer.fit_transform(train_texts)
+        model = new_estimator(kind, dict(DEFAULT_CONFIG["models"][kind], **params)).fit(X, train_y)
+        best = max(best, evaluate_model(model, vectorizer.transform(val_texts), val_y)["metrics"]["accuracy"])
+    return len(pool), time.perf_counter() - start, best
+
+
+# Search-train and validation texts of tokenize_stage's split
+def _split_texts(cleaned, codes, config):
+    from sklearn.model_selection import train_test_split
+    train, val = train_test_split(np.arange(len(codes)), test_size=config["validation_size"],
+                                  random_state=config["random_state"], stratify=codes)
+    return [cleaned[i] for i in train], [cleaned[i] for i in val]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exhaustive grid vs successive-halving search")
+    parser.add_argument("--rows", type=int, default=40000, help="reviews in the corpus (default: %(default)s)")
+    parser.add_argument("--min-rows", type=int, default=3000, help="reviews of the first rung (default: %(default)s)")
+    parser.add_argument("--factor", type=int, default=3, help="halving factor (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count, %(default)s)")
+    args = parser.parse_args()
+
+    texts, labels = labeled_corpus(args.rows)
+    cleaned = clean_texts(texts)
+    codes = np.searchsorted(np.array(SENTIMENTS), labels.to_numpy(dtype=str)).astype(np.int8)
+    config = {"stop_words": STOP_WORDS, "ngram_range": [1, 2], "min_df": 2, "validation_size": VALIDATION_SIZE,
+              "random_state": 1, "throughput_rows": THROUGHPUT_ROWS}
+    vectorizer_base = {name: value for name, value in DEFAULT_CONFIG["vectorizer"].items() if name != "stop_words"}
+    pool = candidates(BENCH_SPACE, {"vectorizer": vectorizer_base})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        outputs = tokenize_stage(config, {"train": cleaned}, {"train_y": codes})
+        tokenize_seconds = time.perf_counter() - start
+        meta = save_entry(tmp, "tokenize", "bench", outputs, {})
+        tokens = StageResult(os.path.join(tmp, "tokenize", "bench"), meta, outputs)
+        labels = np.array(SENTIMENTS, dtype=object)
+        train_y, val_y = labels[outputs["train_y"]], labels[outputs["val_y"]]
+        train_texts, val_texts = _split_texts(cleaned, codes, config)
+        print(f"{len(train_texts):,} search-train / {len(val_texts):,} validation reviews, {len(pool)} candidates, "
+              f"{os.cpu_count()} CPU(s), {args.workers} worker(s)")
+
+        start = time.perf_counter()
+        rungs = successive_halving(tokens, pool, DEFAULT_CONFIG["models"], STOP_WORDS,
+                                   EvaluationCache(os.path.join(tmp, "evaluations.jsonl")),
+                                   args.min_rows, args.factor, args.workers, progress=None)
+        halving = time.perf_counter() - start
+        fits = sum(rung["evaluated"] for rung in rungs)
+        halving_best = max(result["accuracy"] for result in rungs[-1]["results"])
+
+    grid_fits, grid, grid_best = exhaustive_grid(pool, train_texts, train_y, val_texts, val_y)
+    print(f"grid      {grid_fits:>4} fits {grid:8.1f}s  best accuracy {grid_best:.4f}")
+    print(f"halving   {fits:>4} fits {halving:8.1f}s  best accuracy {halving_best:.4f}  "
+          f"(+{tokenize_seconds:.1f}s tokenizing once; "
+          f"rungs of {', '.join(format(rung['rows'], ',') for rung in rungs)} reviews)")
+    print(f"speedup   {grid / halving:.1f}x ({grid / (halving + tokenize_seconds):.1f}x including the tokenization)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Incremental partial_fit updates vs full retraining: accuracy drift and cost.
+
+A base model is trained on the first half of the training reviews; the rest
+arrives in --updates equal mini-batches. After each batch
+  * incremental: MultinomialNB / SGDClassifier(log_loss) partial_fit on the
+    batch with the vectorizer frozen at the base fit
+    (incremental_training.update_model)
+  * full retrain: clean every review seen so far, refit the vectorizer and
+    fit a fresh model, as rerunning the notebook would
+and both are scored on the same held-out test set.
+
+Uses the Text/Rating columns of a converted Reviews.parquet with --parquet
+(review_data.py), otherwise a synthetic labeled corpus. In the synthetic
+stream later batches bring new phrases (unless --no-drift) that the frozen
+vocabulary has never seen, to show where incremental updates fall behind.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental [--parquet Reviews.parquet] [--rows 220000] [--updates 8]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from benchmarks.bench_clean_text import SENTENCES
+from benchmarks.bench_feature_store import notebook_vectorizer
+from incremental_training import new_model, update_model
+from review_data import load_reviews, sentiment_from_ratings
+from text_clean import clean_texts
+
+# Balanced sample proportions of the notebook (100k / 80k / 40k)
+CLASS_SHARES = {"positive": 100 / 220, "negative": 80 / 220, "neutral": 40 / 220}
+
+PHRASES = {
+    "positive": ["absolutely delicious", "will buy again", "my kids love these", "fresh and crispy",
+                 "highly recommend", "perfect snack", "best i have ever had", "wonderful aroma",
+                 "five stars", "great value for the money", "tastes amazing", "so happy with it"],
+    "negative": ["arrived stale", "waste of money", "tasted awful", "package was damaged",
+                 "never buying again", "completely inedible", "threw it away", "made me sick",
+                 "terrible aftertaste", "very disappointed", "expired when it arrived", "do not buy"],
+    "neutral": ["it was okay", "nothing special", "average at best", "not bad not great",
+                "just fine", "could be better", "decent but pricey", "mixed feelings",
+                "it is what it is", "somewhat bland", "acceptable quality", "middle of the road"]
+}
+
+# Phrases that only appear in the drifted part of the stream
+DRIFT_PHRASES = {
+    "positive": ["crave the new matcha blend", "oat milk version is superb"],
+    "negative": ["new recipe ruined it", "keto bars crumbled to dust"],
+    "neutral": ["new packaging is meh", "keto version tastes ordinary"]
+}
+
+
+# Review-like texts with a sentiment signal: one to three phrases of the
+# label (15% of reviews also get one of another class) among filler
+# sentences. drift=True draws a third of the label phrases from DRIFT_PHRASES.
+def labeled_corpus(rows, seed=42, drift=False):
+    rng = random.Random(seed)
+    classes = list(CLASS_SHARES)
+    labels = rng.choices(classes, weights=list(CLASS_SHARES.values()), k=rows)
+    texts = []
+    for label in labels:
+        parts = rng.choices(SENTENCES, k=rng.randint(1, 4))
+        for _ in range(rng.randint(1, 3)):
+            bank = DRIFT_PHRASES if drift and rng.random() < 1 / 3 else PHRASES
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(bank[label]) + ".")
+        if rng.random() < 0.15:
+            other = rng.choice([c for c in classes if c != label])
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(PHRASES[other]) + ".")
+        texts.append(" ".join(parts))
+    return pd.Series(texts, name="Text"), pd.Series(labels, name="sentiment")
+
+
+def accuracy(model, X, y):
+    return float((model.predict(X) == y).mean())
+
+
+# Seconds and test accuracy of a full retrain on all texts seen so far
+def full_retrain(kind, texts, labels, test_texts, test_y):
+    start = time.perf_counter()
+    vectorizer = notebook_vectorizer()
+    X = vectorizer.fit_transform(clean_texts(texts))
+    model = new_model(kind).fit(X, labels)
+    seconds = time.perf_counter() - start
+    return seconds, accuracy(model, vectorizer.transform(clean_texts(test_texts)), test_y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="partial_fit updates vs full retraining")
+    parser.add_argument("--parquet", help="Reviews.parquet from review_data.py (default: synthetic corpus)")
+    parser.add_argument("--rows", type=int, default=220000, help="reviews in the sample (default: %(default)s)")
+    parser.add_argument("--updates", type=int, default=8, help="mini-batches after the base fit (default: %(default)s)")
+    parser.add_argument("--no-drift", dest="drift", action="store_false",
+                        help="synthetic stream without new phrases")
+    args = parser.parse_args()
+
+    if args.parquet:
+        df = load_reviews(args.parquet, columns=["Text", "Rating"]).sample(args.rows, random_state=42)
+        texts, labels = df["Text"].astype(str).reset_index(drop=True), pd.Series(sentiment_from_ratings(df["Rating"]))
+    else:
+        texts, labels = labeled_corpus(args.rows)
+    train_x, test_x, train_y, test_y = train_test_split(texts, labels, test_size=0.2, random_state=1,
+                                                        stratify=labels)
+    train_x, train_y = train_x.reset_index(drop=True), train_y.to_numpy(dtype=object)
+    test_y = test_y.to_numpy(dtype=object)
+
+    base_rows = len(train_x) // 2
+    if not args.parquet and args.drift:
+        # The stream (second half) and half of the test set talk about
+        # products the base reviews never mention
+        stream_x, stream_y = labeled_corpus(len(train_x) - base_rows, seed=7, drift=True)
+        train_x = pd.concat([train_x[:base_rows], stream_x], ignore_index=True)
+        train_y = np.concatenate([train_y[:base_rows], stream_y.to_numpy(dtype=object)])
+        drift_x, drift_y = labeled_corpus(len(test_x) // 2, seed=11, drift=True)
+        keep = len(test_x) - len(drift_x)
+        test_x = pd.concat([test_x[:keep], drift_x], ignore_index=True)
+        test_y = np.concatenate([test_y[:keep], drift_y.to_numpy(dtype=object)])
+
+    print(f"{base_rows:,} base + {len(train_x) - base_rows:,} streamed reviews in {args.updates} updates, "
+          f"{len(test_x):,} test reviews{' (drifting vocabulary)' if args.drift and not args.parquet else ''}")
+
+    vectorizer = notebook_vectorizer()
+    X_base = vectorizer.fit_transform(clean_texts(train_x[:base_rows]))
+    X_test = vectorizer.transform(clean_texts(test_x))
+    models = {kind: new_model(kind).fit(X_base, train_y[:base_rows]) for kind in ("nb", "sgd")}
+
+    print(f"{'update':>6}{'seen':>9}  {'model':<5}{'incremental':>12}{'full':>8}{'drift':>8}"
+          f"{'update ms':>11}{'retrain s':>11}")
+    bounds = np.linspace(base_rows, len(train_x), args.updates + 1).astype(int)
+    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]), 1):
+        for kind, model in models.items():
+            start = time.perf_counter()
+            update_model(model, train_x[lo:hi].to_numpy(dtype=object), train_y[lo:hi], vectorizer)
+            update_seconds = time.perf_counter() - start
+            incremental = accuracy(model, X_test, test_y)
+            retrain_seconds, full = full_retrain(kind, train_x[:hi], train_y[:hi], test_x, test_y)
+            print(f"{i:>6}{hi:>9,}  {kind:<5}{incremental:>12.4f}{full:>8.4f}{incremental - full:>+8.4f}"
+                  f"{update_seconds * 1000:>11.0f}{retrain_seconds:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
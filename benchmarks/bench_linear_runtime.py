@@ -0,0 +1,70 @@
+"""Benchmark the NumPy linear runtime against the pickled scikit-learn models.
+
+Measures
+  * cold load time: a fresh interpreter importing + loading each model
+  * single-review latency: predict_proba on one TF-IDF row (median of N calls)
+
+Run from the repository root after `python export_linear.py`:
+    python -m benchmarks.bench_linear_runtime [--repeat 2000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from export_linear import BASE_DIR, PICKLES
+from linear_runtime import LINEAR_DIR, load_linear_model
+
+REVIEW = ("The chocolate lava cake was absolutely divine! Rich, decadent chocolate "
+          "flowed perfectly from the center, paired beautifully with vanilla ice cream.")
+
+
+# Wall time of a fresh interpreter running `code` (includes imports)
+def cold_load_seconds(code, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def median_latency(fn, repeat):
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy runtime vs scikit-learn predict_proba")
+    parser.add_argument("--repeat", type=int, default=2000, help="calls per latency measurement")
+    args = parser.parse_args()
+
+    vectorizer = joblib.load(os.path.join(BASE_DIR, "vectorizer.pkl"))
+    X = vectorizer.transform([REVIEW])
+
+    print(f"{'model':<6}{'load sklearn':>14}{'load numpy':>12}{'proba sklearn':>15}{'proba numpy':>13}{'speedup':>9}")
+    for key, filename in PICKLES.items():
+        model_dir = os.path.join(LINEAR_DIR, key)
+        sk_model = joblib.load(os.path.join(BASE_DIR, filename))
+        np_model = load_linear_model(model_dir)
+
+        sk_load = cold_load_seconds(f"import joblib; joblib.load({filename!r})")
+        np_load = cold_load_seconds(
+            f"from linear_runtime import load_linear_model; load_linear_model({model_dir!r})")
+        sk_proba = median_latency(lambda: sk_model.predict_proba(X), args.repeat)
+        np_proba = median_latency(lambda: np_model.predict_proba(X), args.repeat)
+
+        print(f"{key:<6}{sk_load * 1000:>12.0f}ms{np_load * 1000:>10.0f}ms"
+              f"{sk_proba * 1e6:>13.0f}us{np_proba * 1e6:>11.0f}us{sk_proba / np_proba:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Peak memory of MultinomialNB training: dense copy vs CSR vs row chunks.
+
+A synthetic TF-IDF-like CSR matrix the size of the notebook's training set
+(176,000 x 10,000, ~45 non-zeros per row) is saved with
+feature_store.save_csr, then each case fits MultinomialNB in a fresh
+interpreter and reports its time and peak RSS (VmHWM, and the part above
+the interpreter with numpy / scikit-learn imported):
+  * dense: the notebook's train_x_vector.toarray() + fit, on the first
+    --dense-rows rows only (the full copy is rows x 10,000 x 8 bytes,
+    printed for reference)
+  * csr: the whole matrix read into memory and fitted sparse
+  * mmap: the matrix memory-mapped (mapped pages count towards RSS but are
+    page cache the kernel can drop)
+  * chunked: out_of_core_nb.fit_multinomial_nb() within --budget-mb
+
+Run from the repository root:
+    python -m benchmarks.bench_nb_memory [--rows 176000] [--dense-rows 20000] [--budget-mb 32]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+
+from feature_store import save_csr
+
+FEATURES = 10000
+
+MEASURE = """
+import time
+import numpy as np
+from sklearn.naive_bayes import MultinomialNB
+from feature_store import load_csr
+from out_of_core_nb import fit_multinomial_nb
+from review_data import SENTIMENTS
+
+
+def peak_mb():
+    # VmHWM: peak RSS of this process (ru_maxrss would include the parent's)
+    line = next(line for line in open("/proc/self/status") if line.startswith("VmHWM"))
+    return int(line.split()[1]) / 1024
+
+
+path, shape = {path!r}, {shape!r}
+y = np.array(SENTIMENTS, dtype=object)[np.load(path + "/train_y.npy")]
+base = peak_mb()
+start = time.perf_counter()
+{fit}
+print(time.perf_counter() - start, peak_mb(), base, model.class_count_.sum())
+"""
+
+CASES = {
+    "dense": "X = load_csr(path, 'train', shape, mmap_mode=None)[:{dense_rows}].toarray()\n"
+             "model = MultinomialNB().fit(X, y[:{dense_rows}])",
+    "csr": "model = MultinomialNB().fit(load_csr(path, 'train', shape, mmap_mode=None), y)",
+    "mmap": "model = MultinomialNB().fit(load_csr(path, 'train', shape, mmap_mode='r'), y)",
+    "chunked": "model = fit_multinomial_nb(path, 'train', shape, y, {budget} * 2 ** 20)"
+}
+
+
+# Random rows of ~nnz distinct features each, drawn with a skewed feature
+# frequency like TF-IDF vocabularies, l2-normalized
+def synthetic_tfidf(rows, nnz=45, seed=42):
+    rng = np.random.default_rng(seed)
+    counts = np.maximum(rng.poisson(nnz, rows), 1)
+    indptr = np.concatenate([[0], np.cumsum(counts)])
+    weights = 1 / np.arange(1, FEATURES + 1) ** 0.8
+    indices = rng.choice(FEATURES, indptr[-1], p=weights / weights.sum()).astype(np.int32)
+    X = sp.csr_matrix((rng.random(indptr[-1]), indices, indptr), shape=(rows, FEATURES))
+    X.sum_duplicates()
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    return sp.csr_matrix(sp.diags(1 / norms) @ X)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MultinomialNB peak memory: dense vs CSR vs row chunks")
+    parser.add_argument("--rows", type=int, default=176000, help="training rows (default: %(default)s)")
+    parser.add_argument("--dense-rows", type=int, default=20000,
+                        help="rows densified in the dense case (default: %(default)s)")
+    parser.add_argument("--budget-mb", type=int, default=32, help="budget of the chunked case (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        X = synthetic_tfidf(args.rows)
+        save_csr(tmp, "train", X)
+        shares = np.array([80, 40, 100]) / 220
+        np.save(os.path.join(tmp, "train_y.npy"),
+                np.random.default_rng(1).choice(3, args.rows, p=shares).astype(np.int8))
+        print(f"{args.rows:,} x {FEATURES:,} CSR, {X.nnz:,} non-zeros "
+              f"({(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 2 ** 20:.0f} MB); "
+              f"a dense copy would be {args.rows * FEATURES * 8 / 2 ** 30:.1f} GB")
+        del X
+
+        print(f"{'case':<9}{'rows':>9}{'seconds':>9}{'peak MB':>9}{'above imports':>15}")
+        for case, fit in CASES.items():
+            code = MEASURE.format(path=tmp, shape=(args.rows, FEATURES),
+                                  fit=fit.format(dense_rows=args.dense_rows, budget=args.budget_mb))
+            out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                                 text=True).stdout.split()
+            seconds, peak, base, rows = float(out[0]), float(out[1]), float(out[2]), int(float(out[3]))
+            print(f"{case:<9}{rows:>9,}{seconds:>9.2f}{peak:>9.0f}{peak - base:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Scaling of ScoringPool from 1 to N worker processes.
+
+Scores the Text column of the Kaggle Reviews.csv (--csv) or a synthetic
+corpus of the same size in fixed-size chunks, once in-process and then with
+1..N workers, and reports throughput, speedup and parallel efficiency. File
+reading is excluded: the chunks are prepared in memory first. Every pool run
+is checked against the in-process labels and probabilities.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_scoring [--csv Reviews.csv] [--max-workers 8]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import DEFAULT_CHUNK_SIZE, ScoringPool, score_texts
+from benchmarks.bench_clean_text import CORPUS_ROWS, synthetic_corpus
+from model_store import MODEL_KEYS, load_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScoringPool throughput for 1..N workers")
+    parser.add_argument("--csv", help="path to Reviews.csv (default: synthetic corpus)")
+    parser.add_argument("--rows", type=int, default=CORPUS_ROWS, help="reviews to score (default: %(default)s)")
+    parser.add_argument("--model", choices=MODEL_KEYS, default="svm")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(),
+                        help="largest pool size (default: number of CPUs)")
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, encoding="latin1", usecols=["Text"], nrows=args.rows)["Text"]
+    else:
+        texts = synthetic_corpus(args.rows)
+    texts = texts.to_numpy(dtype=object)
+    batches = [texts[i:i + args.chunk_size] for i in range(0, len(texts), args.chunk_size)]
+    print(f"{len(texts):,} reviews in {len(batches)} chunks of {args.chunk_size:,}, "
+          f"model {args.model}, {os.cpu_count()} CPUs")
+
+    model, vectorizer = load_artifact(args.model), load_artifact("vectorizer")
+    start = time.perf_counter()
+    expected = [score_texts(batch, model, vectorizer) for batch in batches]
+    serial = time.perf_counter() - start
+    expected_idx = np.concatenate([label_idx for label_idx, _ in expected])
+    expected_probs = np.concatenate([probs for _, probs in expected])
+
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>11}{'speedup':>9}{'efficiency':>12}  identical")
+    print(f"{'serial':>8}{serial:>10.2f}{len(texts) / serial:>11,.0f}{1.0:>8.2f}x{'':>12}")
+    for workers in range(1, args.max_workers + 1):
+        with ScoringPool(args.model, workers) as pool:
+            # Start the workers (and attach the artifacts) outside the timing
+            list(pool.map([batches[0][:1]] * workers))
+            start = time.perf_counter()
+            results = list(pool.map(batches))
+            seconds = time.perf_counter() - start
+        identical = (np.array_equal(np.concatenate([r[0] for r in results]), expected_idx)
+                     and np.array_equal(np.concatenate([r[1] for r in results]), expected_probs))
+        print(f"{workers:>8}{seconds:>10.2f}{len(texts) / seconds:>11,.0f}{serial / seconds:>8.2f}x"
+              f"{serial / seconds / workers:>11.0%}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
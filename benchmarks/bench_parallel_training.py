@@ -0,0 +1,71 @@
+"""Serial notebook training vs the parallel training driver, wall clock.
+
+On a synthetic labeled corpus (benchmarks.bench_incremental.labeled_corpus),
+split and vectorized like the notebook, measures
+  * notebook: cells 16, 18 and 20 - the calibrated SVM (cv=5),
+    MultinomialNB and LogisticRegression on the sparse train_x_vector, one
+    after another
+  * parallel: parallel_training.fit_models() with --workers processes over
+    the memory-mapped matrix, calibration folds as separate tasks
+and checks that the parallel models predict the same probabilities.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_training [--rows 30000] [--workers 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from benchmarks.bench_feature_store import notebook_vectorizer
+from benchmarks.bench_incremental import labeled_corpus
+from feature_store import save_csr
+from parallel_training import fit_models
+from review_data import SENTIMENTS
+from text_clean import clean_texts
+from training_pipeline import DEFAULT_CONFIG, new_estimator
+
+# Fit the three models one after another; returns ({kind: model}, seconds)
+def fit_serial(X, y):
+    models = {}
+    start = time.perf_counter()
+    for kind, params in DEFAULT_CONFIG["models"].items():
+        models[kind] = new_estimator(kind, params).fit(X, y)
+    return models, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial notebook training vs parallel_training.fit_models")
+    parser.add_argument("--rows", type=int, default=30000, help="reviews in the sample (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count, %(default)s)")
+    args = parser.parse_args()
+
+    texts, labels = labeled_corpus(args.rows)
+    train_x, _, train_y, _ = train_test_split(texts, labels, test_size=0.2, random_state=1, stratify=labels)
+    X = notebook_vectorizer().fit_transform(clean_texts(train_x))
+    y = train_y.to_numpy(dtype=object)
+    print(f"{X.shape[0]:,} x {X.shape[1]:,} training matrix, {os.cpu_count()} CPU(s), {args.workers} worker(s)")
+
+    notebook_models, notebook = fit_serial(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_csr(tmp, "train", X)
+        np.save(os.path.join(tmp, "train_y.npy"), np.searchsorted(np.array(SENTIMENTS), y).astype(np.int8))
+        start = time.perf_counter()
+        results = fit_models(DEFAULT_CONFIG["models"], tmp, "train", X.shape,
+                             os.path.join(tmp, "train_y.npy"), args.workers)
+        parallel = time.perf_counter() - start
+
+    for kind, (model, _) in results.items():
+        diff = np.abs(model.predict_proba(X) - notebook_models[kind].predict_proba(X)).max()
+        print(f"{kind:<4} max |proba diff| vs notebook fit: {diff:.2e}")
+    print(f"notebook  {notebook:8.1f}s  (serial)")
+    print(f"parallel  {parallel:8.1f}s  ({notebook / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Load time and peak RSS: the notebook's read_csv path vs the Parquet loader.
+
+Each case runs in a fresh interpreter (so peak RSS is its own) and loads
+  * csv            read_csv(encoding="latin1", low_memory=False) + the notebook's
+                   Unnamed-column drop and Rating filter
+  * parquet        load_reviews(): all columns
+  * parquet cols   load_reviews(columns=["Text", "Rating"]) - what training needs
+  * parquet 3-star load_reviews(columns=["Text", "Rating"], ratings=[3]) - the
+                   Rating filter skips every row group but the neutral ones
+  * parquet unord  load_reviews(columns=["Text", "Rating"], csv_order=False) -
+                   rows left clustered by Rating
+
+Uses the Kaggle Reviews.csv when --csv is given, otherwise a synthetic file
+of the same shape and size (568,454 rows, Kaggle columns with Score named
+Rating, the notebook's rating distribution). The CSV is converted once with
+review_data.convert_csv_to_parquet() and the loaded frames are checked
+against the CSV path.
+
+Run from the repository root:
+    python -m benchmarks.bench_parquet_load [--csv Reviews.csv] [--rows 568454]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_clean_text import CORPUS_ROWS, synthetic_corpus
+from review_data import convert_csv_to_parquet, load_reviews
+
+# Rating counts of Reviews.csv (notebook, after the 1-5 filter)
+RATING_COUNTS = {1: 52265, 2: 29768, 3: 42605, 4: 80650, 5: 363103}
+
+CSV_LOAD = """
+df = pd.read_csv({csv!r}, encoding="latin1", low_memory=False)
+df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+df = df[df['Rating'].between(1, 5)]
+"""
+
+MEASURE = """
+import time
+start = time.perf_counter()
+import pandas as pd
+from review_data import load_reviews
+{load}
+seconds = time.perf_counter() - start
+# VmHWM: peak RSS of this process (ru_maxrss would include the parent's
+# peak, inherited through fork)
+peak = next(line for line in open("/proc/self/status") if line.startswith("VmHWM"))
+print(seconds, int(peak.split()[1]) / 1024, len(df))
+"""
+
+
+def synthetic_reviews_csv(path, rows, seed=42):
+    rng = np.random.default_rng(seed)
+    ratings = np.array(list(RATING_COUNTS))
+    weights = np.array(list(RATING_COUNTS.values()), dtype=float)
+    helpful = rng.integers(0, 10, rows)
+    df = pd.DataFrame({
+        "Id": np.arange(1, rows + 1),
+        "ProductId": np.char.add("B00", rng.integers(0, 74258, rows).astype(str)),
+        "UserId": np.char.add("A", rng.integers(0, 256059, rows).astype(str)),
+        "ProfileName": np.char.add("user ", rng.integers(0, 218418, rows).astype(str)),
+        "HelpfulnessNumerator": helpful,
+        "HelpfulnessDenominator": helpful + rng.integers(0, 3, rows),
+        "Rating": rng.choice(ratings, rows, p=weights / weights.sum()),
+        "Time": rng.integers(939340800, 1351209600, rows),
+        "Summary": synthetic_corpus(rows, seed=seed + 1).str.slice(0, 40),
+        "Text": synthetic_corpus(rows, seed=seed)
+    })
+    df.to_csv(path, index=False, encoding="latin1", errors="replace")
+
+
+# (seconds, peak RSS in MB, rows) of `load` in a fresh interpreter
+def measure(load):
+    out = subprocess.run([sys.executable, "-c", MEASURE.format(load=load)], check=True,
+                         capture_output=True, text=True).stdout.split()
+    return float(out[0]), float(out[1]), int(out[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="read_csv vs Parquet load time and peak RSS")
+    parser.add_argument("--csv", help="path to Reviews.csv (default: synthetic file)")
+    parser.add_argument("--rows", type=int, default=CORPUS_ROWS, help="rows of the synthetic file (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, best is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = args.csv
+        if csv is None:
+            csv = os.path.join(tmp, "Reviews.csv")
+            synthetic_reviews_csv(csv, args.rows)
+        parquet = os.path.join(tmp, "Reviews.parquet")
+
+        start = time.perf_counter()
+        result = convert_csv_to_parquet(csv, parquet)
+        convert_seconds = time.perf_counter() - start
+        print(f"{os.path.basename(csv)}: {os.path.getsize(csv) / 1024 ** 2:.0f} MB -> Parquet "
+              f"{os.path.getsize(parquet) / 1024 ** 2:.0f} MB ({result['rows']:,} rows) "
+              f"in {convert_seconds:.1f}s (one-time)")
+
+        # The loader must give the notebook's frame
+        expected = pd.read_csv(csv, encoding="latin1", low_memory=False)
+        expected = expected.loc[:, ~expected.columns.str.contains('^Unnamed')]
+        expected = expected[expected["Rating"].between(1, 5)]
+        loaded = load_reviews(parquet)
+        if not loaded.index.equals(expected.index):
+            raise SystemExit("Parquet rows differ from the CSV path")
+        for column in expected.columns:
+            if not (loaded[column].astype(str).to_numpy() == expected[column].astype(str).to_numpy()).all():
+                raise SystemExit(f"Parquet column {column} differs from the CSV path")
+        del expected, loaded
+
+        cases = {
+            "csv": CSV_LOAD.format(csv=csv),
+            "parquet": f"df = load_reviews({parquet!r})",
+            "parquet cols": f"df = load_reviews({parquet!r}, columns=['Text', 'Rating'])",
+            "parquet 3-star": f"df = load_reviews({parquet!r}, columns=['Text', 'Rating'], ratings=[3])",
+            "parquet unord": f"df = load_reviews({parquet!r}, columns=['Text', 'Rating'], csv_order=False)"
+        }
+        print(f"{'case':<16}{'rows':>10}{'load':>10}{'peak RSS':>11}{'speedup':>9}")
+        baseline = None
+        for name, load in cases.items():
+            runs = [measure(load) for _ in range(args.repeat)]
+            seconds = min(run[0] for run in runs)
+            rss = min(run[1] for run in runs)
+            baseline = baseline or seconds
+            print(f"{name:<16}{runs[0][2]:>10,}{seconds:>9.2f}s{rss:>8.0f} MB{baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
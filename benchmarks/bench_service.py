@@ -0,0 +1,97 @@
+"""Load test of sentiment_service: concurrent single-review clients.
+
+Starts the service in-process on a free port, then runs --clients
+keep-alive connections that each send --requests POST /predict calls with
+one review, and reports throughput, latency percentiles and the batch size /
+queue depth histograms from /metrics, for each (max batch size, max wait)
+setting. --max-batch-size 1 scores every request on its own, the baseline
+micro-batching is measured against.
+
+Run from the repository root:
+    python -m benchmarks.bench_service [--clients 32] [--requests 100]
+        [--settings 1:0 64:0 64:2]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks.bench_svm_compiled import REVIEWS
+from sentiment_service import SentimentService
+
+
+async def call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    result = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}: {result}")
+    return result
+
+
+async def client(port, requests, model, offset, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(requests):
+        start = time.perf_counter()
+        await call(reader, writer, "POST", "/predict", {"text": REVIEWS[(offset + i) % len(REVIEWS)], "model": model})
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(clients, requests, model, max_batch_size, max_wait_ms):
+    service = SentimentService(max_batch_size, max_wait_ms)
+    await service.batcher(model)
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(port, requests, model, i, latencies) for i in range(clients)])
+    seconds = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    metrics = (await call(reader, writer, "GET", "/metrics"))["models"][model]
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.01)  # let the connection handlers see EOF
+    server.close()
+    await server.wait_closed()
+    service.close()
+
+    latencies = np.array(latencies) * 1000
+    print(f"max batch {max_batch_size}, max wait {max_wait_ms:g} ms: {len(latencies) / seconds:,.0f} req/s, "
+          f"p50 {np.percentile(latencies, 50):.1f} ms, p95 {np.percentile(latencies, 95):.1f} ms, "
+          f"p99 {np.percentile(latencies, 99):.1f} ms")
+    print(f"  batch size    mean {metrics['batch_size']['mean']:.1f}, max {metrics['batch_size']['max']}, "
+          f"histogram {metrics['batch_size']['buckets']}")
+    print(f"  queue depth   mean {metrics['queue_depth_on_arrival']['mean']:.1f}, "
+          f"histogram {metrics['queue_depth_on_arrival']['buckets']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of sentiment_service")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=100, help="requests per client (default: %(default)s)")
+    parser.add_argument("--model", default="svm")
+    parser.add_argument("--settings", nargs="+", default=["1:0", "64:0", "64:2"],
+                        help="max_batch_size:max_wait_ms pairs (default: %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients x {args.requests} requests, model {args.model}")
+    for setting in args.settings:
+        max_batch_size, max_wait_ms = setting.split(":")
+        asyncio.run(run(args.clients, args.requests, args.model, int(max_batch_size), float(max_wait_ms)))
+
+
+if __name__ == "__main__":
+    main()
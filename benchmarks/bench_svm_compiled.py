@@ -0,0 +1,67 @@
+"""Benchmark the compiled calibrated SVM against scikit-learn and the per-fold runtime.
+
+CalibratedClassifierCV(LinearSVC, cv=5, method="isotonic") runs 5 decision
+functions and 5 x 3 isotonic interpolations per prediction. The compiled
+artifact evaluates one stacked (n_features, 15) matmul and one packed
+searchsorted lookup. This script reports latency per batch size and the
+largest probability difference against the original predict_proba.
+
+Run from the repository root:
+    python -m benchmarks.bench_svm_compiled [--repeat 200]
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+
+from export_linear import BASE_DIR, calibrated_svc_folds
+from linear_runtime import CalibratedLinearSVC, CompiledCalibratedSVC, compile_calibrated_svc, COMPILED_SVC_ARRAYS
+
+REVIEWS = [
+    "The pasta was incredible and the sauce tasted fresh.",
+    "Shipping was slow and the snacks arrived stale.",
+    "It's okay, nothing special but not terrible either.",
+    "Absolutely delicious cookies, will buy again!",
+    "The seasoning was bland and the texture was mushy.",
+    "Extremely disappointed with my order. The food arrived cold after waiting over an hour.",
+    "The atmosphere and service were excellent, however the food was hit or miss."
+]
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled SVM vs CalibratedClassifierCV.predict_proba")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per measurement (best is kept)")
+    args = parser.parse_args()
+
+    vectorizer = joblib.load(os.path.join(BASE_DIR, "vectorizer.pkl"))
+    sk_model = joblib.load(os.path.join(BASE_DIR, "svm_model.pkl"))
+    folds = calibrated_svc_folds(sk_model)
+    fold_model = CalibratedLinearSVC(sk_model.classes_, folds)
+    arrays = compile_calibrated_svc(folds)
+    compiled = CompiledCalibratedSVC(sk_model.classes_, *[arrays[name] for name in COMPILED_SVC_ARRAYS])
+
+    print(f"{'batch':>7}{'sklearn':>12}{'per-fold':>12}{'compiled':>12}{'speedup':>9}{'max |diff|':>12}")
+    for batch in (1, 100, 10000):
+        X = vectorizer.transform([REVIEWS[i % len(REVIEWS)] for i in range(batch)])
+        repeat = max(3, args.repeat // batch * 10) if batch > 1 else args.repeat
+        sk = best_time(lambda: sk_model.predict_proba(X), repeat)
+        per_fold = best_time(lambda: fold_model.predict_proba(X), repeat)
+        fast = best_time(lambda: compiled.predict_proba(X), repeat)
+        diff = np.abs(sk_model.predict_proba(X) - compiled.predict_proba(X)).max()
+        print(f"{batch:>7}{sk * 1e3:>10.3f}ms{per_fold * 1e3:>10.3f}ms{fast * 1e3:>10.3f}ms"
+              f"{sk / fast:>8.1f}x{diff:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark the exported vectorizer (tfidf_runtime) against vectorizer.pkl.
+
+Measures
+  * cold load time: a fresh interpreter importing + loading the vectorizer
+  * transform() time per batch size on cleaned synthetic reviews
+and checks that both produce the same CSR matrix.
+
+Run from the repository root after `python export_linear.py`:
+    python -m benchmarks.bench_tfidf_runtime [--rows 10000]
+"""
+import argparse
+import os
+
+import joblib
+import numpy as np
+
+from benchmarks.bench_clean_text import synthetic_corpus
+from benchmarks.bench_linear_runtime import cold_load_seconds
+from benchmarks.bench_svm_compiled import best_time
+from export_linear import BASE_DIR, VECTORIZER_PICKLE
+from linear_runtime import LINEAR_DIR, load_linear_model
+from text_clean import clean_texts
+
+
+def same_matrix(a, b):
+    return (a.shape == b.shape and np.array_equal(a.indptr, b.indptr)
+            and np.array_equal(a.indices, b.indices) and np.array_equal(a.data, b.data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact vectorizer vs TfidfVectorizer.transform")
+    parser.add_argument("--rows", type=int, default=10000, help="largest batch size (default: %(default)s)")
+    args = parser.parse_args()
+
+    model_dir = os.path.join(LINEAR_DIR, "vectorizer")
+    vectorizer = joblib.load(os.path.join(BASE_DIR, VECTORIZER_PICKLE))
+    compact = load_linear_model(model_dir)
+    texts = list(clean_texts(synthetic_corpus(args.rows)))
+
+    sk_load = cold_load_seconds(f"import joblib; joblib.load({VECTORIZER_PICKLE!r})")
+    np_load = cold_load_seconds(
+        f"from linear_runtime import load_linear_model; load_linear_model({model_dir!r}).transform([''])")
+    print(f"cold load: pickle {sk_load * 1000:.0f}ms, compact {np_load * 1000:.0f}ms")
+
+    print(f"{'batch':>7}{'sklearn':>12}{'compact':>12}{'speedup':>9}  identical")
+    for batch in sorted({1, 100, args.rows}):
+        docs = texts[:batch]
+        repeat = max(3, 1000 // batch)
+        sk = best_time(lambda: vectorizer.transform(docs), repeat)
+        fast = best_time(lambda: compact.transform(docs), repeat)
+        identical = same_matrix(vectorizer.transform(docs), compact.transform(docs))
+        print(f"{batch:>7}{sk * 1e3:>10.2f}ms{fast * 1e3:>10.2f}ms{sk / fast:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
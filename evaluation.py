@@ -0,0 +1,244 @@
+"""Predict-once model evaluation and the metrics artifacts of the Performance page.
+
+The notebook calls model.predict(test_x_vector) separately for score(),
+classification_report() and confusion_matrix() - three scoring passes per
+model. evaluate_model() scores the test set once (predict_proba; the
+predicted class is its argmax, as in every model's predict) and derives
+accuracy, per-class precision / recall / F1, the confusion matrix and the
+log loss from those arrays with NumPy.
+
+save_metrics() writes an evaluation run to artifacts/evaluation/vNNNN/:
+
+  * y_true.npy and <model>.pred.npy as int8 class indices into "classes",
+    <model>.proba.npy as float32 probabilities;
+  * metrics.json (METRICS_FORMAT) with the metrics of every model, its
+    scoring time, the model_store.artifact_version it was evaluated with
+    and a description of the test set.
+
+The app shows the latest run (load_metrics()). The notebook and
+training_pipeline.py write a run after exporting the models; to evaluate
+the artifacts the app serves on the test split of the last notebook run
+(feature store):
+    python evaluation.py [--features KEY]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from model_store import BASE_DIR, MODEL_KEYS, artifact_version, load_artifact, vectorizer_fingerprint
+
+METRICS_DIR = os.path.join(BASE_DIR, "artifacts", "evaluation")
+
+# Bump when the layout of metrics.json changes
+METRICS_FORMAT = 1
+
+# Label order of the notebook's classification reports and confusion matrices
+REPORT_LABELS = ["positive", "negative", "neutral"]
+
+
+# Accuracy, classification report (sklearn's output_dict layout, zero
+# division as 0), confusion matrix (rows: true, columns: predicted, in
+# `labels` order) and log loss from class indices into `classes`
+def compute_metrics(y_true, pred, proba, classes, labels=REPORT_LABELS):
+    classes = [str(c) for c in classes]
+    n = len(classes)
+    y_true = np.asarray(y_true, dtype=np.int64)
+    pred = np.asarray(pred, dtype=np.int64)
+    counts = np.bincount(y_true * n + pred, minlength=n * n).reshape(n, n)
+
+    tp = np.diag(counts).astype(float)
+    support = counts.sum(axis=1)
+    predicted = counts.sum(axis=0)
+    precision = np.divide(tp, predicted, out=np.zeros(n), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros(n), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(n), where=precision + recall > 0)
+
+    order = [classes.index(label) for label in labels]
+    report = {classes[i]: {"precision": float(precision[i]), "recall": float(recall[i]),
+                           "f1-score": float(f1[i]), "support": int(support[i])} for i in order}
+    accuracy = float(tp.sum() / max(len(y_true), 1))
+    report["accuracy"] = accuracy
+    weights = support[order] / max(support[order].sum(), 1)
+    for name, average in (("macro avg", None), ("weighted avg", weights)):
+        report[name] = {metric: float(np.average([report[classes[i]][metric] for i in order], weights=average))
+                        for metric in ("precision", "recall", "f1-score")}
+        report[name]["support"] = int(support[order].sum())
+
+    true_proba = np.clip(np.asarray(proba, dtype=np.float64)[np.arange(len(y_true)), y_true], 1e-15, 1)
+    return {
+        "accuracy": accuracy,
+        "log_loss": float(-np.log(true_proba).mean()),
+        "labels": list(labels),
+        "report": report,
+        "confusion_matrix": counts[np.ix_(order, order)].tolist()
+    }
+
+
+# Class indices into `classes` of a label array
+def label_codes(labels, classes):
+    labels = np.asarray(labels).astype(str)
+    classes = np.asarray(classes).astype(str)
+    codes = np.searchsorted(classes, labels)
+    if len(labels) and (codes.max() >= len(classes) or (classes[codes] != labels).any()):
+        raise ValueError(f"Labels outside the model classes {list(classes)}")
+    return codes.astype(np.int8)
+
+
+# Score X once with `model` and derive its metrics; proba may be given
+# instead when the probabilities were computed elsewhere (row chunks)
+def evaluate_model(model, X, y_true, proba=None):
+    start = time.perf_counter()
+    if proba is None:
+        proba = model.predict_proba(X)
+    seconds = time.perf_counter() - start
+    pred = np.argmax(proba, axis=1).astype(np.int8)
+    codes = label_codes(y_true, model.classes_)
+    return {
+        "classes": [str(c) for c in model.classes_],
+        "y_true": codes,
+        "pred": pred,
+        "proba": np.asarray(proba, dtype=np.float32),
+        "metrics": dict(compute_metrics(codes, pred, proba, model.classes_), predict_seconds=seconds,
+                        rows_per_second=len(codes) / seconds if seconds > 0 else None)
+    }
+
+
+# evaluate_model() for every model of {key: model}
+def evaluate_models(models, X, y_true):
+    return {key: evaluate_model(model, X, y_true) for key, model in models.items()}
+
+
+# The notebook's classification_report text for one model's metrics (the
+# same string, trailing newline included)
+def format_report(metrics):
+    report = metrics["report"]
+    width = max(len(name) for name in list(metrics["labels"]) + ["weighted avg"])
+    lines = [f"{'':>{width}} " + "".join(f" {header:>9}" for header in ("precision", "recall", "f1-score", "support")),
+             ""]
+    for name in metrics["labels"]:
+        row = report[name]
+        lines.append(f"{name:>{width}} " + "".join(f" {row[m]:>9.2f}" for m in ("precision", "recall", "f1-score"))
+                     + f" {row['support']:>9}")
+    lines.append("")
+    lines.append(f"{'accuracy':>{width}} " + f" {'':>9}" * 2 + f" {report['accuracy']:>9.2f}"
+                 + f" {report['macro avg']['support']:>9}")
+    for name in ("macro avg", "weighted avg"):
+        row = report[name]
+        lines.append(f"{name:>{width}} " + "".join(f" {row[m]:>9.2f}" for m in ("precision", "recall", "f1-score"))
+                     + f" {row['support']:>9}")
+    return "\n".join(lines) + "\n"
+
+
+# Stored run numbers, oldest first
+def list_versions(store_dir=METRICS_DIR):
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(int(name[1:]) for name in os.listdir(store_dir)
+                  if name.startswith("v") and name[1:].isdigit()
+                  and os.path.exists(os.path.join(store_dir, name, "metrics.json")))
+
+
+# Write the evaluate_model() results of {key: result} as the next run
+# (temporary directory renamed into place, retried if another process took
+# the number); returns its metrics.json content. versions default to the
+# artifact_version of what the app serves now, so write (and export) the
+# evaluated models first.
+def save_metrics(results, test_set=None, versions=None, store_dir=METRICS_DIR):
+    if versions is None:
+        versions = {key: artifact_version(key) for key in results if key in MODEL_KEYS}
+    first = next(iter(results.values()))
+    os.makedirs(store_dir, exist_ok=True)
+    tmp_path = os.path.join(store_dir, f".tmp-{os.getpid()}")
+    os.makedirs(tmp_path, exist_ok=True)
+    try:
+        np.save(os.path.join(tmp_path, "y_true.npy"), first["y_true"])
+        models = {}
+        for key, result in results.items():
+            if result["classes"] != first["classes"] or not np.array_equal(result["y_true"], first["y_true"]):
+                raise ValueError(f"{key} was evaluated on different classes or labels")
+            np.save(os.path.join(tmp_path, f"{key}.pred.npy"), result["pred"])
+            np.save(os.path.join(tmp_path, f"{key}.proba.npy"), result["proba"])
+            models[key] = dict(result["metrics"], artifact_version=versions.get(key))
+        counts = np.bincount(first["y_true"], minlength=len(first["classes"]))
+        while True:
+            existing = list_versions(store_dir)
+            version = existing[-1] + 1 if existing else 1
+            meta = {
+                "format": METRICS_FORMAT,
+                "version": version,
+                "created": time.time(),
+                "classes": first["classes"],
+                "test_set": dict(test_set or {}, rows=int(len(first["y_true"])),
+                                 class_counts={c: int(n) for c, n in zip(first["classes"], counts)}),
+                "models": models
+            }
+            with open(os.path.join(tmp_path, "metrics.json"), "w") as f:
+                json.dump(meta, f, indent=2)
+            try:
+                os.rename(tmp_path, os.path.join(store_dir, f"v{version:04d}"))
+                return meta
+            except OSError:
+                if not os.path.exists(os.path.join(store_dir, f"v{version:04d}")):
+                    raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+# metrics.json of a run (default: the latest), or None when there is none
+def load_metrics(version=None, store_dir=METRICS_DIR):
+    versions = list_versions(store_dir)
+    if not versions:
+        return None
+    version = versions[-1] if version is None else version
+    with open(os.path.join(store_dir, f"v{version:04d}", "metrics.json")) as f:
+        return json.load(f)
+
+
+# (y_true, pred, proba) arrays of one model in a run, memory-mapped
+def load_predictions(key, version, store_dir=METRICS_DIR):
+    path = os.path.join(store_dir, f"v{version:04d}")
+    return tuple(np.load(os.path.join(path, name), mmap_mode="r")
+                 for name in ("y_true.npy", f"{key}.pred.npy", f"{key}.proba.npy"))
+
+
+# Evaluate the served artifacts on a feature store entry's test split. The
+# stored test matrix is used when the entry's vectorizer is the served one,
+# otherwise its cleaned test texts are vectorized again.
+def evaluate_artifacts(features, keys=MODEL_KEYS):
+    vectorizer = load_artifact("vectorizer")
+    if vectorizer_fingerprint(features.vectorizer) == vectorizer_fingerprint(vectorizer):
+        X = features.test_x_vector
+    else:
+        X = vectorizer.transform(features.test_cleaned)
+    return evaluate_models({key: load_artifact(key) for key in keys}, X, features.test_y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", help="feature store key of the test split (default: the latest entry)")
+    parser.add_argument("--models", nargs="+", choices=MODEL_KEYS, default=list(MODEL_KEYS),
+                        help="models to evaluate (default: all)")
+    args = parser.parse_args()
+
+    from feature_store import latest_features, load_features
+    features = load_features(args.features) if args.features else latest_features()
+    if features is None:
+        sys.exit("evaluation: no stored features; run the notebook's TF-IDF cell first")
+    try:
+        results = evaluate_artifacts(features, args.models)
+        meta = save_metrics(results, {"source": f"features/{features.key}"})
+    except (OSError, ValueError) as e:
+        sys.exit(f"evaluation: {e}")
+    for key, metrics in meta["models"].items():
+        print(f"{key:<4} accuracy {metrics['accuracy']:.4f}  log loss {metrics['log_loss']:.4f}  "
+              f"scored {meta['test_set']['rows']:,} reviews in {metrics['predict_seconds']:.2f}s")
+    print(f"-> {os.path.join(METRICS_DIR, 'v%04d' % meta['version'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Export the pickled scikit-learn models to plain NumPy arrays.
+
+Reads svm_model.pkl, mnb_model.pkl and log_reg_model.pkl (as written by the
+last cell of the notebook) and writes one directory per model under
+artifacts/linear/ that linear_runtime.py can serve without scikit-learn.
+vectorizer.pkl is exported the same way to artifacts/linear/vectorizer as a
+memory-mappable vocabulary + idf layout (see tfidf_runtime.py).
+
+The calibrated SVM is exported "compiled" (stacked fold weights plus one
+packed isotonic lookup table, see linear_runtime.CompiledCalibratedSVC);
+--svm-folds writes the plain per-fold layout instead.
+
+Usage:
+    python export_linear.py [--out artifacts/linear] [--check] [--svm-folds]
+"""
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+
+from linear_runtime import LINEAR_DIR, compile_calibrated_svc, load_linear_model
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Exported name -> pickle written by the notebook
+PICKLES = {
+    "svm": "svm_model.pkl",
+    "nb": "mnb_model.pkl",
+    "lr": "log_reg_model.pkl"
+}
+
+VECTORIZER_PICKLE = "vectorizer.pkl"
+
+
+def _save(model_dir, meta, arrays):
+    os.makedirs(model_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(model_dir, name + ".npy"), np.ascontiguousarray(array))
+    with open(os.path.join(model_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+# Weights of a linear model must hold one row per class for the softmax
+def _check_class_rows(model, weights, bias):
+    n_classes = len(model.classes_)
+    if n_classes < 2 or weights.shape[0] != n_classes or bias.shape != (n_classes,):
+        raise ValueError(f"Expected one row of weights per class ({n_classes}), got {weights.shape[0]}")
+
+
+# LogisticRegression: multinomial softmax over coef_ / intercept_. Binary
+# models (a single row of coef_) and one-vs-rest models have different
+# probabilities and are refused.
+def export_logistic_regression(model, model_dir):
+    multi_class = model.get_params().get("multi_class", "auto")
+    if multi_class == "deprecated":
+        multi_class = "auto"
+    if (len(model.classes_) < 3 or multi_class not in ("auto", "multinomial")
+            or model.get_params()["solver"] == "liblinear"):
+        raise ValueError("Only multinomial logistic regression with more than two classes is supported")
+    _check_class_rows(model, model.coef_, model.intercept_)
+    _save(model_dir, {"kind": "softmax", "classes": model.classes_.tolist()}, {
+        "weights": model.coef_.T,
+        "bias": model.intercept_
+    })
+
+
+# MultinomialNB: joint log likelihood = X @ feature_log_prob_.T + class_log_prior_
+def export_multinomial_nb(model, model_dir):
+    _check_class_rows(model, model.feature_log_prob_, model.class_log_prior_)
+    _save(model_dir, {"kind": "softmax", "classes": model.classes_.tolist()}, {
+        "weights": model.feature_log_prob_.T,
+        "bias": model.class_log_prior_
+    })
+
+
+# CalibratedClassifierCV(LinearSVC, method="isotonic"): per-fold OvR weights
+# plus the isotonic thresholds of each per-class calibrator, in the
+# (weights, bias, [(x_thresholds, y_thresholds), ...]) layout of
+# linear_runtime.CalibratedLinearSVC
+def calibrated_svc_folds(model):
+    folds = []
+    for fold in model.calibrated_classifiers_:
+        if list(fold.classes) != list(model.classes_):
+            raise ValueError("Calibrated fold was fitted on a subset of the classes")
+        calibrators = []
+        for calibrator in fold.calibrators:
+            if not calibrator.increasing_ or calibrator.out_of_bounds != "clip":
+                raise ValueError("Only increasing, clipped isotonic calibrators are supported")
+            calibrators.append((calibrator.X_thresholds_, calibrator.y_thresholds_))
+        folds.append((fold.estimator.coef_.T, fold.estimator.intercept_, calibrators))
+    return folds
+
+
+def export_calibrated_svc(model, model_dir):
+    arrays = {}
+    folds = calibrated_svc_folds(model)
+    for i, (weights, bias, calibrators) in enumerate(folds):
+        arrays[f"fold{i}_weights"] = weights
+        arrays[f"fold{i}_bias"] = bias
+        for k, (x_thresholds, y_thresholds) in enumerate(calibrators):
+            arrays[f"fold{i}_x_thresholds{k}"] = x_thresholds
+            arrays[f"fold{i}_y_thresholds{k}"] = y_thresholds
+
+    meta = {
+        "kind": "calibrated_svc",
+        "classes": model.classes_.tolist(),
+        "n_folds": len(folds)
+    }
+    _save(model_dir, meta, arrays)
+
+
+# Same model compiled to one stacked weight matrix and one lookup table
+def export_compiled_svc(model, model_dir):
+    _save(model_dir, {"kind": "compiled_svc", "classes": model.classes_.tolist()},
+          compile_calibrated_svc(calibrated_svc_folds(model)))
+
+
+# TfidfVectorizer: vocabulary as sorted UTF-8 terms + int32 ids, idf_ as is.
+# idf keeps the fitted dtype (float64): a float32 copy would change the
+# transformed values and the predictions built on them.
+def export_tfidf_vectorizer(vectorizer, model_dir):
+    params = vectorizer.get_params()
+    if (params["analyzer"] != "word" or params["tokenizer"] is not None
+            or params["preprocessor"] is not None or params["strip_accents"] is not None
+            or params["binary"] or params["input"] != "content" or not params["use_idf"]):
+        raise ValueError("Only word analyzers with the default tokenizer/preprocessor are supported")
+    stop_words = vectorizer.get_stop_words()
+
+    terms = sorted(vectorizer.vocabulary_)
+    encoded = [term.encode() for term in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+    meta = {
+        "kind": "tfidf",
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+        "lowercase": params["lowercase"],
+        "sublinear_tf": params["sublinear_tf"],
+        "norm": params["norm"],
+        "stop_words": sorted(stop_words or ())
+    }
+    _save(model_dir, meta, {
+        "vocab_bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "vocab_offsets": offsets,
+        "vocab_ids": np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int32),
+        "idf": vectorizer.idf_
+    })
+
+
+EXPORTERS = {
+    "svm": export_compiled_svc,
+    "nb": export_multinomial_nb,
+    "lr": export_logistic_regression
+}
+
+
+# Replace the export of one artifact ("svm", "nb", "lr" or "vectorizer");
+# returns its directory. `source` is the pickle the model was saved to: its
+# size and digest are recorded, so model_store ignores the export once the
+# pickle is replaced.
+def export_artifact(key, model, out=LINEAR_DIR, exporters=EXPORTERS, source=None):
+    from model_store import pickle_fingerprint
+    model_dir = os.path.join(out, key)
+    _clear(model_dir)
+    if key == "vectorizer":
+        export_tfidf_vectorizer(model, model_dir)
+    else:
+        exporters[key](model, model_dir)
+    if source is not None:
+        meta_path = os.path.join(model_dir, "meta.json")
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["source"] = dict(pickle_fingerprint(source), file=os.path.basename(source))
+        with open(meta_path, "w") as f:
+            json.dump(meta, f, indent=2)
+    return model_dir
+
+
+# Compare the exported runtime with the original predict_proba on a few reviews
+def check_export(model, model_dir, vectorizer):
+    reviews = [
+        "The pasta was incredible and the sauce tasted fresh.",
+        "Shipping was slow and the snacks arrived stale.",
+        "It was okay, nothing special but not too bad either.",
+        ""
+    ]
+    X = vectorizer.transform(reviews)
+    expected = model.predict_proba(X)
+    actual = load_linear_model(model_dir).predict_proba(X)
+    return float(np.abs(expected - actual).max())
+
+
+# Compare the exported vectorizer with TfidfVectorizer.transform; returns the
+# number of differing entries (0 when the CSR matrices are identical)
+def check_vectorizer_export(vectorizer, model_dir, reviews):
+    expected = vectorizer.transform(reviews)
+    actual = load_linear_model(model_dir).transform(reviews)
+    if (expected.shape != actual.shape or not np.array_equal(expected.indptr, actual.indptr)
+            or not np.array_equal(expected.indices, actual.indices)):
+        return expected.nnz + actual.nnz
+    return int(np.count_nonzero(expected.data != actual.data))
+
+
+# Remove arrays of a previous export that used another layout
+def _clear(model_dir):
+    if os.path.isdir(model_dir):
+        for name in os.listdir(model_dir):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(model_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=LINEAR_DIR, help="output directory (default: %(default)s)")
+    parser.add_argument("--check", action="store_true",
+                        help="compare against the pickled model's predict_proba after exporting")
+    parser.add_argument("--svm-folds", action="store_true",
+                        help="write the per-fold SVM layout instead of the compiled one")
+    args = parser.parse_args()
+    exporters = dict(EXPORTERS, svm=export_calibrated_svc) if args.svm_folds else EXPORTERS
+
+    vectorizer = joblib.load(os.path.join(BASE_DIR, VECTORIZER_PICKLE))
+    for key, filename in PICKLES.items():
+        model = joblib.load(os.path.join(BASE_DIR, filename))
+        model_dir = export_artifact(key, model, args.out, exporters, os.path.join(BASE_DIR, filename))
+        message = f"{filename} -> {model_dir}"
+        if args.check:
+            message += f" (max |proba diff| = {check_export(model, model_dir, vectorizer):.2e})"
+        print(message)
+
+    model_dir = export_artifact("vectorizer", vectorizer, args.out,
+                                source=os.path.join(BASE_DIR, VECTORIZER_PICKLE))
+    message = f"{VECTORIZER_PICKLE} -> {model_dir}"
+    if args.check:
+        reviews = [
+            "The pasta was incredible and the sauce tasted fresh.",
+            "Shipping was slow and the snacks arrived stale, not good at all!",
+            "It was okay, nothing special but not too bad either. <br />Would not buy again.",
+            "",
+            "Café crème brûlée — très bon"
+        ]
+        message += f" ({check_vectorizer_export(vectorizer, model_dir, reviews)} differing entries)"
+    print(message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""On-disk store for the notebook's cleaned text and TF-IDF matrices.
+
+Cleaning 220k reviews and fitting TfidfVectorizer(ngram_range=(1, 2),
+max_features=10000) runs before every model in the notebook. build_features()
+does it once per distinct input and saves the result under
+artifacts/features/<key>/, where key is a hash of
+
+  * the train/test texts and labels (the balanced sample and its split),
+  * the source of the cleaning function's module (text_clean.py),
+  * the vectorizer parameters (stop words sorted, so set order is irrelevant).
+
+Any change to one of them gives a new key and a fresh entry; an unchanged
+rerun loads the saved one. An entry holds
+
+  * train_x_vector / test_x_vector as raw CSR arrays (<name>.data.npy,
+    .indices.npy, .indptr.npy), opened with np.load(mmap_mode="r"), so a
+    load maps them instead of reading them;
+  * the cleaned texts UTF-8 encoded back to back (<name>.bytes.npy) with
+    int64 offsets, decoded only when asked for;
+  * the labels as int8 codes into meta["classes"];
+  * the fitted vectorizer (vectorizer.pkl) and meta.json with shapes, class
+    counts and the clean/vectorize timings.
+
+Entries are written to a temporary directory and renamed into place, so a
+reader never sees a half-written entry.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from text_clean import clean_texts
+
+FEATURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "features")
+
+# Bump when the entry layout changes; part of every key
+STORE_VERSION = 1
+
+MATRICES = ("train_x_vector", "test_x_vector")
+TEXTS = ("train_cleaned", "test_cleaned")
+LABELS = ("train_y", "test_y")
+
+
+# Vectorizer parameters in a stable, JSON-serializable form
+def vectorizer_params(vectorizer):
+    params = {}
+    for name, value in sorted(vectorizer.get_params().items()):
+        if name == "stop_words" and value is not None and not isinstance(value, str):
+            value = sorted(value)
+        elif name == "dtype":
+            value = np.dtype(value).name
+        elif callable(value):
+            value = f"{value.__module__}.{value.__qualname__}"
+        elif isinstance(value, tuple):
+            value = list(value)
+        params[name] = value
+    return params
+
+
+# Source of the module defining the cleaning function (a change anywhere in
+# text_clean.py may change the cleaned text)
+def clean_fingerprint(clean):
+    module = inspect.getmodule(clean)
+    source = inspect.getsource(module) if module is not None else inspect.getsource(clean)
+    return f"{clean.__module__}.{clean.__qualname__}\n{source}"
+
+
+def _update_values(digest, values):
+    values = values.tolist() if hasattr(values, "tolist") else list(values)
+    try:
+        joined = "\0".join(values)
+    except TypeError:
+        joined = "\0".join(map(str, values))
+    digest.update(f"{len(values)}\n".encode())
+    digest.update(joined.encode("utf-8", "surrogatepass"))
+
+
+# Store key of a train/test split, cleaning function and vectorizer
+def feature_key(train_x, train_y, test_x, test_y, clean, vectorizer):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"store:{STORE_VERSION}\n".encode())
+    for values in (train_x, train_y, test_x, test_y):
+        _update_values(digest, values)
+    digest.update(clean_fingerprint(clean).encode())
+    digest.update(json.dumps(vectorizer_params(vectorizer), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+# One stored entry; matrices and label codes are memory-mapped, the texts
+# and the vectorizer are loaded on first access
+class FeatureSet:
+    def __init__(self, path, mmap_mode="r"):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.key = self.meta["key"]
+        self.classes = np.array(self.meta["classes"])
+        self.train_x_vector = self._matrix("train_x_vector")
+        self.test_x_vector = self._matrix("test_x_vector")
+
+    def _array(self, name):
+        return np.load(os.path.join(self.path, name + ".npy"), mmap_mode=self.mmap_mode)
+
+    def _matrix(self, name):
+        return load_csr(self.path, name, self.meta["shapes"][name], self.mmap_mode)
+
+    @functools.cached_property
+    def train_cleaned(self):
+        return load_texts(self.path, "train_cleaned", self.mmap_mode)
+
+    @functools.cached_property
+    def test_cleaned(self):
+        return load_texts(self.path, "test_cleaned", self.mmap_mode)
+
+    # Label codes (int8 indices into self.classes)
+    @property
+    def train_codes(self):
+        return self._array("train_y")
+
+    @property
+    def test_codes(self):
+        return self._array("test_y")
+
+    @property
+    def train_y(self):
+        return self.classes[self.train_codes]
+
+    @property
+    def test_y(self):
+        return self.classes[self.test_codes]
+
+    @functools.cached_property
+    def vectorizer(self):
+        import joblib
+        return joblib.load(os.path.join(self.path, "vectorizer.pkl"))
+
+
+# Texts UTF-8 encoded back to back (<name>.bytes.npy) with int64 offsets
+# (<name>.offsets.npy)
+def save_texts(path, name, texts):
+    encoded = [text.encode() for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    np.save(os.path.join(path, name + ".bytes.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(os.path.join(path, name + ".offsets.npy"), offsets)
+
+
+def load_texts(path, name, mmap_mode="r"):
+    blob = np.load(os.path.join(path, name + ".bytes.npy"), mmap_mode=mmap_mode).tobytes()
+    offsets = np.load(os.path.join(path, name + ".offsets.npy"), mmap_mode=mmap_mode).tolist()
+    return [blob[start:end].decode() for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+# A sparse matrix as its raw CSR arrays (<name>.data.npy, .indices.npy,
+# .indptr.npy)
+def save_csr(path, name, matrix):
+    matrix = sp.csr_matrix(matrix)
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(path, f"{name}.{part}.npy"), getattr(matrix, part))
+
+
+# CSR matrix over the (mapped) arrays; csr_matrix keeps them as views
+def load_csr(path, name, shape, mmap_mode="r"):
+    arrays = [np.load(os.path.join(path, f"{name}.{part}.npy"), mmap_mode=mmap_mode)
+              for part in ("data", "indices", "indptr")]
+    return sp.csr_matrix(tuple(arrays), shape=tuple(shape), copy=False)
+
+
+# Write one entry into store_dir/key (via a temporary directory renamed
+# into place); returns the entry path
+def save_features(store_dir, key, train_cleaned, test_cleaned, train_y, test_y,
+                  train_x_vector, test_x_vector, vectorizer, meta):
+    import joblib
+
+    path = os.path.join(store_dir, key)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    try:
+        classes, counts = np.unique(np.concatenate([np.asarray(train_y), np.asarray(test_y)]),
+                                    return_counts=True)
+        for name, labels in zip(LABELS, (train_y, test_y)):
+            np.save(os.path.join(tmp_path, name + ".npy"),
+                    np.searchsorted(classes, np.asarray(labels)).astype(np.int8))
+        for name, matrix in zip(MATRICES, (train_x_vector, test_x_vector)):
+            save_csr(tmp_path, name, matrix)
+        for name, texts in zip(TEXTS, (train_cleaned, test_cleaned)):
+            save_texts(tmp_path, name, texts)
+        joblib.dump(vectorizer, os.path.join(tmp_path, "vectorizer.pkl"))
+
+        meta = dict(meta, key=key, store_version=STORE_VERSION, created=time.time(),
+                    classes=[str(c) for c in classes],
+                    class_counts={str(c): int(n) for c, n in zip(classes, counts)},
+                    shapes={name: list(m.shape) for name, m in zip(MATRICES, (train_x_vector, test_x_vector))},
+                    nnz={name: int(m.nnz) for name, m in zip(MATRICES, (train_x_vector, test_x_vector))},
+                    n_features=int(train_x_vector.shape[1]))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another process stored the same key first; its entry is identical
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return path
+
+
+# Cleaned text and TF-IDF matrices for a train/test split: loaded from the
+# store when this split, cleaning function and vectorizer configuration were
+# seen before, otherwise computed (vectorizer fitted on the cleaned train
+# text, as in the notebook) and stored. The fitted vectorizer is
+# FeatureSet.vectorizer.
+def build_features(train_x, train_y, test_x, test_y, vectorizer, clean=clean_texts,
+                   store_dir=FEATURE_DIR, mmap_mode="r"):
+    key = feature_key(train_x, train_y, test_x, test_y, clean, vectorizer)
+    path = os.path.join(store_dir, key)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return FeatureSet(path, mmap_mode)
+
+    start = time.perf_counter()
+    train_cleaned = list(clean(train_x))
+    test_cleaned = list(clean(test_x))
+    clean_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    train_x_vector = vectorizer.fit_transform(train_cleaned)
+    test_x_vector = vectorizer.transform(test_cleaned)
+    vectorize_seconds = time.perf_counter() - start
+
+    os.makedirs(store_dir, exist_ok=True)
+    save_features(store_dir, key, train_cleaned, test_cleaned, train_y, test_y,
+                  train_x_vector, test_x_vector, vectorizer, {
+                      "clean": f"{clean.__module__}.{clean.__qualname__}",
+                      "vectorizer": type(vectorizer).__name__,
+                      "vectorizer_params": vectorizer_params(vectorizer),
+                      "seconds": {"clean": clean_seconds, "vectorize": vectorize_seconds}
+                  })
+    return FeatureSet(path, mmap_mode)
+
+
+# Entry for a known key, or None
+def load_features(key, store_dir=FEATURE_DIR, mmap_mode="r"):
+    path = os.path.join(store_dir, key)
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return None
+    return FeatureSet(path, mmap_mode)
+
+
+# Most recently built entry (what the last notebook run trained on), or None
+def latest_features(store_dir=FEATURE_DIR, mmap_mode="r"):
+    if not os.path.isdir(store_dir):
+        return None
+    entries = []
+    for name in os.listdir(store_dir):
+        meta_path = os.path.join(store_dir, name, "meta.json")
+        if ".tmp-" not in name and os.path.exists(meta_path):
+            entries.append((os.path.getmtime(meta_path), name))
+    if not entries:
+        return None
+    return FeatureSet(os.path.join(store_dir, max(entries)[1]), mmap_mode)
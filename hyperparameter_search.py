@@ -0,0 +1,454 @@
+"""Successive-halving search over the TF-IDF and model settings.
+
+The notebook's vectorizer settings (max_features=10000, ngram_range=(1, 2),
+min_df=5, max_df=0.7) and model settings (LogisticRegression max_iter=200,
+...) were picked by hand. This searches SEARCH_SPACE (or a JSON file of the
+same layout) on a validation split of the training reviews, never the test
+split:
+
+  * The cleaned text is the training pipeline's cached clean stage
+    (training_pipeline.py), and the reviews are tokenized once, by the
+    cached "tokenize" stage: n-gram counts over the widest ngram_range of
+    the space, every term kept by the smallest min_df. Every vectorizer
+    setting is a column selection of those counts (document frequency,
+    max_df / min_df and max_features computed like TfidfVectorizer on the
+    rows used, so the features are the ones TfidfVectorizer would produce)
+    followed by the TF-IDF weighting - no re-tokenization per candidate.
+  * Candidates are evaluated in a process pool whose workers memory-map the
+    counts; one task per vectorizer setting fits every model setting on
+    the same TF-IDF matrix.
+  * Successive halving on data size: every candidate is fitted on the
+    smallest rung of training rows, and only the best 1/--factor (by Pareto
+    rank, then accuracy - the whole front is always kept) move on to the
+    next rung, up to the full search split.
+
+Each evaluation records the validation accuracy, macro F1 and log loss
+(evaluation.py) and the inference throughput: reviews per second of
+vectorizer.transform + predict_proba on cleaned validation reviews, with
+a TfidfVectorizer holding the selected vocabulary and idf. The workers
+measure it while the others fit, so when ranking, throughputs within
+THROUGHPUT_TOLERANCE of each other are ties and only accuracy separates
+them. Evaluations are cached per tokenization under artifacts/search/, so
+a rerun or a wider space only evaluates new candidates (cached throughputs
+are the ones measured then). The accuracy / throughput Pareto front of the
+last rung is printed with the training_pipeline.py --set flags of each
+setting.
+
+    python hyperparameter_search.py [--data Reviews.parquet] [--config config.json] [--set ...]
+        [--space space.json] [--models lr nb] [--min-rows 5000] [--factor 3] [--workers 4]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from evaluation import evaluate_model
+from feature_store import load_csr, load_texts
+from model_store import BASE_DIR, MODEL_KEYS
+from review_data import SENTIMENTS
+from training_pipeline import (PIPELINE_DIR, Pipeline, Stage, build_stages, load_config, new_estimator,
+                               resolve_stop_words)
+
+SEARCH_DIR = os.path.join(BASE_DIR, "artifacts", "search")
+
+# Values tried per setting; settings not listed keep the configuration's value
+SEARCH_SPACE = {
+    "vectorizer": {
+        "ngram_range": [[1, 1], [1, 2]],
+        "max_features": [5000, 10000, 20000],
+        "min_df": [2, 5],
+        "max_df": [0.7, 0.9]
+    },
+    "models": {
+        "svm": {"C": [0.5, 1.0]},
+        "nb": {"alpha": [0.1, 0.5, 1.0]},
+        "lr": {"C": [0.5, 1.0, 2.0]}
+    }
+}
+
+# Share of the training split held out for validation
+VALIDATION_SIZE = 0.2
+
+# Cleaned validation reviews the inference throughput is measured on
+THROUGHPUT_ROWS = 2000
+
+# Throughputs within this relative difference count as equal when ranking:
+# they are measured while the other workers compete for the CPU
+THROUGHPUT_TOLERANCE = 0.25
+
+_worker_data = {}
+
+
+# ---- Tokenization
+
+# Settings of the tokenize stage: the widest ngram_range and the smallest
+# min_df of the space, so every vectorizer setting is a subset of its terms
+def tokenize_config(config, space):
+    vectorizer = dict(config["vectorizer"])
+    ngram_ranges = space["vectorizer"].get("ngram_range", [vectorizer["ngram_range"]])
+    min_dfs = space["vectorizer"].get("min_df", [vectorizer["min_df"]])
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in min_dfs):
+        raise ValueError("min_df values of the search must be document counts (integers)")
+    return {
+        "stop_words": resolve_stop_words(vectorizer["stop_words"]),
+        "ngram_range": [min(lo for lo, _ in ngram_ranges), max(hi for _, hi in ngram_ranges)],
+        "min_df": min(min_dfs),
+        "validation_size": VALIDATION_SIZE,
+        "random_state": config["split"]["random_state"],
+        "throughput_rows": THROUGHPUT_ROWS
+    }
+
+
+# Term counts of the training split, split again into search-train and
+# validation rows (the training rows in their shuffled split order, so
+# every prefix is a random subset)
+def tokenize_stage(config, clean, split):
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.model_selection import train_test_split
+
+    codes = np.asarray(split["train_y"])
+    train, val = train_test_split(np.arange(len(codes)), test_size=config["validation_size"],
+                                  random_state=config["random_state"], stratify=codes)
+    texts = clean["train"]
+    counter = CountVectorizer(stop_words=config["stop_words"], ngram_range=tuple(config["ngram_range"]),
+                              min_df=config["min_df"], dtype=np.int32)
+    counts = counter.fit_transform([texts[i] for i in train])
+    val_texts = [texts[i] for i in val]
+    terms = counter.get_feature_names_out().astype(str)
+    return {
+        "terms": terms.tolist(),
+        "ngrams": (np.char.count(terms, " ") + 1).astype(np.int8),
+        "train": counts,
+        "val": counter.transform(val_texts),
+        "train_y": codes[train].astype(np.int8),
+        "val_y": codes[val].astype(np.int8),
+        "throughput": val_texts[:config["throughput_rows"]]
+    }
+
+
+# Column indices of the terms TfidfVectorizer(**params) keeps when fitted
+# on the first `rows` search-train reviews (same filters and max_features
+# tie order as its _limit_features)
+def select_terms(counts, ngrams, params, rows):
+    X = counts[:rows]
+    lo, hi = params["ngram_range"]
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    max_df, min_df = params["max_df"], params["min_df"]
+    max_count = max_df if isinstance(max_df, int) and not isinstance(max_df, bool) else max_df * rows
+    mask = (ngrams >= lo) & (ngrams <= hi) & (df >= min_df) & (df <= max_count)
+    limit = params.get("max_features")
+    if limit is not None and mask.sum() > limit:
+        tfs = np.asarray(X.sum(axis=0)).ravel()
+        keep = np.zeros_like(mask)
+        keep[np.flatnonzero(mask)[(-tfs[mask]).argsort()[:limit]]] = True
+        mask = keep
+    return np.flatnonzero(mask)
+
+
+# TF-IDF matrices of the first `rows` search-train reviews and of the
+# validation reviews, and the equivalent fitted TfidfVectorizer
+def tfidf_features(params, rows, counts, val_counts, terms, ngrams, stop_words):
+    from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+    columns = select_terms(counts, ngrams, params, rows)
+    if not len(columns):
+        raise ValueError(f"No terms left with {params} on {rows:,} reviews")
+    train = counts[:rows][:, columns]
+    weighting = TfidfTransformer(sublinear_tf=params.get("sublinear_tf", False)).fit(train)
+    vectorizer = TfidfVectorizer(stop_words=stop_words, ngram_range=tuple(params["ngram_range"]),
+                                 sublinear_tf=params.get("sublinear_tf", False),
+                                 vocabulary=[terms[i] for i in columns])
+    vectorizer.idf_ = weighting.idf_
+    return weighting.transform(train), weighting.transform(val_counts[:, columns]), vectorizer
+
+
+# ---- Workers
+
+# Map the tokenize stage's counts once per worker
+def _init_worker(path, outputs, stop_words):
+    _worker_data["train"] = load_csr(path, "train", outputs["train"]["shape"], mmap_mode="r")
+    _worker_data["val"] = load_csr(path, "val", outputs["val"]["shape"], mmap_mode="r")
+    _worker_data["terms"] = load_texts(path, "terms")
+    _worker_data["throughput"] = load_texts(path, "throughput")
+    _worker_data["stop_words"] = stop_words
+    labels = np.array(SENTIMENTS, dtype=object)
+    for name in ("ngrams", "train_y", "val_y"):
+        _worker_data[name] = np.load(os.path.join(path, name + ".npy"))
+    _worker_data["train_labels"] = labels[_worker_data["train_y"]]
+    _worker_data["val_labels"] = labels[_worker_data["val_y"]]
+
+
+# Reviews per second of vectorize + predict_proba (best of `repeat`)
+def _throughput(vectorizer, model, texts, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict_proba(vectorizer.transform(texts))
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+# Fit and evaluate every (kind, params, base) model of `models` on one
+# vectorizer setting and the first `rows` search-train reviews
+def _evaluate_in_worker(vectorizer_params, rows, models):
+    data = _worker_data
+    start = time.perf_counter()
+    X_train, X_val, vectorizer = tfidf_features(vectorizer_params, rows, data["train"], data["val"],
+                                                data["terms"], data["ngrams"], data["stop_words"])
+    vectorize_seconds = time.perf_counter() - start
+    results = []
+    for kind, params, base in models:
+        start = time.perf_counter()
+        model = new_estimator(kind, dict(base, **params)).fit(X_train, data["train_labels"][:rows])
+        fit_seconds = time.perf_counter() - start
+        metrics = evaluate_model(model, X_val, data["val_labels"])["metrics"]
+        results.append({
+            "accuracy": metrics["accuracy"],
+            "macro_f1": metrics["report"]["macro avg"]["f1-score"],
+            "log_loss": metrics["log_loss"],
+            "rows_per_second": _throughput(vectorizer, model, data["throughput"]),
+            "n_features": int(X_train.shape[1]),
+            "vectorize_seconds": vectorize_seconds,
+            "fit_seconds": fit_seconds
+        })
+    return results
+
+
+# ---- Search
+
+# Every combination of the space: (vectorizer params, model kind, model params)
+def candidates(space, config, kinds=None):
+    def grid(values):
+        names = sorted(values)
+        return [dict(zip(names, combination)) for combination in itertools.product(*(values[n] for n in names))]
+
+    base = {name: value for name, value in config["vectorizer"].items() if name != "stop_words"}
+    vectorizers = [dict(base, **params) for params in grid(space["vectorizer"])]
+    kinds = kinds or list(space["models"])
+    unknown = set(kinds) - set(MODEL_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown model {', '.join(sorted(unknown))}; expected {', '.join(MODEL_KEYS)}")
+    return [(vectorizer, kind, params) for vectorizer in vectorizers
+            for kind in kinds for params in grid(space["models"].get(kind, {}))]
+
+
+# Training rows of each rung: max_rows divided by factor until min_rows
+def halving_schedule(max_rows, min_rows, factor):
+    if factor < 2:
+        raise ValueError("The halving factor must be at least 2")
+    rungs = 1 + max(0, int(math.log(max_rows / min_rows, factor) + 1e-9)) if max_rows > min_rows else 1
+    return [max_rows // factor ** i for i in reversed(range(rungs))]
+
+
+# Whether result a is at least as good as b on accuracy and throughput and
+# better on one; throughputs within THROUGHPUT_TOLERANCE are equal
+def _dominates(a, b):
+    faster = a["rows_per_second"] > b["rows_per_second"] * (1 + THROUGHPUT_TOLERANCE)
+    slower = b["rows_per_second"] > a["rows_per_second"] * (1 + THROUGHPUT_TOLERANCE)
+    return (a["accuracy"] >= b["accuracy"] and not slower
+            and (a["accuracy"] > b["accuracy"] or faster))
+
+
+# Pareto rank of every result on (accuracy, throughput): 0 for the front,
+# 1 for the front of the rest, ...
+def pareto_ranks(results):
+    ranks = [None] * len(results)
+    remaining = set(range(len(results)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining if not any(_dominates(results[j], results[i]) for j in remaining)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+# Indices promoted to the next rung: the best 1/factor by Pareto rank, then
+# accuracy, and at least the whole front
+def promote(results, factor):
+    ranks = pareto_ranks(results)
+    order = sorted(range(len(results)), key=lambda i: (ranks[i], -results[i]["accuracy"]))
+    keep = max(math.ceil(len(results) / factor), ranks.count(0))
+    return sorted(order[:keep])
+
+
+def _evaluation_key(candidate, rows):
+    vectorizer, kind, params = candidate
+    text = json.dumps({"vectorizer": vectorizer, "model": kind, "params": params, "rows": rows}, sort_keys=True)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _print_progress(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+# Cached evaluations of one tokenization, appended to as candidates finish
+class EvaluationCache:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries[entry["key"]] = entry
+
+    def get(self, candidate, rows):
+        return self.entries.get(_evaluation_key(candidate, rows))
+
+    def add(self, candidate, rows, result):
+        vectorizer, kind, params = candidate
+        entry = dict(result, key=_evaluation_key(candidate, rows), vectorizer=vectorizer, model=kind,
+                     params=params, rows=rows)
+        self.entries[entry["key"]] = entry
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+# Successive halving of `candidates` over the stored tokenization `tokens`
+# (a tokenize stage result); base_models are the configuration's model
+# parameters the candidates' are merged into. Returns one
+# {"rows", "results", "seconds", "evaluated"} dict per rung.
+def successive_halving(tokens, candidates, base_models, stop_words, cache, min_rows, factor,
+                       workers=None, progress=_print_progress):
+    max_rows = tokens.meta["outputs"]["train"]["shape"][0]
+    schedule = halving_schedule(max_rows, min(min_rows, max_rows), factor)
+    base_models = {kind: {name: value for name, value in params.items() if name != "memory_mb"}
+                   for kind, params in base_models.items()}
+    rungs = []
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker,
+                             initargs=(tokens.path, tokens.meta["outputs"], stop_words)) as pool:
+        for number, rows in enumerate(schedule, 1):
+            start = time.perf_counter()
+            results = [cache.get(candidate, rows) for candidate in candidates]
+            tasks = {}
+            for i, candidate in enumerate(candidates):
+                if results[i] is None:
+                    tasks.setdefault(json.dumps(candidate[0], sort_keys=True), []).append(i)
+            futures = {pool.submit(_evaluate_in_worker, candidates[indices[0]][0], rows,
+                                   [(candidates[i][1], candidates[i][2], base_models.get(candidates[i][1], {}))
+                                    for i in indices]): indices
+                       for indices in tasks.values()}
+            for future in as_completed(futures):
+                for i, result in zip(futures[future], future.result()):
+                    results[i] = cache.add(candidates[i], rows, result)
+            evaluated = sum(len(indices) for indices in tasks.values())
+            rungs.append({"rows": rows, "results": results, "seconds": time.perf_counter() - start,
+                          "evaluated": evaluated})
+            message = (f"rung {number}/{len(schedule)}: {len(candidates)} candidates on {rows:,} reviews, "
+                       f"{evaluated} evaluated in {rungs[-1]['seconds']:.1f}s, {len(candidates) - evaluated} cached")
+            if number < len(schedule):
+                kept = promote(results, factor)
+                candidates = [candidates[i] for i in kept]
+                message += f"; {len(kept)} promoted"
+            if progress is not None:
+                progress(message)
+    return rungs
+
+
+# training_pipeline.py --set flags of a result's settings
+def pipeline_overrides(result):
+    def value(v):
+        return json.dumps(v, separators=(",", ":"))
+
+    flags = [f"--set vectorizer.{name}={value(v)}" for name, v in sorted(result["vectorizer"].items())]
+    flags += [f"--set models.{result['model']}.{name}={value(v)}" for name, v in sorted(result["params"].items())]
+    return " ".join(flags)
+
+
+def _describe(result):
+    vectorizer = result["vectorizer"]
+    settings = ", ".join(f"{name}={value}" for name, value in sorted(result["params"].items()))
+    return (f"{result['model']}({settings}) ngram={tuple(vectorizer['ngram_range'])} "
+            f"max_features={vectorizer['max_features']} min_df={vectorizer['min_df']} max_df={vectorizer['max_df']}")
+
+
+# Last-rung results sorted by accuracy, front marked with *
+def format_results(results):
+    ranks = pareto_ranks(results)
+    lines = [f"  {'accuracy':>8} {'macro F1':>8} {'reviews/s':>10} {'features':>8}  setting"]
+    for i in sorted(range(len(results)), key=lambda i: -results[i]["accuracy"]):
+        result = results[i]
+        lines.append(f"{'*' if ranks[i] == 0 else ' '} {result['accuracy']:>8.4f} {result['macro_f1']:>8.4f} "
+                     f"{result['rows_per_second']:>10,.0f} {result['n_features']:>8,}  {_describe(result)}")
+    return "\n".join(lines)
+
+
+def load_space(path=None):
+    if path is None:
+        return SEARCH_SPACE
+    with open(path) as f:
+        space = json.load(f)
+    return {"vectorizer": space.get("vectorizer", {}), "models": space.get("models", {})}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", help="Reviews.csv or Reviews.parquet (default: Reviews.parquet if present)")
+    parser.add_argument("--config", help="JSON file merged into the pipeline's default configuration")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="override one pipeline setting, e.g. sample.sizes.neutral=20000 (repeatable)")
+    parser.add_argument("--space", help="JSON search space (default: SEARCH_SPACE)")
+    parser.add_argument("--models", nargs="+", choices=MODEL_KEYS, help="models to search (default: all in the space)")
+    parser.add_argument("--min-rows", type=int, default=5000,
+                        help="training reviews of the first rung (default: %(default)s)")
+    parser.add_argument("--factor", type=int, default=3,
+                        help="rows grow and candidates shrink by this factor per rung (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count, %(default)s)")
+    parser.add_argument("--cache-dir", default=PIPELINE_DIR, help="pipeline stage cache (default: %(default)s)")
+    parser.add_argument("--search-dir", default=SEARCH_DIR, help="evaluation cache and results (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config, args.overrides, args.data)
+        space = load_space(args.space)
+        pool = candidates(space, config, args.models)
+        token_config = tokenize_config(config, space)
+        stages = [stage for stage in build_stages(config) if stage.name in ("load", "label", "sample", "split", "clean")]
+        stages.append(Stage("tokenize", tokenize_stage, token_config, {"clean": "clean", "split": "split"}))
+        pipeline = Pipeline(stages, args.cache_dir)
+        tokens = pipeline.result("tokenize")
+        search_dir = os.path.join(args.search_dir, pipeline.keys["tokenize"])
+        cache = EvaluationCache(os.path.join(search_dir, "evaluations.jsonl"))
+        print(f"{len(pool)} candidates; {tokens.meta['outputs']['train']['shape'][0]:,} search-train x "
+              f"{tokens.meta['outputs']['train']['shape'][1]:,} terms, "
+              f"{tokens.meta['outputs']['val']['shape'][0]:,} validation reviews", file=sys.stderr)
+        rungs = successive_halving(tokens, pool, config["models"], token_config["stop_words"], cache,
+                                   args.min_rows, args.factor, args.workers)
+    except (OSError, ValueError) as e:
+        sys.exit(f"hyperparameter_search: {e}")
+
+    final = rungs[-1]["results"]
+    os.makedirs(search_dir, exist_ok=True)
+    front = [final[i] for i, rank in enumerate(pareto_ranks(final)) if rank == 0]
+    with open(os.path.join(search_dir, "results.json"), "w") as f:
+        json.dump({"created": time.time(), "space": space, "schedule": [rung["rows"] for rung in rungs],
+                   "rungs": [{"rows": rung["rows"], "seconds": rung["seconds"], "results": rung["results"]}
+                             for rung in rungs],
+                   "front": front}, f, indent=2)
+
+    print(pipeline.summary())
+    print()
+    print(f"Last rung ({rungs[-1]['rows']:,} reviews), * = accuracy / throughput Pareto front:")
+    print(format_results(final))
+    print()
+    for result in sorted(front, key=lambda result: -result["accuracy"]):
+        print(f"{result['accuracy']:.4f} at {result['rows_per_second']:,.0f} reviews/s:")
+        print(f"  python training_pipeline.py {pipeline_overrides(result)}")
+    print(f"-> {os.path.join(search_dir, 'results.json')}")
+
+
+if __name__ == "__main__":
+    main()
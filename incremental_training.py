@@ -0,0 +1,232 @@
+"""Incremental model updates from newly labeled reviews, without a full retrain.
+
+Retraining means rerunning the whole notebook (including the 5-fold
+calibrated SVM). Two models here learn from mini-batches instead:
+
+  * "nb"  MultinomialNB: partial_fit adds the batch's feature counts, so a
+    model updated with every new review equals a full fit on all of them
+    (for the same vectorizer);
+  * "sgd" SGDClassifier(loss="log_loss"): one SGD epoch over each batch,
+    continuing its learning-rate schedule.
+
+Both use the frozen vectorizer artifact (model_store.load_artifact
+("vectorizer")): vocabulary and idf stay as trained, so words first seen in
+new reviews are ignored until the next full retrain. Every version records
+a fingerprint of the vectorizer's idf and an update against a different
+vectorizer is refused.
+
+Every update writes a new version, artifacts/incremental/<model>/vNNNN/
+(model.pkl + meta.json with the parent version, rows in the update, rows
+seen in total and the wall-clock time); older versions are kept for
+comparison and rollback.
+
+Usage:
+    python incremental_training.py init --model nb     # v1 = the notebook's mnb_model.pkl
+    python incremental_training.py init --model sgd    # v1 fitted on the stored training features
+    python incremental_training.py update --model nb new_reviews.csv [--text-column Text]
+        [--label-column Rating] [--chunk-size 10000] [--encoding utf-8]
+    python incremental_training.py list --model nb
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import DEFAULT_CHUNK_SIZE, detect_format, iter_chunks
+from model_store import BASE_DIR, MODEL_FILES, load_artifact, vectorizer_fingerprint
+from review_data import RATING_CODES, SENTIMENTS, valid_ratings
+from text_clean import clean_texts
+
+INCREMENTAL_DIR = os.path.join(BASE_DIR, "artifacts", "incremental")
+MODEL_KINDS = ("nb", "sgd")
+CLASSES = np.array(SENTIMENTS)
+
+
+def new_model(kind):
+    if kind == "nb":
+        from sklearn.naive_bayes import MultinomialNB
+        return MultinomialNB()
+    if kind == "sgd":
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)
+    raise ValueError(f"Unknown incremental model {kind!r}; expected one of {', '.join(MODEL_KINDS)}")
+
+
+# Sentiment labels of a label column: sentiment strings as they are, star
+# ratings 1-5 mapped like the notebook's map_sentiment. Other ratings
+# (missing, out of range, fractional) get no label, so update_model skips
+# their rows.
+def sentiment_labels(values):
+    if pd.api.types.is_numeric_dtype(values):
+        ratings = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = valid_ratings(ratings)
+        labels = np.full(len(ratings), None, dtype=object)
+        labels[valid] = CLASSES[RATING_CODES[ratings[valid].astype(np.int64)]]
+        return labels
+    return np.asarray(values, dtype=object)
+
+
+# One partial_fit on a batch of raw reviews; returns the rows used. Rows
+# without a known label are skipped.
+def update_model(model, texts, labels, vectorizer):
+    texts = np.asarray(texts, dtype=object)
+    labels = np.asarray(labels, dtype=object)
+    known = np.isin(labels, CLASSES)
+    if not known.any():
+        return 0
+    X = vectorizer.transform(clean_texts(texts[known]))
+    model.partial_fit(X, labels[known].astype(str), classes=CLASSES)
+    return int(known.sum())
+
+
+def _model_dir(kind, store_dir):
+    return os.path.join(store_dir, kind)
+
+
+# Stored version numbers of a model, oldest first
+def list_versions(kind, store_dir=INCREMENTAL_DIR):
+    model_dir = _model_dir(kind, store_dir)
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(int(name[1:]) for name in os.listdir(model_dir)
+                  if name.startswith("v") and name[1:].isdigit()
+                  and os.path.exists(os.path.join(model_dir, name, "meta.json")))
+
+
+# (model, meta) of a stored version (default: the latest)
+def load_version(kind, version=None, store_dir=INCREMENTAL_DIR):
+    import joblib
+    versions = list_versions(kind, store_dir)
+    if not versions:
+        raise FileNotFoundError(f"No {kind} versions in {_model_dir(kind, store_dir)}; run `init` first")
+    version = versions[-1] if version is None else version
+    path = os.path.join(_model_dir(kind, store_dir), f"v{version:04d}")
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    return joblib.load(os.path.join(path, "model.pkl")), meta
+
+
+# Write the next version of a model (temporary directory renamed into
+# place, retried if another process took the number); returns its meta
+def save_version(kind, model, meta, store_dir=INCREMENTAL_DIR):
+    import joblib
+    model_dir = _model_dir(kind, store_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    tmp_path = os.path.join(model_dir, f".tmp-{os.getpid()}")
+    os.makedirs(tmp_path, exist_ok=True)
+    try:
+        joblib.dump(model, os.path.join(tmp_path, "model.pkl"))
+        while True:
+            versions = list_versions(kind, store_dir)
+            version = versions[-1] + 1 if versions else 1
+            meta = dict(meta, model=kind, version=version, created=time.time())
+            with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2)
+            try:
+                os.rename(tmp_path, os.path.join(model_dir, f"v{version:04d}"))
+                return meta
+            except OSError:
+                if not os.path.exists(os.path.join(model_dir, f"v{version:04d}")):
+                    raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+# Version 1 of a model: the notebook's MultinomialNB pickle for "nb", a fit
+# on the stored training features (feature_store.py) for "sgd"
+def init_model(kind, store_dir=INCREMENTAL_DIR):
+    vectorizer = load_artifact("vectorizer")
+    start = time.perf_counter()
+    if kind == "nb":
+        import joblib
+        model = joblib.load(os.path.join(BASE_DIR, MODEL_FILES["nb"]))
+        source, rows = MODEL_FILES["nb"], int(model.class_count_.sum())
+    else:
+        from feature_store import latest_features
+        features = latest_features()
+        if features is None:
+            raise FileNotFoundError("No stored training features; run the notebook's TF-IDF cell first")
+        if vectorizer_fingerprint(features.vectorizer) != vectorizer_fingerprint(vectorizer):
+            raise ValueError("The stored training features use a different vectorizer than vectorizer.pkl")
+        model = new_model(kind)
+        model.fit(features.train_x_vector, features.train_y)
+        source, rows = f"features/{features.key}", features.train_x_vector.shape[0]
+    return save_version(kind, model, {
+        "parent": None,
+        "source": source,
+        "rows": rows,
+        "rows_seen": rows,
+        "seconds": time.perf_counter() - start,
+        "vectorizer": vectorizer_fingerprint(vectorizer)
+    }, store_dir)
+
+
+# Update the latest version (or `version`) with labeled review chunks and
+# store the result as a new version; returns its meta
+def update_from_chunks(kind, chunks, text_column, label_column, version=None, store_dir=INCREMENTAL_DIR):
+    model, parent = load_version(kind, version, store_dir)
+    vectorizer = load_artifact("vectorizer")
+    if vectorizer_fingerprint(vectorizer) != parent["vectorizer"]:
+        raise ValueError(f"The vectorizer changed since {kind} v{parent['version']} was trained; "
+                         "retrain fully and run `init` again")
+
+    start = time.perf_counter()
+    rows = 0
+    for chunk in chunks:
+        rows += update_model(model, chunk[text_column].to_numpy(dtype=object),
+                             sentiment_labels(chunk[label_column]), vectorizer)
+    if rows == 0:
+        raise ValueError("No labeled reviews in the input")
+    return save_version(kind, model, {
+        "parent": parent["version"],
+        "rows": rows,
+        "rows_seen": parent["rows_seen"] + rows,
+        "seconds": time.perf_counter() - start,
+        "vectorizer": parent["vectorizer"]
+    }, store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["init", "update", "list"])
+    parser.add_argument("input", nargs="?", help="CSV, JSONL or Parquet file of labeled reviews (update)")
+    parser.add_argument("--model", choices=MODEL_KINDS, default="nb", help="model to update (default: %(default)s)")
+    parser.add_argument("--version", type=int, help="version to update (default: the latest)")
+    parser.add_argument("--text-column", default="Text", help="column holding the review text (default: %(default)s)")
+    parser.add_argument("--label-column", default="Rating",
+                        help="star rating or sentiment label column (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per partial_fit call (default: %(default)s)")
+    parser.add_argument("--encoding", default="utf-8", help="text encoding of CSV/JSONL input")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for version in list_versions(args.model):
+            _, meta = load_version(args.model, version)
+            print(f"v{version:04d}  parent {meta['parent'] or '-':>4}  +{meta['rows']:>9,} rows  "
+                  f"{meta['rows_seen']:>10,} seen  {meta['seconds']:7.2f}s")
+        return
+    if args.command == "update" and not args.input:
+        parser.error("update needs an input file")
+    try:
+        if args.command == "init":
+            meta = init_model(args.model)
+        else:
+            with open(args.input, "rb") as source:
+                chunks = iter_chunks(source, detect_format(args.input), [args.text_column, args.label_column],
+                                     args.chunk_size, args.encoding)
+                meta = update_from_chunks(args.model, chunks, args.text_column, args.label_column, args.version)
+    except (OSError, ValueError) as e:
+        sys.exit(f"incremental_training: {e}")
+    path = os.path.join(_model_dir(args.model, INCREMENTAL_DIR), f"v{meta['version']:04d}")
+    print(f"{args.model} v{meta['version']:04d}: {meta['rows']:,} rows in {meta['seconds']:.2f}s "
+          f"({meta['rows_seen']:,} seen) -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""NumPy-only inference for the exported linear sentiment models.
+
+All three models shipped with the app are linear in the TF-IDF features, so
+serving them only needs a sparse-row x dense-matrix product followed by a
+softmax (Logistic Regression, Multinomial Naive Bayes) or the isotonic
+calibration of CalibratedClassifierCV (Linear SVC). The SVM is normally
+served "compiled": all fold weights stacked into one matrix and all isotonic
+calibrators packed into one lookup table (see CompiledCalibratedSVC).
+
+The arrays are written by export_linear.py into one directory per model
+(meta.json + .npy files) and opened with np.load(mmap_mode="r"), so they are
+shared from the page cache between processes. This module never imports
+scikit-learn and does no input validation per call: X must be the CSR matrix
+produced by the fitted vectorizer (n_samples, n_features).
+"""
+import json
+import os
+
+import numpy as np
+
+from tfidf_runtime import CompactTfidfVectorizer
+
+# Default location of the exported artifacts, next to the pickles
+LINEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "linear")
+
+
+# Numerically stable row-wise softmax (same as sklearn's predict_proba path)
+def softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+# LogisticRegression (multinomial) and MultinomialNB:
+# proba = softmax(X @ weights + bias)
+# weights is stored as (n_features, n_classes) so the sparse product gathers
+# contiguous rows.
+class SoftmaxLinearModel:
+    def __init__(self, classes, weights, bias):
+        self.classes_ = classes
+        self.weights = weights
+        self.bias = bias
+
+    def decision_function(self, X):
+        return X @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        return softmax(self.decision_function(X))
+
+    def predict(self, X):
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+
+# CalibratedClassifierCV(LinearSVC, method="isotonic"): every fold has its own
+# one-vs-rest LinearSVC and one isotonic calibrator per class. Probabilities
+# are the calibrated scores normalised per fold, then averaged over folds.
+class CalibratedLinearSVC:
+    def __init__(self, classes, folds):
+        # folds: list of (weights (n_features, n_classes), bias (n_classes,),
+        #                 [(x_thresholds, y_thresholds) per class])
+        self.classes_ = classes
+        self.folds = folds
+
+    def predict_proba(self, X):
+        n_classes = len(self.classes_)
+        mean_proba = np.zeros((X.shape[0], n_classes))
+        for weights, bias, calibrators in self.folds:
+            decision = X @ weights + bias
+            proba = np.empty_like(decision)
+            for k, (x_thresholds, y_thresholds) in enumerate(calibrators):
+                # np.interp clamps outside the thresholds like out_of_bounds="clip"
+                proba[:, k] = np.interp(decision[:, k], x_thresholds, y_thresholds)
+            denominator = proba.sum(axis=1, keepdims=True)
+            proba = np.divide(proba, denominator,
+                              out=np.full_like(proba, 1 / n_classes),
+                              where=denominator != 0)
+            mean_proba += proba
+        mean_proba /= len(self.folds)
+        return mean_proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# The same model with every fold evaluated at once:
+#   * weights (n_features, n_folds * n_classes) -> one sparse matmul
+#   * every (fold, class) isotonic calibrator c is packed into one sorted
+#     lookup table. Its thresholds are shifted by offsets[c] into their own
+#     disjoint key range, so a single np.searchsorted over the table finds
+#     the segment for all calibrators at once; the interpolation itself uses
+#     the unshifted thresholds so no precision is lost.
+#   * for large batches one np.interp per calibrator over its slice of the
+#     table is faster than the packed search, so that path is used instead.
+class CompiledCalibratedSVC:
+    # Largest batch calibrated with the packed searchsorted lookup
+    PACKED_LOOKUP_MAX_ROWS = 128
+
+    def __init__(self, classes, weights, bias, offsets, x_min, x_max,
+                 keys, x_table, y_table, slopes, seg_lo, seg_hi):
+        self.classes_ = classes
+        self.weights = weights
+        self.bias = bias
+        self.offsets = offsets      # (n_calibrators,) key shift per calibrator
+        self.x_min = x_min          # (n_calibrators,) clip bounds
+        self.x_max = x_max
+        self.keys = keys            # (n_points,) shifted thresholds, sorted
+        self.x_table = x_table      # (n_points,) original thresholds
+        self.y_table = y_table      # (n_points,) calibrated values
+        self.slopes = slopes        # (n_points,) slope of the segment starting at each point
+        self.seg_lo = seg_lo        # (n_calibrators,) first / last segment start
+        self.seg_hi = seg_hi        #   index of each calibrator in the tables
+        n_classes = len(classes)
+        self.n_folds = len(bias) // n_classes
+        # Sums each fold's class scores / averages the folds as small matmuls,
+        # which beat strided reductions over (n, n_folds, n_classes)
+        self._fold_sum = np.kron(np.eye(self.n_folds), np.ones((n_classes, 1)))
+        self._fold_mean = np.kron(np.ones((self.n_folds, 1)), np.eye(n_classes)) / self.n_folds
+
+    def calibrate(self, decision):
+        if decision.shape[0] <= self.PACKED_LOOKUP_MAX_ROWS:
+            np.clip(decision, self.x_min, self.x_max, out=decision)
+            idx = np.searchsorted(self.keys, decision + self.offsets, side="right") - 1
+            np.clip(idx, self.seg_lo, self.seg_hi, out=idx)
+            return self.y_table[idx] + (decision - self.x_table[idx]) * self.slopes[idx]
+
+        proba = np.empty_like(decision)
+        for c, (lo, hi) in enumerate(zip(self.seg_lo, self.seg_hi + 2)):
+            proba[:, c] = np.interp(decision[:, c], self.x_table[lo:hi], self.y_table[lo:hi])
+        return proba
+
+    def predict_proba(self, X):
+        n_classes = len(self.classes_)
+        decision = X @ self.weights + self.bias                # (n, n_folds * n_classes)
+        proba = self.calibrate(decision)
+
+        # Normalise per fold (all-zero folds become uniform), then average
+        denominator = proba @ self._fold_sum                   # (n, n_folds)
+        zero = denominator == 0
+        denominator[zero] = 1.0
+        proba /= np.repeat(denominator, n_classes, axis=1)
+        if zero.any():
+            proba[np.repeat(zero, n_classes, axis=1)] = 1 / n_classes
+        return proba @ self._fold_mean
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# Build the arrays of a CompiledCalibratedSVC from CalibratedLinearSVC folds
+# (calibrators ordered fold-major, matching the stacked weight columns)
+def compile_calibrated_svc(folds):
+    weights = np.hstack([w for w, _, _ in folds])
+    bias = np.concatenate([b for _, b, _ in folds])
+    calibrators = [cal for _, _, fold_calibrators in folds for cal in fold_calibrators]
+
+    x_min = np.array([x[0] for x, _ in calibrators])
+    x_max = np.array([x[-1] for x, _ in calibrators])
+    # Each calibrator gets a key range of width `span`, with a gap of 1
+    span = float((x_max - x_min).max()) + 1.0
+    offsets = np.arange(len(calibrators)) * span - x_min
+
+    x_parts, y_parts, slope_parts, seg_lo, seg_hi = [], [], [], [], []
+    start = 0
+    for x, y in calibrators:
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) == 1:
+            # Constant calibrator: one flat segment
+            x = np.array([x[0], x[0] + 1.0])
+            y = np.array([y[0], y[0]])
+        slopes = np.append(np.diff(y) / np.diff(x), 0.0)
+        x_parts.append(x)
+        y_parts.append(y)
+        slope_parts.append(slopes)
+        seg_lo.append(start)
+        seg_hi.append(start + len(x) - 2)
+        start += len(x)
+
+    x_table = np.concatenate(x_parts)
+    keys = np.concatenate([x + off for x, off in zip(x_parts, offsets)])
+    return {
+        "weights": np.ascontiguousarray(weights),
+        "bias": bias,
+        "offsets": offsets,
+        "x_min": x_min,
+        "x_max": x_max,
+        "keys": keys,
+        "x_table": x_table,
+        "y_table": np.concatenate(y_parts),
+        "slopes": np.concatenate(slope_parts),
+        "seg_lo": np.array(seg_lo, dtype=np.intp),
+        "seg_hi": np.array(seg_hi, dtype=np.intp)
+    }
+
+
+# Array names of a compiled SVM artifact, in constructor order
+COMPILED_SVC_ARRAYS = ["weights", "bias", "offsets", "x_min", "x_max",
+                       "keys", "x_table", "y_table", "slopes", "seg_lo", "seg_hi"]
+
+
+def _load_array(model_dir, name, mmap_mode):
+    return np.load(os.path.join(model_dir, name + ".npy"), mmap_mode=mmap_mode)
+
+
+# Load one exported model directory; kind is recorded in meta.json
+def load_linear_model(model_dir, mmap_mode="r"):
+    with open(os.path.join(model_dir, "meta.json")) as f:
+        meta = json.load(f)
+    classes = np.array(meta.get("classes", []))
+
+    if meta["kind"] == "softmax":
+        return SoftmaxLinearModel(
+            classes,
+            _load_array(model_dir, "weights", mmap_mode),
+            _load_array(model_dir, "bias", mmap_mode)
+        )
+
+    if meta["kind"] == "calibrated_svc":
+        folds = []
+        for i in range(meta["n_folds"]):
+            calibrators = [
+                (_load_array(model_dir, f"fold{i}_x_thresholds{k}", mmap_mode),
+                 _load_array(model_dir, f"fold{i}_y_thresholds{k}", mmap_mode))
+                for k in range(len(classes))
+            ]
+            folds.append((
+                _load_array(model_dir, f"fold{i}_weights", mmap_mode),
+                _load_array(model_dir, f"fold{i}_bias", mmap_mode),
+                calibrators
+            ))
+        return CalibratedLinearSVC(classes, folds)
+
+    if meta["kind"] == "compiled_svc":
+        return CompiledCalibratedSVC(
+            classes, *[_load_array(model_dir, name, mmap_mode) for name in COMPILED_SVC_ARRAYS])
+
+    if meta["kind"] == "tfidf":
+        return CompactTfidfVectorizer(
+            _load_array(model_dir, "vocab_bytes", mmap_mode),
+            _load_array(model_dir, "vocab_offsets", mmap_mode),
+            _load_array(model_dir, "vocab_ids", mmap_mode),
+            _load_array(model_dir, "idf", mmap_mode),
+            meta["stop_words"],
+            token_pattern=meta["token_pattern"],
+            ngram_range=meta["ngram_range"],
+            lowercase=meta["lowercase"],
+            sublinear_tf=meta["sublinear_tf"],
+            norm=meta["norm"]
+        )
+
+    raise ValueError(f"Unknown linear model kind {meta['kind']!r} in {model_dir}")
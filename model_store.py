@@ -0,0 +1,101 @@
+"""Locate, version and load the model artifacts without Streamlit.
+
+Every artifact ("svm", "nb", "lr", "vectorizer") is served from its
+export_linear.py directory under artifacts/linear/ when present and
+exported from the current pickle (NumPy-only runtime, memory-mapped
+arrays), otherwise from the pickle written by the notebook. An export
+records the size and content digest of the pickle it was made from; after
+a retrain that did not re-export, the export is ignored until
+export_linear.py runs again. Shared by the app and the command-line tools.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from linear_runtime import LINEAR_DIR, load_linear_model
+
+# Model artifacts exported by the notebook, shipped next to this module
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILES = {
+    "svm": "svm_model.pkl",
+    "nb": "mnb_model.pkl",
+    "lr": "log_reg_model.pkl",
+    "vectorizer": "vectorizer.pkl"
+}
+
+MODEL_KEYS = ("svm", "nb", "lr")
+
+
+# Content digests of the pickles, per (path, size, mtime): a pickle is only
+# read again when it changed
+_pickle_digests = {}
+
+
+# Size and content digest of a pickle, as recorded by an export made from it
+def pickle_fingerprint(path):
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if cache_key not in _pickle_digests:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _pickle_digests[cache_key] = digest.hexdigest()
+    return {"size": stat.st_size, "blake2b": _pickle_digests[cache_key]}
+
+
+# Identity of a fitted vectorizer's output space (sklearn or compact runtime)
+def vectorizer_fingerprint(vectorizer):
+    idf = np.ascontiguousarray(vectorizer.idf_)
+    return hashlib.blake2b(idf.tobytes() + str(idf.dtype).encode(), digest_size=8).hexdigest()
+
+
+# Whether artifacts/linear/<key> exists and was exported from the current
+# pickle. Exports without a recorded source count as current unless the
+# pickle was written after them.
+def export_is_current(key):
+    meta_path = os.path.join(LINEAR_DIR, key, "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+    pickle_path = os.path.join(BASE_DIR, MODEL_FILES[key])
+    if not os.path.exists(pickle_path):
+        return True
+    with open(meta_path) as f:
+        source = json.load(f).get("source")
+    if source is None:
+        return os.stat(meta_path).st_mtime_ns >= os.stat(pickle_path).st_mtime_ns
+    fingerprint = pickle_fingerprint(pickle_path)
+    return all(source.get(name) == value for name, value in fingerprint.items())
+
+
+# Files an artifact is loaded from: the exported linear model directory
+# when it is current (plus the pickle it came from), otherwise the pickle
+def artifact_paths(key):
+    pickle_path = os.path.join(BASE_DIR, MODEL_FILES[key])
+    if export_is_current(key):
+        linear_dir = os.path.join(LINEAR_DIR, key)
+        paths = [os.path.join(linear_dir, name) for name in sorted(os.listdir(linear_dir))]
+        return paths + ([pickle_path] if os.path.exists(pickle_path) else [])
+    return [pickle_path]
+
+
+# Version of an artifact from the size and mtime of its files, the pickle
+# included. Re-exporting or replacing a pickle changes it.
+def artifact_version(key):
+    digest = hashlib.blake2b(digest_size=8)
+    for path in artifact_paths(key):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+# Load one artifact. mmap_mode="r" maps the numpy arrays (coefficients, idf,
+# calibrators) read-only from the page cache, so several processes share one
+# copy instead of each holding a private heap copy.
+def load_artifact(key, mmap_mode="r"):
+    if export_is_current(key):
+        return load_linear_model(os.path.join(LINEAR_DIR, key), mmap_mode=mmap_mode)
+    import joblib
+    return joblib.load(os.path.join(BASE_DIR, MODEL_FILES[key]), mmap_mode=mmap_mode)
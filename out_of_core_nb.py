@@ -0,0 +1,109 @@
+"""MultinomialNB training and evaluation under a fixed memory budget.
+
+The notebook densifies the TF-IDF matrix for Naive Bayes
+(train_x_vector.toarray(), and test_x_vector.toarray() for every score,
+predict and report): 176k x 10,000 float64 is about 14 GB per copy.
+MultinomialNB needs neither the dense copy nor the whole matrix at once -
+fitting only sums the feature values per class - so here the CSR matrix
+stored by feature_store.save_csr (the feature store and the training
+pipeline's vectorize stage) is streamed in row chunks:
+
+  * iter_csr_chunks() reads each chunk's slice of data / indices straight
+    from the .npy files into fresh arrays (np.fromfile, no memory mapping),
+    so only one chunk is resident at a time;
+  * chunk_rows_for_budget() sizes the chunks from a byte budget, after the
+    fixed costs (indptr, labels, the model's class x feature arrays);
+  * fit_multinomial_nb() passes the chunks through partial_fit, which
+    accumulates the same counts as one fit (equal up to float summation
+    order); predict_proba_chunked() scores chunk by chunk.
+
+training_pipeline.py uses it when models.nb.memory_mb is set:
+    python training_pipeline.py --set models.nb.memory_mb=64
+"""
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+# Copies of a chunk's data + indices alive at once (the chunk and the
+# float64 / index copies scikit-learn's input validation may make)
+CHUNK_COPIES = 2
+
+# Per-row extras: the one-hot label block (classes x float64) and slack
+ROW_OVERHEAD = 64
+
+
+# One .npy file read by element ranges without mapping it
+class _NpyFile:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        version = np.lib.format.read_magic(self._file)
+        read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                       else np.lib.format.read_array_header_2_0)
+        _, _, self.dtype = read_header(self._file)
+        self._offset = self._file.tell()
+
+    def read(self, start, stop):
+        self._file.seek(self._offset + int(start) * self.dtype.itemsize)
+        return np.fromfile(self._file, dtype=self.dtype, count=int(stop - start))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _part_path(path, name, part):
+    return os.path.join(path, f"{name}.{part}.npy")
+
+
+# Rows per chunk so that the chunks, with the fixed costs of a fit, stay
+# within budget_bytes
+def chunk_rows_for_budget(path, name, shape, budget_bytes, n_classes=3):
+    indptr = np.load(_part_path(path, name, "indptr"), mmap_mode="r")
+    with _NpyFile(_part_path(path, name, "data")) as data, _NpyFile(_part_path(path, name, "indices")) as indices:
+        entry_bytes = data.dtype.itemsize + indices.dtype.itemsize
+    rows, features = shape
+    fixed = indptr.nbytes + rows * 8 + 4 * n_classes * features * 8
+    row_bytes = CHUNK_COPIES * entry_bytes * int(indptr[-1]) / max(rows, 1) + ROW_OVERHEAD
+    if budget_bytes <= fixed + row_bytes:
+        raise ValueError(f"A memory budget of {budget_bytes / 2 ** 20:.1f} MB is too small for a "
+                         f"{rows:,} x {features:,} matrix (needs more than {(fixed + row_bytes) / 2 ** 20:.1f} MB)")
+    return max(1, min(rows, int((budget_bytes - fixed) / row_bytes)))
+
+
+# (start, stop, chunk) for consecutive row chunks of the stored CSR matrix
+def iter_csr_chunks(path, name, shape, chunk_rows):
+    indptr = np.load(_part_path(path, name, "indptr"))
+    with _NpyFile(_part_path(path, name, "data")) as data, _NpyFile(_part_path(path, name, "indices")) as indices:
+        for start in range(0, shape[0], chunk_rows):
+            stop = min(start + chunk_rows, shape[0])
+            lo, hi = indptr[start], indptr[stop]
+            chunk = sp.csr_matrix((data.read(lo, hi), indices.read(lo, hi), indptr[start:stop + 1] - lo),
+                                  shape=(stop - start, shape[1]))
+            yield start, stop, chunk
+
+
+# MultinomialNB(**params) fitted on the stored matrix in row chunks that
+# fit budget_bytes; `labels` holds one label per row
+def fit_multinomial_nb(path, name, shape, labels, budget_bytes, **params):
+    from sklearn.naive_bayes import MultinomialNB
+    labels = np.asarray(labels)
+    classes = np.unique(labels)
+    model = MultinomialNB(**params)
+    chunk_rows = chunk_rows_for_budget(path, name, shape, budget_bytes, len(classes))
+    for start, stop, chunk in iter_csr_chunks(path, name, shape, chunk_rows):
+        model.partial_fit(chunk, labels[start:stop], classes=classes)
+    return model
+
+
+# Class probabilities of a fitted model for every row of the stored
+# matrix, chunk by chunk
+def predict_proba_chunked(model, path, name, shape, budget_bytes):
+    chunk_rows = chunk_rows_for_budget(path, name, shape, budget_bytes, len(model.classes_))
+    return np.concatenate([model.predict_proba(chunk)
+                           for _, _, chunk in iter_csr_chunks(path, name, shape, chunk_rows)])
@@ -0,0 +1,140 @@
+"""Fit the notebook's models concurrently in worker processes.
+
+The notebook fits the calibrated SVM, MultinomialNB and LogisticRegression
+one after another (each followed by a cosmetic tqdm loop of time.sleep
+calls), and CalibratedClassifierCV(cv=5) fits its five LinearSVC folds one
+after another too. fit_models() splits the work into independent tasks,
+
+  * one per calibration fold: CalibratedClassifierCV with that single
+    train/calibration split (the same StratifiedKFold splits cv=5 makes);
+    the fitted folds are merged into one model in fold order, which gives
+    the same calibrated_classifiers_ and predict_proba as the serial fit,
+  * one for each other model,
+
+and runs them in a process pool, longest first. The training matrix and
+the label codes are .npy files that every worker maps with mmap_mode="r"
+in its initializer, so the workers share one copy in the page cache and
+only the fitted estimators travel back.
+
+Progress is reported as the tasks finish (model, fold, fit time, solver
+iterations from n_iter_). liblinear and lbfgs have no per-iteration hook
+in scikit-learn, so a fold or model is the finest real unit of progress.
+
+training_pipeline.py uses this for its fit stages with --workers N:
+    python training_pipeline.py --workers 4
+"""
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from feature_store import load_csr
+from review_data import SENTIMENTS
+
+_worker_data = {}
+
+
+# Map the shared training matrix and labels and import the pipeline's
+# fit_model once per worker, outside the timed fits
+def _init_worker(matrix_dir, matrix_name, shape, labels_path):
+    from training_pipeline import fit_model
+    _worker_data["fit_model"] = fit_model
+    _worker_data["X"] = load_csr(matrix_dir, matrix_name, shape, mmap_mode="r")
+    _worker_data["matrix"] = (matrix_dir, matrix_name)
+    _worker_data["y"] = np.array(SENTIMENTS, dtype=object)[np.load(labels_path, mmap_mode="r")]
+
+
+# Fit one task: a whole model, or one calibration fold of the SVM when
+# `fold` is a (train, calibration) index pair
+def _fit_in_worker(kind, params, fold):
+    start = time.perf_counter()
+    model = _worker_data["fit_model"](kind, params if fold is None else dict(params, cv=[fold]),
+                      _worker_data["X"], _worker_data["y"], *_worker_data["matrix"])
+    return model, time.perf_counter() - start
+
+
+# Solver iterations of a fitted model or calibration fold (max over classes)
+def _iterations(model):
+    if hasattr(model, "calibrated_classifiers_"):
+        model = model.calibrated_classifiers_[0].estimator
+    n_iter = getattr(model, "n_iter_", None)
+    return None if n_iter is None else int(np.max(n_iter))
+
+
+def _print_progress(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+# Fit `models` ({kind: params}) on the CSR matrix stored as
+# matrix_dir/<matrix_name>.{data,indices,indptr}.npy with the int8 label
+# codes (into SENTIMENTS) of labels_path. Returns {kind: (model, seconds)},
+# seconds being the wall-clock time from the start of the pool until the
+# model's last task finished (the tasks overlap, so their fit times are not
+# added up).
+def fit_models(models, matrix_dir, matrix_name, shape, labels_path, workers=None, progress=_print_progress):
+    from sklearn.model_selection import check_cv
+
+    workers = workers or os.cpu_count() or 1
+    y = np.array(SENTIMENTS, dtype=object)[np.load(labels_path, mmap_mode="r")]
+    tasks = []
+    for kind, params in models.items():
+        if kind == "svm":
+            splits = check_cv(params.get("cv", 5), y, classifier=True).split(np.zeros(len(y)), y)
+            tasks.extend((kind, params, i, fold) for i, fold in enumerate(splits))
+        else:
+            tasks.append((kind, params, None, None))
+    # Longest first: the SVM folds, then logistic regression, then NB
+    order = {"svm": 0, "lr": 1, "nb": 2}
+    tasks.sort(key=lambda task: order.get(task[0], 1))
+    folds = {kind: sum(1 for task in tasks if task[0] == kind and task[2] is not None) for kind in models}
+
+    start = time.perf_counter()
+    fitted = {kind: [] for kind in models}
+    finished = {}
+    with ProcessPoolExecutor(min(workers, len(tasks)), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker,
+                             initargs=(matrix_dir, matrix_name, tuple(shape), labels_path)) as pool:
+        futures = {pool.submit(_fit_in_worker, kind, params, fold): (kind, i)
+                   for kind, params, i, fold in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            kind, i = futures[future]
+            model, seconds = future.result()
+            fitted[kind].append((i, model, seconds))
+            finished[kind] = time.perf_counter() - start
+            if progress is not None:
+                task = kind if i is None else f"{kind} fold {i + 1}/{folds[kind]}"
+                iterations = _iterations(model)
+                progress(f"[{time.perf_counter() - start:7.1f}s] {done}/{len(tasks)} {task} fitted in {seconds:.1f}s"
+                         + (f" ({iterations} iterations)" if iterations is not None else ""))
+
+    results = {}
+    for kind, parts in fitted.items():
+        parts.sort(key=lambda part: -1 if part[0] is None else part[0])
+        model = parts[0][1]
+        if kind == "svm":
+            model.calibrated_classifiers_ = [c for _, fold, _ in parts for c in fold.calibrated_classifiers_]
+            model.cv = models[kind].get("cv", 5)
+        results[kind] = (model, finished[kind])
+    return results
+
+
+# Run the fit stages of a training_pipeline.Pipeline that are not cached in
+# one fit_models() call and store their results in the pipeline; the
+# summary counts the call's wall-clock time once for all of them
+def fit_pipeline_models(pipeline, workers=None, progress=_print_progress):
+    stages = [stage for name, stage in pipeline.stages.items()
+              if name.startswith("fit_") and not pipeline.is_cached(name)]
+    if not stages:
+        return
+    vectorize, split = pipeline.result("vectorize"), pipeline.result("split")
+    start = time.perf_counter()
+    results = fit_models({stage.kwargs["kind"]: stage.config for stage in stages},
+                         vectorize.path, "train", vectorize.meta["outputs"]["train"]["shape"],
+                         os.path.join(split.path, "train_y.npy"), workers, progress)
+    for stage in stages:
+        model, seconds = results[stage.kwargs["kind"]]
+        pipeline.store(stage.name, {"model": model}, seconds)
+    pipeline.concurrent.append(([stage.name for stage in stages], time.perf_counter() - start))
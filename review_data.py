@@ -0,0 +1,262 @@
+"""Reviews.csv -> Parquet conversion and a column-selective Parquet loader.
+
+The notebook reads the ~300 MB Reviews.csv with read_csv(encoding="latin1",
+low_memory=False): every column is parsed into Python string objects before
+the Rating filter runs. convert_csv_to_parquet() does that work once:
+
+  * the CSV is streamed in chunks (flat memory), "Unnamed" columns are
+    dropped and rows whose Rating is not 1-5 are removed, exactly like the
+    notebook's first cell;
+  * columns get real types: ProductId / UserId categorical (dictionary),
+    Rating int8, Time int64, Id and helpfulness counts integers, text
+    columns strings;
+  * rows are clustered by Rating (input order kept within a rating), so
+    every row group holds a single rating and its min/max statistics let a
+    Rating filter skip whole row groups without decoding them;
+  * a "row" column keeps each review's position in the CSV.
+
+load_reviews() reads only the requested columns, pushes a Rating filter
+down to the row groups and returns the rows in CSV order, indexed by their
+CSV position - the same DataFrame the notebook's read_csv + filter gives for
+those columns.
+
+Usage (one-time conversion):
+    python review_data.py Reviews.csv Reviews.parquet [--encoding latin1]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+RATINGS = (1, 2, 3, 4, 5)
+
+# Sentiment classes in sorted (model.classes_) order
+SENTIMENTS = ("negative", "neutral", "positive")
+
+# Rows per row group of the converted file
+ROW_GROUP_ROWS = 65536
+
+# Column types of the converted file; other columns are stored as strings
+CATEGORICAL_COLUMNS = ("ProductId", "UserId")
+INTEGER_COLUMNS = {
+    "Id": "int64",
+    "Rating": "int8",
+    "Time": "int64",
+    "HelpfulnessNumerator": "int32",
+    "HelpfulnessDenominator": "int32"
+}
+
+
+# One CSV chunk with the notebook's cleanup applied and the column types of
+# the Parquet file (categoricals still plain strings); `start` is the CSV
+# position of the chunk's first row
+def _typed_chunk(chunk, start, rating_column):
+    chunk = chunk.loc[:, ~chunk.columns.str.contains(r'^Unnamed')]
+    if rating_column != "Rating":
+        chunk = chunk.rename(columns={rating_column: "Rating"})
+    chunk = chunk.assign(row=np.arange(start, start + len(chunk), dtype=np.int32))
+    rating = pd.to_numeric(chunk["Rating"], errors="coerce")
+    chunk = chunk[rating.between(1, 5) & (rating % 1 == 0)].copy()
+
+    for column in chunk.columns:
+        if column == "row":
+            continue
+        if column in INTEGER_COLUMNS:
+            chunk[column] = pd.to_numeric(chunk[column], errors="raise").astype(INTEGER_COLUMNS[column])
+    return chunk
+
+
+# Arrow schema of the typed chunks (fixed by the first chunk, so a column
+# that happens to be all-empty in one chunk keeps its string type)
+def _schema(typed):
+    import pyarrow as pa
+    return pa.schema([
+        (column, pa.from_numpy_dtype(typed[column].dtype) if column in INTEGER_COLUMNS or column == "row"
+         else pa.large_string())
+        for column in typed.columns
+    ])
+
+
+# Arrow table of a typed chunk with the categorical columns dictionary encoded
+def _to_arrow(table):
+    import pyarrow as pa
+    for name in CATEGORICAL_COLUMNS:
+        if name in table.column_names:
+            i = table.column_names.index(name)
+            table = table.set_column(i, name, table.column(name).dictionary_encode())
+    return table
+
+
+# Convert Reviews.csv to a rating-clustered Parquet file in two streaming
+# passes (per-rating temporary files, then concatenated in rating order).
+# Returns {"rows": rows written, "dropped": rows without a 1-5 rating}.
+def convert_csv_to_parquet(csv_path, parquet_path, encoding="latin1", chunk_size=100000,
+                           rating_column=None, row_group_rows=ROW_GROUP_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if rating_column is None:
+        header = pd.read_csv(csv_path, nrows=0, encoding=encoding).columns
+        rating_column = "Rating" if "Rating" in header else "Score"
+
+    tmp_dir = tempfile.mkdtemp(prefix="reviews_parquet_", dir=os.path.dirname(os.path.abspath(parquet_path)))
+    writers = {}
+    rows = dropped = 0
+    try:
+        # Pass 1: split the CSV by rating, keeping the input order
+        start = 0
+        schema = None
+        for chunk in pd.read_csv(csv_path, encoding=encoding, chunksize=chunk_size, dtype=str,
+                                 keep_default_na=False, na_values=[""]):
+            typed = _typed_chunk(chunk, start, rating_column)
+            start += len(chunk)
+            dropped += len(chunk) - len(typed)
+            schema = schema or _schema(typed)
+            table = pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+            for rating in RATINGS:
+                part = table.filter(pa.compute.equal(table["Rating"], rating))
+                if part.num_rows:
+                    if rating not in writers:
+                        writers[rating] = pq.ParquetWriter(os.path.join(tmp_dir, f"{rating}.parquet"), schema)
+                    writers[rating].write_table(part)
+        for writer in writers.values():
+            writer.close()
+
+        # Pass 2: concatenate the ratings; row groups never span two ratings
+        out = None
+        try:
+            for rating in RATINGS:
+                if rating not in writers:
+                    continue
+                part = pq.ParquetFile(os.path.join(tmp_dir, f"{rating}.parquet"))
+                for batch in part.iter_batches(batch_size=row_group_rows):
+                    table = _to_arrow(pa.Table.from_batches([batch]))
+                    if out is None:
+                        out = pq.ParquetWriter(parquet_path, table.schema, compression="zstd")
+                    out.write_table(table, row_group_size=row_group_rows)
+                    rows += table.num_rows
+        finally:
+            if out is not None:
+                out.close()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return {"rows": rows, "dropped": dropped}
+
+
+# Read a converted file: only `columns` (default: all), only rows whose
+# Rating is in `ratings` (default: all; whole row groups are skipped),
+# indexed by CSV position like the notebook's read_csv. With
+# csv_order=False the rows stay clustered by Rating, which saves a copy of
+# every column; use it when row order does not matter.
+def load_reviews(path, columns=None, ratings=None, csv_order=True):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if columns is None:
+        columns = [name for name in pq.read_schema(path).names if name != "row"]
+    filters = [("Rating", "in", [int(r) for r in ratings])] if ratings is not None else None
+    rows = pq.read_table(path, columns=["row"], filters=filters)["row"].to_numpy()
+    order = np.argsort(rows, kind="stable") if csv_order else None
+
+    # One column at a time, so the read buffers of a column (and, for CSV
+    # order, its unordered copy) are released before the next one is read
+    arrays = {}
+    for name in columns:
+        column = pq.read_table(path, columns=[name], filters=filters)[name]
+        if csv_order:
+            # take() needs the column in one piece; drop the row-group pieces
+            # before taking
+            column = column.combine_chunks()
+            column = column.take(order)
+        arrays[name] = column
+    table = pa.table(arrays)
+    del arrays
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
+    df.index = pd.Index((rows[order] if csv_order else rows).astype(np.int64))
+    return df
+
+
+# The notebook's map_sentiment for a whole array of ratings: below 3
+# negative, 3 neutral, above positive
+def sentiment_from_ratings(ratings):
+    ratings = np.asarray(ratings)
+    return np.where(ratings < 3, "negative", np.where(ratings == 3, "neutral", "positive")).astype(object)
+
+
+# map_sentiment as a table: int8 code into SENTIMENTS of ratings 0-5 (0 unused)
+RATING_CODES = np.array([-1, 0, 0, 1, 2, 2], dtype=np.int8)
+
+
+# Which ratings are whole numbers from 1 to 5 (the ones sentiment_codes
+# accepts); NaN, 0, 6 and fractional ratings are not
+def valid_ratings(ratings):
+    ratings = np.asarray(ratings)
+    if ratings.dtype.kind in "iu":
+        return (ratings >= 1) & (ratings <= 5)
+    with np.errstate(invalid="ignore"):
+        whole = ratings.astype(np.int64)
+    return (whole == ratings) & (whole >= 1) & (whole <= 5)
+
+
+# The notebook's map_sentiment for ratings 1-5 as int8 codes into
+# SENTIMENTS: one table lookup per rating instead of a Python call
+def sentiment_codes(ratings):
+    ratings = np.asarray(ratings)
+    if ratings.dtype.kind not in "iu":
+        with np.errstate(invalid="ignore"):
+            whole = ratings.astype(np.int64)
+        if (whole != ratings).any():
+            raise ValueError("Ratings must be whole numbers from 1 to 5")
+        ratings = whole
+    if len(ratings) and (ratings.min() < 1 or ratings.max() > 5):
+        raise ValueError("Ratings must be whole numbers from 1 to 5")
+    return RATING_CODES[ratings]
+
+
+# Row positions of the notebook's balanced sample: `sizes` ({sentiment: n},
+# sampled in this order) drawn without replacement from each class of the
+# label codes, then the whole sample shuffled - the same draws as its
+# df_<class>.sample(n=n, random_state=random_state) calls and the final
+# sample(frac=1, random_state=random_state), without any DataFrame copies
+def balanced_sample_rows(codes, sizes, random_state):
+    codes = np.asarray(codes)
+    parts = []
+    for sentiment, size in sizes.items():
+        positions = np.flatnonzero(codes == SENTIMENTS.index(sentiment))
+        if size > len(positions):
+            raise ValueError(f"Cannot sample {size:,} {sentiment} reviews from {len(positions):,}")
+        parts.append(positions[np.random.RandomState(random_state).choice(len(positions), size, replace=False)])
+    rows = np.concatenate(parts)
+    return rows[np.random.RandomState(random_state).choice(len(rows), len(rows), replace=False)]
+
+
+# The notebook's df_review_bal with only the columns it uses: `columns` of
+# the sampled rows, copied once, and their sentiment labels
+def balanced_reviews(df, codes, sizes, random_state, columns=("Text",)):
+    rows = balanced_sample_rows(codes, sizes, random_state)
+    sample = df[list(columns)].iloc[rows].reset_index(drop=True)
+    sample["sentiment"] = np.array(SENTIMENTS, dtype=object)[np.asarray(codes)[rows]]
+    return sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Reviews.csv to a typed, rating-clustered Parquet file")
+    parser.add_argument("csv", help="path to Reviews.csv")
+    parser.add_argument("parquet", help="output path, e.g. Reviews.parquet")
+    parser.add_argument("--encoding", default="latin1", help="CSV encoding (default: %(default)s, as in the notebook)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="CSV rows per chunk (default: %(default)s)")
+    parser.add_argument("--rating-column", help="rating column of the CSV (default: Rating, else Score)")
+    args = parser.parse_args()
+
+    result = convert_csv_to_parquet(args.csv, args.parquet, args.encoding, args.chunk_size, args.rating_column)
+    size = os.path.getsize(args.parquet) / 1024 ** 2
+    print(f"{result['rows']:,} reviews -> {args.parquet} ({size:.1f} MB); "
+          f"{result['dropped']:,} rows without a 1-5 Rating dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Score a file of reviews from the command line, without Streamlit.
+
+Reads a CSV, JSONL or Parquet file in chunks, cleans, vectorizes and scores
+each chunk with one of the exported models and appends label + per-class
+probabilities to the output file (CSV, JSONL or Parquet, from its
+extension). Uses the same clean_text and model artifacts as the app, so it
+can run from cron for nightly scoring jobs.
+
+Usage:
+    python score_reviews.py Reviews.csv scores.csv [--text-column Text]
+        [--model svm] [--chunk-size 10000] [--workers 1] [--keep Id ...]
+        [--encoding utf-8]
+"""
+import argparse
+import sys
+import time
+
+from batch_scoring import DEFAULT_CHUNK_SIZE, ResultWriter, detect_format, iter_chunks, read_columns, score_chunks
+from model_store import MODEL_KEYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV, JSONL or Parquet file of reviews")
+    parser.add_argument("output", help="result file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--text-column", default="Text", help="column holding the review text (default: %(default)s)")
+    parser.add_argument("--model", choices=MODEL_KEYS, default="svm", help="model to score with (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes scoring chunks in parallel (default: %(default)s)")
+    parser.add_argument("--keep", nargs="*", default=None,
+                        help="input columns copied to the output (default: Id when present)")
+    parser.add_argument("--encoding", default="utf-8",
+                        help="text encoding of CSV/JSONL input (the notebook reads Reviews.csv as latin1)")
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.input)
+    detect_format(args.output)
+    with open(args.input, "rb") as source:
+        columns = read_columns(source, fmt, args.encoding)
+        if args.text_column not in columns:
+            parser.error(f"column {args.text_column!r} not found; available: {', '.join(columns)}")
+        keep = args.keep if args.keep is not None else [c for c in ["Id"] if c in columns and c != args.text_column]
+        missing = [c for c in keep if c not in columns]
+        if missing:
+            parser.error(f"column(s) {', '.join(missing)} not found; available: {', '.join(columns)}")
+
+        start = time.perf_counter()
+        chunks = iter_chunks(source, fmt, keep + [args.text_column], args.chunk_size, args.encoding)
+        with ResultWriter(args.output) as writer:
+            for result in score_chunks(chunks, args.text_column, args.model, keep, args.workers):
+                writer.write(result)
+                if not args.quiet:
+                    elapsed = time.perf_counter() - start
+                    print(f"\r{writer.rows:,} rows  {writer.rows / elapsed:,.0f} rows/s",
+                          end="", file=sys.stderr, flush=True)
+
+    seconds = time.perf_counter() - start
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{writer.rows:,} rows scored with {args.model} in {seconds:.1f}s "
+          f"({writer.rows / max(seconds, 1e-9):,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
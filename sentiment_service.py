@@ -0,0 +1,332 @@
+"""Local HTTP JSON scoring service with asyncio micro-batching.
+
+Endpoints
+  POST /predict   {"text": "..."} or {"texts": ["...", ...]}, optional
+                  "model": "svm" | "nb" | "lr" (default svm)
+                  -> {"model": ..., "predictions": [{"label": ..., "probabilities": {class: p}}]}
+  GET  /metrics   queue depth and batch size histograms per model
+  GET  /health    {"status": "ok"}
+
+Concurrent requests for the same model are queued and collected into one
+micro-batch until it holds max_batch_size texts or max_wait_ms has passed
+since its first request. Each batch is cleaned, vectorized and scored with
+one transform() / predict_proba() call in a worker thread, and the rows are
+handed back to the waiting requests. While a batch is being scored the next
+one fills up, so batches grow with load.
+
+Plain asyncio streams, no web framework: the service speaks enough
+HTTP/1.1 (Content-Length bodies, keep-alive) for JSON clients.
+
+Usage:
+    python sentiment_service.py [--host 127.0.0.1] [--port 8000]
+        [--max-batch-size 64] [--max-wait-ms 2]
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_scoring import score_texts
+from model_store import MODEL_KEYS, load_artifact
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+# Counts per power-of-two bucket: 0, 1, 2, 3-4, 5-8, 9-16, ...
+class Histogram:
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        bucket = 0 if value <= 0 else 1 << (value - 1).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": {f"<={bucket}": n for bucket, n in sorted(self.buckets.items())}
+        }
+
+
+# Model and vectorizer artifacts of a model key (run in the executor: reading
+# them would block the event loop)
+def load_artifacts(model_key):
+    return load_artifact(model_key), load_artifact("vectorizer")
+
+
+# Collects the requests for one model into micro-batches and scores each
+# batch with a single vectorize + predict_proba in the executor
+class MicroBatcher:
+    def __init__(self, model_key, model, vectorizer, executor, max_batch_size=64, max_wait_ms=2.0):
+        self.model_key = model_key
+        self.model = model
+        self.vectorizer = vectorizer
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.queue_depth = Histogram()     # requests already waiting when one arrives
+        self.batch_size = Histogram()      # texts per scored batch
+        self.batch_requests = Histogram()  # requests per scored batch
+        self.batch_seconds = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    # Score texts as part of the next micro-batch; returns (label_idx, probs)
+    async def predict(self, texts):
+        self.queue_depth.add(self.queue.qsize())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 and self.queue.empty():
+                break
+            try:
+                item = self.queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            self.batch_size.add(len(texts))
+            self.batch_requests.add(len(batch))
+            start = time.perf_counter()
+            try:
+                label_idx, probs = await loop.run_in_executor(
+                    self.executor, score_texts, texts, self.model, self.vectorizer)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch_seconds += time.perf_counter() - start
+            offset = 0
+            for request_texts, future in batch:
+                end = offset + len(request_texts)
+                if not future.done():
+                    future.set_result((label_idx[offset:end], probs[offset:end]))
+                offset = end
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_depth_on_arrival": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "batch_requests": self.batch_requests.snapshot(),
+            "scoring_seconds": round(self.batch_seconds, 3)
+        }
+
+    def close(self):
+        self._task.cancel()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SentimentService:
+    def __init__(self, max_batch_size=64, max_wait_ms=2.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        # One scoring thread: batches run one at a time, the event loop only
+        # parses requests and fans out results
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batchers = {}
+        self._loading = {}  # model key -> future of load_artifacts, while it runs
+        self.started = time.time()
+        self.requests = 0
+
+    # Batcher of a model, created on first use once its artifacts are loaded
+    # in the executor; concurrent first requests wait for the same load
+    async def batcher(self, model_key):
+        if model_key not in self.batchers:
+            if model_key not in self._loading:
+                self._loading[model_key] = asyncio.get_running_loop().run_in_executor(
+                    self.executor, load_artifacts, model_key)
+            try:
+                model, vectorizer = await self._loading[model_key]
+            finally:
+                self._loading.pop(model_key, None)
+            if model_key not in self.batchers:
+                self.batchers[model_key] = MicroBatcher(model_key, model, vectorizer, self.executor,
+                                                        self.max_batch_size, self.max_wait_ms)
+        return self.batchers[model_key]
+
+    async def predict(self, payload):
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        model_key = payload.get("model", "svm")
+        if model_key not in MODEL_KEYS:
+            raise HTTPError(400, f"Unknown model {model_key!r}; expected one of {', '.join(MODEL_KEYS)}")
+        if "texts" in payload:
+            texts = payload["texts"]
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise HTTPError(400, '"texts" must be a list of strings')
+        elif isinstance(payload.get("text"), str):
+            texts = [payload["text"]]
+        else:
+            raise HTTPError(400, 'Expected "text" (string) or "texts" (list of strings)')
+        if not texts:
+            return {"model": model_key, "predictions": []}
+
+        batcher = await self.batcher(model_key)
+        label_idx, probs = await batcher.predict(texts)
+        classes = batcher.model.classes_
+        return {
+            "model": model_key,
+            "predictions": [
+                {"label": str(classes[idx]),
+                 "probabilities": {str(name): float(p) for name, p in zip(classes, row)}}
+                for idx, row in zip(label_idx, probs)
+            ]
+        }
+
+    def metrics(self):
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "models": {key: batcher.metrics() for key, batcher in self.batchers.items()}
+        }
+
+    async def route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/predict":
+            if method != "POST":
+                raise HTTPError(405, "Use POST /predict")
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                raise HTTPError(400, "Body is not valid JSON")
+            self.requests += 1
+            return await self.predict(payload)
+        if path == "/metrics" and method == "GET":
+            return self.metrics()
+        if path == "/health" and method == "GET":
+            return {"status": "ok"}
+        raise HTTPError(404, f"No route for {method} {path}")
+
+    # One keep-alive connection: read requests until the client closes
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, 400, {"error": "Malformed Content-Length header"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, result = 200, await self.route(method.upper(), path, body)
+                except HTTPError as e:
+                    status, result = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, result = 500, {"error": str(e)}
+                await self.respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, result, keep_alive):
+        body = json.dumps(result).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+        self.executor.shutdown(wait=False)
+
+
+async def serve(host, port, max_batch_size, max_wait_ms, preload=MODEL_KEYS):
+    service = SentimentService(max_batch_size, max_wait_ms)
+    for model_key in preload:
+        await service.batcher(model_key)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving on http://{host}:{port} (max batch {max_batch_size}, max wait {max_wait_ms} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64,
+                        help="texts per micro-batch before it is scored (default: %(default)s)")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0,
+                        help="longest a request waits for its batch to fill (default: %(default)s)")
+    parser.add_argument("--models", nargs="*", choices=MODEL_KEYS, default=list(MODEL_KEYS),
+                        help="models loaded at startup (others load on first request)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.models))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Streaming JSONL scorer: reviews on stdin, scored reviews on stdout.
+
+    cat reviews.jsonl | python stream_scorer.py --model svm > scored.jsonl
+
+Every input line is a JSON object holding the review text (field "Text" by
+default). The output line is the same object, fields and values unchanged
+(ProductId, UserId, Time, ...), with "label" and one "proba_<class>" field
+per class added. Cleaning and vectorizing go through clean_texts() and the
+same vectorizer artifact as the app, so scores match the app and notebook.
+
+Input is read lazily by a reader thread into a bounded queue and collected
+into batches of --batch-size records, or fewer when no new line arrived for
+--max-wait-ms (so a slow producer still gets timely output). Each batch is
+written and flushed as soon as it is scored. Memory stays bounded: the
+queue holds at most --max-pending records, and at most 2 x --workers
+batches are being scored. When stdout is slow, writes block, the queue
+fills up, and reading from stdin stops until the consumer catches up.
+
+Usage:
+    python stream_scorer.py [--model svm] [--text-field Text] [--keep ProductId UserId Time]
+        [--batch-size 1000] [--max-wait-ms 200] [--max-pending 10000] [--workers 1]
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from batch_scoring import ScoringPool, score_texts
+from model_store import MODEL_KEYS, load_artifact
+
+_EOF = object()
+
+
+# Invalid input line; reported with its line number
+class InputError(ValueError):
+    pass
+
+
+# JSON objects of the non-blank lines of a binary stream, parsed lazily
+def read_records(stream):
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise InputError(f"line {line_number}: invalid JSON ({e})")
+        if not isinstance(record, dict):
+            raise InputError(f"line {line_number}: expected a JSON object")
+        yield record
+
+
+# Feeds records into a bounded queue from a background thread, so reading
+# stdin never runs ahead of scoring by more than maxsize records
+class BoundedReader:
+    def __init__(self, records, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._read, args=(records,), daemon=True)
+        self._thread.start()
+
+    def _read(self, records):
+        try:
+            for record in records:
+                self.queue.put(record)
+        except Exception as e:
+            self.queue.put(e)
+        self.queue.put(_EOF)
+
+    # Lists of up to batch_size records; a batch is closed early when no new
+    # record arrives within max_wait seconds
+    def batches(self, batch_size, max_wait):
+        while True:
+            item = self.queue.get()
+            batch = []
+            while item is not _EOF:
+                if isinstance(item, Exception):
+                    if batch:
+                        yield batch
+                    raise item
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max_wait)
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+            if item is _EOF:
+                return
+
+
+# Scored records for each batch, in input order. A missing or null text
+# scores like an empty review (clean_text returns "" for non-strings).
+def score_batches(batches, model_key, text_field, keep=None, workers=1):
+    if workers <= 1:
+        model, vectorizer = load_artifact(model_key), load_artifact("vectorizer")
+        for batch in batches:
+            label_idx, probs = score_texts([record.get(text_field) for record in batch], model, vectorizer)
+            yield _merge(batch, model.classes_, label_idx, probs, keep)
+        return
+
+    with ScoringPool(model_key, workers) as pool:
+        tagged = (([record.get(text_field) for record in batch], batch) for batch in batches)
+        for (label_idx, probs), batch in pool.map(tagged, tagged=True):
+            yield _merge(batch, pool.classes_, label_idx, probs, keep)
+
+
+# Input records (all fields, or only `keep`) with label and proba_<class>
+def _merge(batch, classes, label_idx, probs, keep):
+    scored = []
+    for record, idx, row in zip(batch, label_idx, probs):
+        if keep is not None:
+            record = {field: record[field] for field in keep if field in record}
+        record["label"] = str(classes[idx])
+        for name, p in zip(classes, row):
+            record[f"proba_{name}"] = float(p)
+        scored.append(record)
+    return scored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", choices=MODEL_KEYS, default="svm", help="model to score with (default: %(default)s)")
+    parser.add_argument("--text-field", default="Text", help="field holding the review text (default: %(default)s)")
+    parser.add_argument("--keep", nargs="*", default=None,
+                        help="input fields copied to the output (default: all of them)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="records per batch (default: %(default)s)")
+    parser.add_argument("--max-wait-ms", type=float, default=200,
+                        help="flush a partial batch after this long without input (default: %(default)s)")
+    parser.add_argument("--max-pending", type=int, default=10000,
+                        help="records read ahead of scoring at most (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes scoring batches in parallel (default: %(default)s)")
+    args = parser.parse_args()
+
+    reader = BoundedReader(read_records(sys.stdin.buffer), args.max_pending)
+    out = sys.stdout.buffer
+    rows = 0
+    start = time.perf_counter()
+    try:
+        batches = reader.batches(args.batch_size, args.max_wait_ms / 1000)
+        for scored in score_batches(batches, args.model, args.text_field, args.keep, args.workers):
+            out.write(b"".join(json.dumps(record, ensure_ascii=False).encode() + b"\n" for record in scored))
+            out.flush()
+            rows += len(scored)
+    except InputError as e:
+        sys.exit(f"stream_scorer: {e}")
+    except BrokenPipeError:
+        # Consumer went away (e.g. `| head`): point stdout at devnull so the
+        # interpreter's final flush does not fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    seconds = time.perf_counter() - start
+    print(f"{rows:,} records scored with {args.model} in {seconds:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, log_loss
+
+from evaluation import REPORT_LABELS, compute_metrics, format_report
+
+CLASSES = ["negative", "neutral", "positive"]
+
+
+def _predictions(rows, seed, never_predicted=None):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 3, rows)
+    pred = np.where(rng.random(rows) < 0.7, y_true, rng.integers(0, 3, rows))
+    if never_predicted is not None:
+        pred[pred == never_predicted] = (never_predicted + 1) % 3
+    proba = rng.random((rows, 3))
+    proba[np.arange(rows), pred] += 1.5
+    return y_true, pred, proba / proba.sum(axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("rows, seed, never_predicted", [(1000, 0, None), (257, 1, 1), (31, 2, 0)])
+def test_metrics_match_sklearn(rows, seed, never_predicted):
+    y_true, pred, proba = _predictions(rows, seed, never_predicted)
+    metrics = compute_metrics(y_true, pred, proba, CLASSES)
+    labels = np.array(CLASSES, dtype=object)
+    true_labels, pred_labels = labels[y_true], labels[pred]
+
+    assert format_report(metrics) == classification_report(true_labels, pred_labels, labels=REPORT_LABELS,
+                                                            zero_division=0)
+    expected = classification_report(true_labels, pred_labels, labels=REPORT_LABELS, zero_division=0,
+                                     output_dict=True)
+    for name in REPORT_LABELS + ["macro avg", "weighted avg"]:
+        for metric in ("precision", "recall", "f1-score", "support"):
+            assert metrics["report"][name][metric] == pytest.approx(expected[name][metric], abs=1e-12)
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(true_labels, pred_labels), abs=1e-12)
+    assert metrics["confusion_matrix"] == confusion_matrix(true_labels, pred_labels, labels=REPORT_LABELS).tolist()
+    assert metrics["log_loss"] == pytest.approx(log_loss(true_labels, proba, labels=CLASSES), abs=1e-12)
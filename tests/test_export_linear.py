@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+
+from export_linear import export_logistic_regression, export_multinomial_nb
+from linear_runtime import load_linear_model
+
+TEXTS = ["great snack loved it", "stale chips never again", "okay coffee nothing special",
+         "delicious fresh cookies", "awful bland tea", "fine but pricey", "love these crackers",
+         "box arrived crushed", "decent taste average"]
+LABELS = np.array(["positive", "negative", "neutral"] * 3, dtype=object)
+
+
+@pytest.fixture
+def features():
+    return TfidfVectorizer().fit_transform(TEXTS)
+
+
+def test_multinomial_lr_export_matches(features, tmp_path):
+    model = LogisticRegression().fit(features, LABELS)
+    export_logistic_regression(model, str(tmp_path))
+    exported = load_linear_model(str(tmp_path))
+    np.testing.assert_allclose(exported.predict_proba(features), model.predict_proba(features), atol=1e-12)
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")  # liblinear one-vs-rest
+@pytest.mark.parametrize("model, labels", [
+    (LogisticRegression(), LABELS == "positive"),
+    (LogisticRegression(solver="liblinear"), LABELS)
+])
+def test_binary_and_ovr_lr_are_refused(features, tmp_path, model, labels):
+    model.fit(features, labels)
+    with pytest.raises(ValueError):
+        export_logistic_regression(model, str(tmp_path))
+
+
+def test_binary_nb_export_matches(features, tmp_path):
+    model = MultinomialNB().fit(features, LABELS == "positive")
+    export_multinomial_nb(model, str(tmp_path))
+    exported = load_linear_model(str(tmp_path))
+    np.testing.assert_allclose(exported.predict_proba(features), model.predict_proba(features), atol=1e-12)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from incremental_training import CLASSES, sentiment_labels, update_model
+
+
+def test_sentiment_labels_skip_invalid_ratings():
+    labels = sentiment_labels(pd.Series([1, 3, 5, np.nan, 0, 6, 4.5, 2.0]))
+    assert labels.tolist() == ["negative", "neutral", "positive", None, None, None, None, "negative"]
+
+
+def test_sentiment_labels_nullable_ratings():
+    labels = sentiment_labels(pd.Series([4, None, 2], dtype="Int64"))
+    assert labels.tolist() == ["positive", None, "negative"]
+
+
+def test_update_model_leaves_out_invalid_ratings():
+    texts = ["great snack", "stale chips", "okay coffee", "great coffee", "awful tea", "fine cookies"]
+    ratings = pd.Series([5, 1, 3, np.nan, 0, 7])
+    vectorizer = TfidfVectorizer().fit(texts)
+    model = MultinomialNB()
+    assert update_model(model, texts, sentiment_labels(ratings), vectorizer) == 3
+    assert model.class_count_.tolist() == [1.0, 1.0, 1.0]
+    assert model.classes_.tolist() == CLASSES.tolist()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.svm import LinearSVC
+
+from export_linear import export_calibrated_svc, export_compiled_svc
+from linear_runtime import CompiledCalibratedSVC, load_linear_model
+
+WORDS = {
+    "positive": "great delicious fresh love crispy tasty perfect".split(),
+    "neutral": "okay average fine decent plain usual ordinary".split(),
+    "negative": "stale awful bland crushed broken never refund".split()
+}
+SHARED = "the snack coffee tea box price taste order chips cookies".split()
+
+
+def _reviews(count, seed):
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(list(WORDS), count)
+    texts = [" ".join(rng.choice(WORDS[label] + SHARED, rng.integers(3, 12))) for label in labels]
+    return texts, labels.astype(object)
+
+
+@pytest.fixture(scope="module")
+def svm():
+    texts, labels = _reviews(600, seed=0)
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(texts)
+    model = CalibratedClassifierCV(LinearSVC(random_state=42), cv=5, method="isotonic")
+    return vectorizer, model.fit(vectorizer.transform(texts), labels)
+
+
+# Batches on both sides of the packed-lookup threshold, with unseen reviews
+@pytest.mark.parametrize("rows", [1, 7, CompiledCalibratedSVC.PACKED_LOOKUP_MAX_ROWS,
+                                  CompiledCalibratedSVC.PACKED_LOOKUP_MAX_ROWS + 1, 500])
+@pytest.mark.parametrize("exporter", [export_compiled_svc, export_calibrated_svc])
+def test_exported_svm_matches_predict_proba(svm, exporter, rows, tmp_path):
+    vectorizer, model = svm
+    exporter(model, str(tmp_path))
+    exported = load_linear_model(str(tmp_path))
+    X = vectorizer.transform(_reviews(rows, seed=rows)[0] + ["", "zebra quantum"])
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(exported.predict_proba(X), expected, rtol=0, atol=1e-15)
+    assert (exported.predict(X) == model.classes_[expected.argmax(axis=1)]).all()
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from feature_store import save_csr
+from parallel_training import fit_models
+from review_data import SENTIMENTS
+from training_pipeline import DEFAULT_CONFIG, new_estimator
+
+WORDS = {
+    "positive": "great delicious fresh love crispy tasty perfect".split(),
+    "neutral": "okay average fine decent plain usual ordinary".split(),
+    "negative": "stale awful bland crushed broken never refund".split()
+}
+SHARED = "the snack coffee tea box price taste order chips cookies".split()
+
+
+def test_parallel_fit_matches_serial_fit(tmp_path):
+    rng = np.random.default_rng(0)
+    labels = rng.choice(SENTIMENTS, 800).astype(object)
+    texts = [" ".join(rng.choice(WORDS[label] + SHARED, rng.integers(3, 12))) for label in labels]
+    X = TfidfVectorizer(ngram_range=(1, 2)).fit_transform(texts)
+    save_csr(str(tmp_path), "train", X)
+    labels_path = os.path.join(str(tmp_path), "train_y.npy")
+    np.save(labels_path, np.searchsorted(np.array(SENTIMENTS), labels.astype(str)).astype(np.int8))
+
+    models = DEFAULT_CONFIG["models"]
+    results = fit_models(models, str(tmp_path), "train", X.shape, labels_path, workers=2, progress=None)
+    assert set(results) == set(models)
+    for kind, params in models.items():
+        serial = new_estimator(kind, params).fit(X, labels)
+        model, seconds = results[kind]
+        assert seconds > 0
+        assert model.classes_.tolist() == serial.classes_.tolist()
+        np.testing.assert_array_equal(model.predict_proba(X), serial.predict_proba(X))
+    assert len(results["svm"][0].calibrated_classifiers_) == models["svm"]["cv"]
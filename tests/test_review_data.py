@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from review_data import SENTIMENTS, balanced_reviews, balanced_sample_rows, sentiment_codes, valid_ratings
+
+
+def map_sentiment(rating):
+    if rating < 3:
+        return "negative"
+    elif rating == 3:
+        return "neutral"
+    else:
+        return "positive"
+
+
+@pytest.fixture
+def reviews():
+    rng = np.random.default_rng(0)
+    rows = 3000
+    # A filtered, non-contiguous index like the notebook's df_review
+    index = np.sort(rng.choice(rows * 2, rows, replace=False))
+    return pd.DataFrame({"Rating": rng.integers(1, 6, rows), "Text": [f"review {i}" for i in index],
+                         "Summary": "s"}, index=index)
+
+
+def test_sentiment_codes_match_map_sentiment(reviews):
+    codes = sentiment_codes(reviews["Rating"])
+    assert np.array(SENTIMENTS)[codes].tolist() == reviews["Rating"].apply(map_sentiment).tolist()
+    assert sentiment_codes(reviews["Rating"].astype(float)).tolist() == codes.tolist()
+
+
+@pytest.mark.parametrize("ratings", [[1, 0], [5, 6], [3.0, np.nan], [2.5]])
+def test_sentiment_codes_reject_invalid_ratings(ratings):
+    assert not valid_ratings(np.array(ratings)).all()
+    with pytest.raises(ValueError):
+        sentiment_codes(np.array(ratings))
+
+
+def test_balanced_reviews_match_notebook_sample(reviews):
+    sizes = {"positive": 500, "negative": 400, "neutral": 200}
+    df_review = reviews.copy()
+    df_review["sentiment"] = df_review["Rating"].apply(map_sentiment)
+    parts = [df_review[df_review["sentiment"] == sentiment].sample(n=size, random_state=42)
+             for sentiment, size in sizes.items()]
+    expected = pd.concat(parts).sample(frac=1, random_state=42).reset_index(drop=True)
+
+    codes = sentiment_codes(reviews["Rating"])
+    sample = balanced_reviews(reviews, codes, sizes, random_state=42)
+    assert sample["Text"].tolist() == expected["Text"].tolist()
+    assert sample["sentiment"].tolist() == expected["sentiment"].tolist()
+    rows = balanced_sample_rows(codes, sizes, random_state=42)
+    assert reviews.index[rows].tolist() == pd.concat(parts).sample(frac=1, random_state=42).index.tolist()
+
+
+def test_balanced_sample_rows_refuses_oversampling(reviews):
+    with pytest.raises(ValueError):
+        balanced_sample_rows(sentiment_codes(reviews["Rating"]), {"neutral": len(reviews)}, random_state=42)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from text_clean import clean_text, clean_texts
+
+REVIEWS = [
+    "Great <b>snack</b>! I didn't expect it.",
+    "Won’t buy again... <br /><br />STALE chips & 2 stars",
+    "Café crème über straße naïve",
+    "tabs\tand\nnewlines\u00a0and\u2028separators",
+    "<a href='x'>link</a>can't couldn't",
+    "   ",
+    "",
+    "\u212a kelvin sign, İstanbul, \uff21 fullwidth",
+    "<unclosed tag and n't at start",
+    None,
+    12.5
+]
+
+
+def _fuzz_reviews(count=2000, seed=0):
+    alphabet = list("abcXYZ <>/'’n t\t\n.!,0123éß\u00a0\u2028\u212aİ")
+    rng = np.random.default_rng(seed)
+    return ["".join(rng.choice(alphabet, rng.integers(0, 40))) for _ in range(count)]
+
+
+def test_clean_texts_matches_clean_text():
+    texts = REVIEWS + _fuzz_reviews()
+    assert clean_texts(texts) == [clean_text(text) for text in texts]
+    assert clean_texts(texts, use_cache=True) == [clean_text(text) for text in texts]
+
+
+def test_clean_texts_keeps_container_type():
+    series = pd.Series(["Tasty!", "Bad <i>tea</i>"], index=[5, 7], name="Text")
+    cleaned = clean_texts(series)
+    assert isinstance(cleaned, pd.Series)
+    assert cleaned.index.tolist() == [5, 7] and cleaned.name == "Text"
+    assert cleaned.tolist() == ["tasty", "bad tea"]
+    array = clean_texts(np.array(["Tasty!"], dtype=object))
+    assert isinstance(array, np.ndarray) and array.dtype == object
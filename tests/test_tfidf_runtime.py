@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from export_linear import export_tfidf_vectorizer
+from linear_runtime import load_linear_model
+from text_clean import clean_texts
+
+TRAIN = clean_texts([
+    "Great snack, the kids love these crackers and the price is fair",
+    "The chips arrived stale and the box was crushed, never again",
+    "Okay coffee, nothing special but not bad either",
+    "Delicious fresh cookies, great taste, will buy again",
+    "Awful bland tea, the taste was not great at all",
+    "Decent crackers for the price, the kids eat them",
+    "Crème brûlée flavored coffee tastes great",
+    "Not fresh, not crispy, not worth the price"
+])
+UNSEEN = ["great great great coffee", "", "zebra quantum words only", "the the the", "fresh crackers not stale",
+          "brûlée crème coffee"]
+
+
+@pytest.mark.parametrize("params", [
+    dict(ngram_range=(1, 2), min_df=1, max_df=0.7, sublinear_tf=True, stop_words="english"),
+    dict(ngram_range=(1, 1), max_features=20, norm="l1"),
+    dict(ngram_range=(1, 3), norm=None, lowercase=False)
+])
+def test_compact_transform_is_bit_identical(params, tmp_path):
+    vectorizer = TfidfVectorizer(**params).fit(TRAIN)
+    export_tfidf_vectorizer(vectorizer, str(tmp_path))
+    compact = load_linear_model(str(tmp_path))
+    assert compact.vocabulary_ == vectorizer.vocabulary_
+    for docs in (TRAIN, UNSEEN):
+        expected, actual = vectorizer.transform(docs), compact.transform(docs)
+        assert actual.shape == expected.shape
+        np.testing.assert_array_equal(actual.indptr, expected.indptr)
+        np.testing.assert_array_equal(actual.indices, expected.indices)
+        assert actual.data.dtype == expected.data.dtype
+        assert actual.data.tobytes() == expected.data.tobytes()
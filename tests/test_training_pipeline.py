@@ -0,0 +1,37 @@
+import training_pipeline
+from training_pipeline import Pipeline, build_stages, load_config
+
+
+def _keys(tmp_path):
+    data = tmp_path / "reviews.parquet"
+    if not data.exists():
+        data.write_bytes(b"")
+    config = load_config(overrides=['vectorizer.stop_words="english"'], data_path=str(data))
+    return Pipeline(build_stages(config), str(tmp_path / "cache")).keys
+
+
+def test_fit_key_follows_fit_helpers(tmp_path, monkeypatch):
+    before = _keys(tmp_path)
+
+    def fit_model(kind, params, X, y, matrix_dir=None, matrix_name="train"):
+        return training_pipeline.new_estimator(kind, dict(params, random_state=0)).fit(X, y)
+
+    monkeypatch.setattr(training_pipeline, "fit_model", fit_model)
+    after = _keys(tmp_path)
+    assert after["vectorize"] == before["vectorize"]
+    for kind in ("svm", "nb", "lr"):
+        assert after[f"fit_{kind}"] != before[f"fit_{kind}"]
+        assert after[f"evaluate_{kind}"] != before[f"evaluate_{kind}"]
+
+
+def test_evaluate_key_follows_scoring_helpers(tmp_path, monkeypatch):
+    before = _keys(tmp_path)
+
+    def evaluate_model(model, X, y_true, proba=None):
+        return None
+
+    monkeypatch.setattr(training_pipeline, "evaluate_model", evaluate_model)
+    after = _keys(tmp_path)
+    for kind in ("svm", "nb", "lr"):
+        assert after[f"fit_{kind}"] == before[f"fit_{kind}"]
+        assert after[f"evaluate_{kind}"] != before[f"evaluate_{kind}"]
@@ -0,0 +1,90 @@
+"""Review text cleaning shared by the notebook, the app and the batch tools.
+
+clean_text() is the reference cleaner the vectorizer was trained with
+(notebook cell "TF-IDF Vectorizer"). clean_texts() produces byte-identical
+output for a whole list / NumPy array / pandas Series at a much higher
+throughput:
+
+  * the patterns are compiled once and their bound methods hoisted out of
+    the loop;
+  * the HTML and n't passes are skipped when the string has no '<' or
+    apostrophe (a plain substring test is far cheaper than a regex scan);
+  * "keep letters/space -> lowercase -> collapse whitespace" reduces to
+    "ASCII letter runs, lowercased, joined by one space": every character
+    that is not an ASCII letter ends up as a separator either way. For
+    ASCII strings (almost all reviews) that is one bytes.translate() with a
+    table mapping A-Z to a-z and everything else to a space, then
+    split()/join(); other strings use a findall of the letter runs.
+
+Interactive callers pass use_cache=True to go through CLEAN_CACHE, a bounded
+LRU shared by every thread of the process. Batch jobs leave it off: reuse is
+unlikely there and the lookups would only cost time and evict hot entries.
+"""
+import re
+import string
+import sys
+
+import numpy as np
+
+from lru_cache import LRUCache
+
+_HTML_TAG = re.compile(r'<.*?>')
+_NEGATION = re.compile(r"n['’]t")
+_LETTER_RUNS = re.compile(r'[a-zA-Z]+')
+
+# ASCII byte -> lowercase letter, or space for anything that is not a letter
+_ASCII_TABLE = bytes(
+    ord(chr(i).lower()) if chr(i) in string.ascii_letters else ord(' ')
+    for i in range(256)
+)
+
+# Cleaned text of recently seen reviews (interactive paths only)
+CLEAN_CACHE = LRUCache(max_entries=20000, max_bytes=32 * 1024 * 1024)
+
+
+# Simple cleaner with basic negation handling (same as in notebook)
+def clean_text(text: str) -> str:
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'<.*?>', ' ', text)            # remove HTML tag
+    text = re.sub(r"n['’]t", " not", text)        # convert n't -> not
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)      # keep letters/space
+    text = text.lower()                           # lowercase
+    text = re.sub(r'\s+', ' ', text).strip()      # remove extra spaces
+    return text
+
+
+# Same output as clean_text(), one string at a time without the batch wrapper
+def clean_text_fast(text, _html_sub=_HTML_TAG.sub, _negation_sub=_NEGATION.sub,
+                    _letter_runs=_LETTER_RUNS.findall, _table=_ASCII_TABLE):
+    if not isinstance(text, str):
+        return ""
+    if '<' in text:
+        text = _html_sub(' ', text)
+    if "'" in text or '’' in text:
+        text = _negation_sub(' not', text)
+    if text.isascii():
+        return b' '.join(text.encode().translate(_table).split()).decode()
+    return ' '.join(_letter_runs(text)).lower()
+
+
+# clean_text_fast() through CLEAN_CACHE (non-str input is not cached)
+def clean_text_cached(text, _cache=CLEAN_CACHE):
+    if not isinstance(text, str):
+        return ""
+    return _cache.get_or_compute(text, clean_text_fast)
+
+
+# Clean a batch of reviews. A pandas Series comes back as a Series with the
+# same index and name, a NumPy array as an object array, anything else as
+# a list. pandas is looked up rather than imported (a Series can only exist
+# once it is loaded), so the app can clean text without importing it.
+def clean_texts(texts, use_cache=False):
+    clean = clean_text_cached if use_cache else clean_text_fast
+    cleaned = [clean(text) for text in texts]
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(texts, pd.Series):
+        return pd.Series(cleaned, index=texts.index, name=texts.name)
+    if isinstance(texts, np.ndarray):
+        return np.array(cleaned, dtype=object)
+    return cleaned
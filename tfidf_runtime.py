@@ -0,0 +1,153 @@
+"""NumPy-only TfidfVectorizer.transform() for the exported vectorizer artifact.
+
+vectorizer.pkl is a pickled scikit-learn TfidfVectorizer: unpickling it
+imports scikit-learn and rebuilds a 10,000 entry Python dict, and transform()
+runs the generic analyzer (a chain of closures per document) followed by
+three passes through scikit-learn's validation layers. export_linear.py
+writes the same information as flat arrays instead:
+
+  * vocab_bytes / vocab_offsets: the terms sorted by code point, UTF-8
+    encoded back to back (term i is vocab_bytes[offsets[i]:offsets[i+1]])
+  * vocab_ids: int32 feature id of each sorted term
+  * idf: the idf_ vector in the vectorizer's dtype
+
+plus the analyzer settings and the (small) stop word list in meta.json.
+stop_words_ (terms dropped by min_df/max_df/max_features, only kept for
+introspection) is not exported. The arrays are opened with
+np.load(mmap_mode="r"); the term -> id dict is built from them on the first
+transform() call.
+
+transform() returns the same CSR matrix as TfidfVectorizer.transform() (same
+indices and indptr, same float64 values bit for bit): counts are assembled for
+the whole batch with one np.unique, and the L2 norms are summed in the same
+sequential order as scikit-learn's inplace_csr_row_normalize_l2.
+"""
+import itertools
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class CompactTfidfVectorizer:
+    def __init__(self, vocab_bytes, vocab_offsets, vocab_ids, idf, stop_words,
+                 token_pattern=r"(?u)\b\w\w+\b", ngram_range=(1, 1), lowercase=True,
+                 sublinear_tf=False, norm="l2"):
+        self.vocab_bytes = vocab_bytes
+        self.vocab_offsets = vocab_offsets
+        self.vocab_ids = vocab_ids
+        self.idf_ = idf
+        self.stop_words = frozenset(stop_words)
+        self.token_pattern = token_pattern
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self._findall = re.compile(token_pattern).findall
+        self._vocabulary = None
+
+    @property
+    def n_features(self):
+        return len(self.idf_)
+
+    # Sorted terms, decoded from the packed UTF-8 buffer
+    def terms(self):
+        blob = self.vocab_bytes.tobytes()
+        offsets = self.vocab_offsets.tolist()
+        return [blob[start:end].decode() for start, end in zip(offsets[:-1], offsets[1:])]
+
+    # term -> feature id, equal to TfidfVectorizer.vocabulary_
+    @property
+    def vocabulary_(self):
+        if self._vocabulary is None:
+            self._vocabulary = dict(zip(self.terms(), self.vocab_ids.tolist()))
+        return self._vocabulary
+
+    # Feature ids of the word n-grams of one document, as TfidfVectorizer's
+    # analyzer + vocabulary lookup would produce them (duplicates included,
+    # -1 for out-of-vocabulary n-grams)
+    def _feature_ids(self, doc, lookup, stop_words, missing=itertools.repeat(-1)):
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = [token for token in self._findall(doc) if token not in stop_words]
+        min_n, max_n = self.ngram_range
+        ids = []
+        if min_n == 1:
+            ids = list(map(lookup, tokens, missing))
+            min_n = 2
+        for n in range(min_n, min(max_n, len(tokens)) + 1):
+            if n == 2:
+                ngrams = map(" ".join, zip(tokens, tokens[1:]))
+            else:
+                ngrams = (" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            ids += map(lookup, ngrams, missing)
+        return ids
+
+    def transform(self, raw_documents):
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        lookup = self.vocabulary_.get
+        stop_words = self.stop_words
+        n_features = self.n_features
+
+        lengths = []
+        ids = []
+        for doc in raw_documents:
+            doc_ids = self._feature_ids(doc, lookup, stop_words)
+            lengths.append(len(doc_ids))
+            ids += doc_ids
+        n_docs = len(lengths)
+
+        rows = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+        ids = np.array(ids, dtype=np.int64)
+        known = ids >= 0
+        # (row, column) pairs -> sorted unique keys with their counts; sorting
+        # row * n_features + column gives CSR order with sorted indices
+        keys, counts = np.unique(rows[known] * n_features + ids[known], return_counts=True)
+        indices = (keys % n_features).astype(np.int32)
+        indptr = np.zeros(n_docs + 1, dtype=np.int32)
+        np.cumsum(np.bincount(keys // n_features, minlength=n_docs), out=indptr[1:])
+
+        data = counts.astype(self.idf_.dtype)
+        if self.sublinear_tf:
+            np.log(data, data)
+            data += 1.0
+        data *= self.idf_[indices]
+        if self.norm == "l2":
+            _normalize_l2(data, indptr)
+        elif self.norm == "l1":
+            _normalize_l1(data, indptr)
+        elif self.norm is not None:
+            raise ValueError(f"Unsupported norm {self.norm!r}")
+        return sp.csr_matrix((data, indices, indptr), shape=(n_docs, n_features))
+
+
+# Per-row sum of values, added one column position at a time so every row is
+# summed left to right like scikit-learn's Cython loops (np.add.reduceat uses
+# pairwise summation and can differ in the last bit)
+def _sequential_row_sums(values, indptr):
+    lengths = np.diff(indptr)
+    by_length = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[by_length]
+    starts = indptr[:-1][by_length].astype(np.int64)
+    sums = np.zeros(len(lengths), dtype=values.dtype)
+    active = len(lengths)
+    for k in range(int(sorted_lengths[0]) if len(lengths) else 0):
+        while sorted_lengths[active - 1] <= k:
+            active -= 1
+        sums[:active] += values[starts[:active] + k]
+    out = np.empty_like(sums)
+    out[by_length] = sums
+    return out
+
+
+def _normalize_l2(data, indptr):
+    norms = np.sqrt(_sequential_row_sums(data * data, indptr))
+    norms[norms == 0.0] = 1.0
+    data /= np.repeat(norms, np.diff(indptr))
+
+
+def _normalize_l1(data, indptr):
+    norms = _sequential_row_sums(np.abs(data), indptr)
+    norms[norms == 0.0] = 1.0
+    data /= np.repeat(norms, np.diff(indptr))
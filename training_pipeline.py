@@ -0,0 +1,577 @@
+"""Scripted training pipeline: the notebook's steps as cached stages.
+
+The notebook has to run top to bottom to produce the pickles. Here every
+step is a stage whose output is cached under artifacts/pipeline/<stage>/<key>/:
+
+    load -> label -> sample -> split -> clean -> vectorize
+         -> fit_<model> -> evaluate_<model> (svm, nb, lr) -> export
+
+A stage's key is a hash of its configuration section, the source of its
+stage function (plus the cleaning module for "clean") and the keys of the
+stages it reads from; "load" also hashes the size and mtime of the input
+file. Keys are computed before anything runs, so a rerun only computes the
+stages whose key changed and loads the rest lazily - outputs of a cached
+stage are read only if a stage that has to run needs them. Changing only
+models.lr reruns fit_lr and evaluate_lr; changing the vectorizer settings
+reruns vectorize and everything after it. The timing summary lists every
+stage as ran (seconds, including reading the cached inputs it used), cached
+(with the time it took when it was computed) or unused.
+
+Each stage reproduces the notebook: the same labels (an int8 lookup per
+rating) and per-class samples and shuffle (the random draws of pandas
+sample with the same random_state, applied to row positions - see
+review_data.balanced_sample_rows), the same stratified split, clean_texts (byte-identical to clean_text) and the
+same TfidfVectorizer and model settings. MultinomialNB is fitted on the
+sparse matrix instead of a dense copy (same model, without a
+rows x 10000 float64 array); with models.nb.memory_mb set it is trained
+and evaluated in row chunks within that budget (out_of_core_nb.py). The models are only exported (pickles copied
+next to the app, artifacts/linear/ refreshed when it exists, the
+evaluations saved as the app's metrics run - see evaluation.py) by the
+export stage, which always runs.
+
+Configuration is DEFAULT_CONFIG, optionally merged with a JSON file and
+--set overrides (JSON values):
+
+    python training_pipeline.py [--data Reviews.parquet] [--config config.json]
+        [--set models.lr.C=0.5] [--set sample.sizes.neutral=20000]
+        [--no-export] [--export-dir .] [--cache-dir artifacts/pipeline] [--workers 1]
+
+With --workers N the fit stages that have to run are fitted together in N
+processes, calibration folds included (see parallel_training.py).
+"""
+import argparse
+import copy
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from feature_store import clean_fingerprint, load_csr, load_texts, save_csr, save_texts
+from model_store import BASE_DIR, MODEL_FILES, MODEL_KEYS
+from review_data import RATING_CODES, SENTIMENTS, balanced_sample_rows, load_reviews, sentiment_codes
+from evaluation import METRICS_DIR, evaluate_model, save_metrics
+from text_clean import clean_texts
+
+PIPELINE_DIR = os.path.join(BASE_DIR, "artifacts", "pipeline")
+
+# Bump when the entry layout changes; part of every key
+CACHE_VERSION = 1
+
+# Domain stop words added to NLTK's English list in the notebook
+DOMAIN_STOPWORDS = [
+    "like", "good", "great", "just", "really", "best", "better", "love",
+    "taste", "flavor", "food", "eat", "tastes",
+    "coffee", "tea", "chocolate", "cup", "sugar", "water", "bag", "box",
+    "product", "amazon", "price", "order", "buy", "bought", "store", "free",
+    "dog"
+]
+
+DEFAULT_CONFIG = {
+    # path None: Reviews.parquet when it exists, else Reviews.csv
+    "data": {"path": None, "encoding": "latin1"},
+    # Reviews per class, sampled in this order, then shuffled
+    "sample": {"sizes": {"positive": 100000, "negative": 80000, "neutral": 40000}, "random_state": 42},
+    "split": {"test_size": 0.2, "random_state": 1},
+    # stop_words "notebook": NLTK English stop words + DOMAIN_STOPWORDS
+    "vectorizer": {"stop_words": "notebook", "ngram_range": [1, 2], "max_features": 10000,
+                   "min_df": 5, "max_df": 0.7, "sublinear_tf": True},
+    "models": {
+        # LinearSVC parameters plus the CalibratedClassifierCV cv / method
+        "svm": {"random_state": 42, "max_iter": 5000, "cv": 5, "method": "isotonic"},
+        "nb": {},
+        "lr": {"max_iter": 200}
+    }
+}
+
+
+def default_data_path():
+    parquet = os.path.join(BASE_DIR, "Reviews.parquet")
+    return parquet if os.path.exists(parquet) else os.path.join(BASE_DIR, "Reviews.csv")
+
+
+# Nested dict `base` updated with `override` (dicts merged key by key)
+def merge_config(base, override):
+    merged = copy.deepcopy(base)
+    for name, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(name), dict):
+            merged[name] = merge_config(merged[name], value)
+        else:
+            merged[name] = copy.deepcopy(value)
+    return merged
+
+
+# "models.lr.C=0.5" -> {"models": {"lr": {"C": 0.5}}}; the value is JSON,
+# or a plain string when it does not parse
+def parse_override(text):
+    path, sep, raw = text.partition("=")
+    if not sep or not path:
+        raise ValueError(f"Expected NAME.NAME=VALUE, got {text!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    for name in reversed(path.split(".")):
+        value = {name: value}
+    return value
+
+
+# Stop word setting of the vectorizer: "notebook" resolved to the sorted
+# word list, other values (a list or sklearn's "english") as they are
+def resolve_stop_words(stop_words):
+    if stop_words == "notebook":
+        import nltk
+        from nltk.corpus import stopwords
+        try:
+            english = stopwords.words("english")
+        except LookupError:
+            nltk.download("stopwords", quiet=True)
+            try:
+                english = stopwords.words("english")
+            except LookupError:
+                raise ValueError("NLTK stopwords are not available; run `python -m nltk.downloader stopwords` "
+                                 "or set vectorizer.stop_words to a list") from None
+        return sorted(set(english) | set(DOMAIN_STOPWORDS))
+    return sorted(stop_words) if isinstance(stop_words, list) else stop_words
+
+
+# ---- Stages. Each takes its config section and the results of the stages
+# it reads from, and returns a dict of outputs (arrays, sparse matrices,
+# lists of strings, JSON-serializable dicts or picklable objects).
+
+def load_stage(config):
+    path = config["path"]
+    if path.endswith(".parquet"):
+        df = load_reviews(path, columns=["Text", "Rating"])
+    else:
+        import pandas as pd
+        header = pd.read_csv(path, nrows=0, encoding=config["encoding"]).columns
+        rating = "Rating" if "Rating" in header else "Score"
+        df = pd.read_csv(path, encoding=config["encoding"], usecols=["Text", rating], low_memory=False)
+        df = df.rename(columns={rating: "Rating"})
+        df = df[pd.to_numeric(df["Rating"], errors="coerce").between(1, 5)]
+    return {"text": df["Text"].astype(str).tolist(), "rating": df["Rating"].to_numpy(dtype=np.int8)}
+
+
+# map_sentiment as int8 codes into SENTIMENTS (one table lookup)
+def label_stage(config, load):
+    return {"codes": sentiment_codes(load["rating"])}
+
+
+# Positions of the balanced, shuffled sample (the notebook's df_review_bal)
+def sample_stage(config, label):
+    return {"rows": balanced_sample_rows(label["codes"], config["sizes"], config["random_state"])}
+
+
+# Stratified train/test split of the sample: positions into the loaded
+# reviews and their label codes
+def split_stage(config, label, sample):
+    from sklearn.model_selection import train_test_split
+    rows = sample["rows"]
+    codes = label["codes"][rows]
+    train, test = train_test_split(np.arange(len(rows)), test_size=config["test_size"],
+                                   random_state=config["random_state"], stratify=codes)
+    return {"train": rows[train], "test": rows[test], "train_y": codes[train], "test_y": codes[test]}
+
+
+def clean_stage(config, load, split):
+    texts = load["text"]
+    return {
+        "train": clean_texts([texts[i] for i in split["train"]]),
+        "test": clean_texts([texts[i] for i in split["test"]])
+    }
+
+
+def vectorize_stage(config, clean):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    params = dict(config, ngram_range=tuple(config["ngram_range"]),
+                  stop_words=resolve_stop_words(config["stop_words"]))
+    vectorizer = TfidfVectorizer(**params)
+    return {
+        "vectorizer": vectorizer,
+        "train": vectorizer.fit_transform(clean["train"]),
+        "test": vectorizer.transform(clean["test"])
+    }
+
+
+def new_estimator(kind, params):
+    if kind == "svm":
+        from sklearn.calibration import CalibratedClassifierCV
+        from sklearn.svm import LinearSVC
+        params = dict(params)
+        cv, method = params.pop("cv", 5), params.pop("method", "isotonic")
+        return CalibratedClassifierCV(LinearSVC(**params), cv=cv, method=method)
+    if kind == "nb":
+        from sklearn.naive_bayes import MultinomialNB
+        return MultinomialNB(**params)
+    if kind == "lr":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(**params)
+    raise ValueError(f"Unknown model {kind!r}; expected one of {', '.join(MODEL_KEYS)}")
+
+
+# Fit one model on the training matrix X; "nb" with memory_mb set streams
+# row chunks of the stored matrix (matrix_dir/<matrix_name>) through
+# partial_fit instead (out_of_core_nb.py)
+def fit_model(kind, params, X, y, matrix_dir=None, matrix_name="train"):
+    if kind == "nb" and params.get("memory_mb"):
+        from out_of_core_nb import fit_multinomial_nb
+        params = dict(params)
+        budget = params.pop("memory_mb") * 2 ** 20
+        return fit_multinomial_nb(matrix_dir, matrix_name, X.shape, y, budget, **params)
+    return new_estimator(kind, params).fit(X, y)
+
+
+def fit_stage(config, kind, vectorize, split):
+    y = np.array(SENTIMENTS, dtype=object)[split["train_y"]]
+    return {"model": fit_model(kind, config, vectorize["train"], y, vectorize.path)}
+
+
+# Score the test split once (probabilities in row chunks within
+# config["memory_mb"] when set) and derive the metrics (evaluation.py)
+def evaluate_stage(config, vectorize, split, fit):
+    y_true = np.array(SENTIMENTS, dtype=object)[split["test_y"]]
+    proba = None
+    if config.get("memory_mb"):
+        from out_of_core_nb import predict_proba_chunked
+        proba = predict_proba_chunked(fit["model"], vectorize.path, "test",
+                                      vectorize.meta["outputs"]["test"]["shape"], config["memory_mb"] * 2 ** 20)
+    result = evaluate_model(fit["model"], vectorize["test"], y_true, proba)
+    return {"pred": result["pred"], "proba": result["proba"], "metrics": result["metrics"]}
+
+
+# Copy the cached pickles to export_dir under the notebook's file names.
+# Exporting next to the app also refreshes the NumPy exports of
+# artifacts/linear/ when they exist (the app serves those in preference to
+# the pickles) and saves the evaluations as the app's metrics run.
+def export_stage(config, vectorize, split, **inputs):
+    from linear_runtime import LINEAR_DIR
+    export_dir = config["dir"]
+    os.makedirs(export_dir, exist_ok=True)
+    artifacts = {name[len("fit_"):]: (result, "model") for name, result in inputs.items() if name.startswith("fit_")}
+    artifacts["vectorizer"] = (vectorize, "vectorizer")
+    written = {}
+    for key, (result, name) in artifacts.items():
+        written[key] = os.path.join(export_dir, MODEL_FILES[key])
+        shutil.copyfile(result.file(name), written[key])
+    if os.path.abspath(export_dir) == BASE_DIR:
+        if os.path.isdir(LINEAR_DIR):
+            from export_linear import export_artifact
+            for key, (result, name) in artifacts.items():
+                written[f"{key} (linear)"] = export_artifact(key, result[name], source=written[key])
+        evaluations = {name[len("evaluate_"):]: {
+            "classes": list(SENTIMENTS), "y_true": np.asarray(split["test_y"]),
+            "pred": result["pred"], "proba": result["proba"], "metrics": result["metrics"]
+        } for name, result in inputs.items() if name.startswith("evaluate_")}
+        meta = save_metrics(evaluations, {"source": f"pipeline/split/{split.meta['key']}"})
+        written["metrics"] = os.path.join(METRICS_DIR, f"v{meta['version']:04d}")
+    return {"files": written}
+
+
+# ---- Cache entries
+
+# Outputs of one stage: in memory after it ran, otherwise loaded from its
+# cache entry on first access (arrays and matrices memory-mapped)
+class StageResult:
+    def __init__(self, path, meta, values=None):
+        self.path = path
+        self.meta = meta
+        self._values = dict(values or {})
+
+    def file(self, name):
+        return os.path.join(self.path, name + ".pkl")
+
+    def __getitem__(self, name):
+        if name not in self._values:
+            self._values[name] = _load_output(self.path, name, self.meta["outputs"][name])
+        return self._values[name]
+
+
+def _output_kind(value):
+    import scipy.sparse as sp
+    if isinstance(value, np.ndarray):
+        return {"kind": "array"}
+    if sp.issparse(value):
+        return {"kind": "csr", "shape": list(value.shape)}
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return {"kind": "texts"}
+    if isinstance(value, dict):
+        return {"kind": "json"}
+    return {"kind": "pickle"}
+
+
+def _save_output(path, name, value, kind):
+    if kind["kind"] == "array":
+        np.save(os.path.join(path, name + ".npy"), value)
+    elif kind["kind"] == "csr":
+        save_csr(path, name, value)
+    elif kind["kind"] == "texts":
+        save_texts(path, name, value)
+    elif kind["kind"] == "json":
+        with open(os.path.join(path, name + ".json"), "w") as f:
+            json.dump(value, f, indent=2)
+    else:
+        import joblib
+        joblib.dump(value, os.path.join(path, name + ".pkl"))
+
+
+def _load_output(path, name, kind):
+    if kind["kind"] == "array":
+        return np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+    if kind["kind"] == "csr":
+        return load_csr(path, name, kind["shape"])
+    if kind["kind"] == "texts":
+        return load_texts(path, name)
+    if kind["kind"] == "json":
+        with open(os.path.join(path, name + ".json")) as f:
+            return json.load(f)
+    import joblib
+    return joblib.load(os.path.join(path, name + ".pkl"))
+
+
+# Write a stage's outputs to cache_dir/<stage>/<key> (temporary directory
+# renamed into place); returns the entry meta
+def save_entry(cache_dir, stage, key, outputs, meta):
+    path = os.path.join(cache_dir, stage, key)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    try:
+        kinds = {name: _output_kind(value) for name, value in outputs.items()}
+        for name, value in outputs.items():
+            _save_output(tmp_path, name, value, kinds[name])
+        meta = dict(meta, stage=stage, key=key, cache_version=CACHE_VERSION, created=time.time(), outputs=kinds)
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another run stored the same key first; its entry is identical
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return meta
+
+
+# ---- Pipeline
+
+# `inputs` maps the stage function's arguments to the stages they are read from
+class Stage:
+    def __init__(self, name, function, config, inputs=None, fingerprint=None, cached=True, **kwargs):
+        self.name = name
+        self.function = function
+        self.config = config
+        self.inputs = inputs or {}
+        self.fingerprint = fingerprint
+        self.cached = cached
+        self.kwargs = kwargs
+
+
+def _file_fingerprint(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+# Source of the helpers a fit stage builds and fits its model with (the
+# out-of-core Naive Bayes fit when the stage uses it)
+def _fit_fingerprint(params):
+    functions = [fit_model, new_estimator]
+    if params.get("memory_mb"):
+        from out_of_core_nb import fit_multinomial_nb
+        functions.append(fit_multinomial_nb)
+    return "".join(inspect.getsource(function) for function in functions)
+
+
+# Source of the helpers an evaluate stage scores the test split with
+def _evaluate_fingerprint(params):
+    import evaluation
+    functions = [evaluate_model, evaluation.label_codes, evaluation.compute_metrics]
+    if params.get("memory_mb"):
+        from out_of_core_nb import predict_proba_chunked
+        functions.append(predict_proba_chunked)
+    return "".join(inspect.getsource(function) for function in functions)
+
+
+# The stages of a resolved configuration, in run order
+def build_stages(config, export_dir=None):
+    models = list(config["models"])
+    stages = [
+        Stage("load", load_stage, config["data"], fingerprint=lambda: _file_fingerprint(config["data"]["path"])),
+        Stage("label", label_stage, {}, {"load": "load"},
+              fingerprint=lambda: inspect.getsource(sentiment_codes) + repr(RATING_CODES.tolist())),
+        Stage("sample", sample_stage, config["sample"], {"label": "label"},
+              fingerprint=lambda: inspect.getsource(balanced_sample_rows)),
+        Stage("split", split_stage, config["split"], {"label": "label", "sample": "sample"}),
+        Stage("clean", clean_stage, {}, {"load": "load", "split": "split"},
+              fingerprint=lambda: clean_fingerprint(clean_texts)),
+        Stage("vectorize", vectorize_stage,
+              dict(config["vectorizer"], stop_words=resolve_stop_words(config["vectorizer"]["stop_words"])),
+              {"clean": "clean"})
+    ]
+    for kind in models:
+        params = config["models"][kind]
+        stages.append(Stage(f"fit_{kind}", fit_stage, params, {"vectorize": "vectorize", "split": "split"},
+                            fingerprint=lambda params=params: _fit_fingerprint(params), kind=kind))
+    for kind in models:
+        memory_mb = config["models"][kind].get("memory_mb")
+        params = {"memory_mb": memory_mb} if memory_mb else {}
+        stages.append(Stage(f"evaluate_{kind}", evaluate_stage, params,
+                            {"vectorize": "vectorize", "split": "split", "fit": f"fit_{kind}"},
+                            fingerprint=lambda params=params: _evaluate_fingerprint(params)))
+    if export_dir is not None:
+        inputs = {"vectorize": "vectorize", "split": "split"}
+        for kind in models:
+            inputs.update({f"fit_{kind}": f"fit_{kind}", f"evaluate_{kind}": f"evaluate_{kind}"})
+        stages.append(Stage("export", export_stage, {"dir": export_dir}, inputs, cached=False))
+    return stages
+
+
+class Pipeline:
+    def __init__(self, stages, cache_dir=PIPELINE_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.keys = {}
+        self.results = {}
+        self.timings = {}
+        # ([stage names], wall-clock seconds) of stages that ran at the same
+        # time (parallel_training.fit_pipeline_models)
+        self.concurrent = []
+        for stage in stages:
+            self.keys[stage.name] = self._key(stage)
+
+    # Hash of the stage's config, code and upstream keys
+    def _key(self, stage):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"pipeline:{CACHE_VERSION}\n{stage.name}\n".encode())
+        digest.update(inspect.getsource(stage.function).encode())
+        digest.update(json.dumps(stage.config, sort_keys=True).encode())
+        if stage.fingerprint is not None:
+            digest.update(stage.fingerprint().encode())
+        for argument, name in sorted(stage.inputs.items()):
+            digest.update(f"{argument}={name}:{self.keys[name]}\n".encode())
+        return digest.hexdigest()
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name, self.keys[name])
+
+    def is_cached(self, name):
+        return self.stages[name].cached and os.path.exists(os.path.join(self._path(name), "meta.json"))
+
+    # Result of a stage: the cache entry when its key is stored, otherwise
+    # computed from the results of its inputs (resolved the same way)
+    def result(self, name):
+        if name in self.results:
+            return self.results[name]
+        stage = self.stages[name]
+        path = self._path(name)
+        if self.is_cached(name):
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            self.timings[name] = ("cached", meta["seconds"])
+            self.results[name] = StageResult(path, meta)
+            return self.results[name]
+
+        inputs = {argument: self.result(input_name) for argument, input_name in stage.inputs.items()}
+        start = time.perf_counter()
+        outputs = stage.function(stage.config, **stage.kwargs, **inputs)
+        return self.store(name, outputs, time.perf_counter() - start)
+
+    # Record the outputs of a stage computed in `seconds` (cached stages are
+    # written to the cache); returns its result
+    def store(self, name, outputs, seconds):
+        stage = self.stages[name]
+        self.timings[name] = ("ran", seconds)
+        meta = {"config": stage.config, "inputs": {n: self.keys[n] for n in stage.inputs.values()},
+                "seconds": seconds}
+        if stage.cached:
+            meta = save_entry(self.cache_dir, name, self.keys[name], outputs, meta)
+        else:
+            meta = dict(meta, outputs={})
+        self.results[name] = StageResult(self._path(name), meta, outputs)
+        return self.results[name]
+
+    # Run every stage that has no cached result and is needed by the last
+    # ones (the evaluations and the export)
+    def run(self):
+        for name in self.stages:
+            if name.startswith("evaluate_") or name == "export":
+                self.result(name)
+        return self.results
+
+    def summary(self):
+        lines = [f"{'stage':<14}{'':<8}{'seconds':>9}"]
+        in_parallel = {name for names, _ in self.concurrent for name in names}
+        total = sum(seconds for _, seconds in self.concurrent)
+        for name in self.stages:
+            status, seconds = self.timings.get(name, ("skipped", None))
+            if name in in_parallel:
+                lines.append(f"{name:<14}{'ran':<8}{'-':>9}  (in parallel, done after {seconds:.2f}s)")
+            elif status == "ran":
+                total += seconds
+                lines.append(f"{name:<14}{'ran':<8}{seconds:>9.2f}")
+            elif status == "cached":
+                lines.append(f"{name:<14}{'cached':<8}{'-':>9}  (took {seconds:.2f}s, {self.keys[name][:12]})")
+            else:
+                lines.append(f"{name:<14}{'unused':<8}{'-':>9}  (not needed by the stages that ran)")
+        for names, seconds in self.concurrent:
+            lines.append(f"{'parallel fit':<22}{seconds:>9.2f}  (wall clock of {', '.join(names)})")
+        lines.append(f"{'total':<22}{total:>9.2f}")
+        return "\n".join(lines)
+
+
+# Configuration of a run: DEFAULT_CONFIG merged with a JSON file and overrides
+def load_config(config_path=None, overrides=(), data_path=None):
+    config = DEFAULT_CONFIG
+    if config_path:
+        with open(config_path) as f:
+            config = merge_config(config, json.load(f))
+    for override in overrides:
+        config = merge_config(config, parse_override(override))
+    if data_path:
+        config = merge_config(config, {"data": {"path": data_path}})
+    if config["data"]["path"] is None:
+        config = merge_config(config, {"data": {"path": default_data_path()}})
+    config["data"]["path"] = os.path.abspath(config["data"]["path"])
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", help="Reviews.csv or Reviews.parquet (default: Reviews.parquet if present)")
+    parser.add_argument("--config", help="JSON file merged into the default configuration")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="override one setting, e.g. models.lr.C=0.5 (repeatable)")
+    parser.add_argument("--cache-dir", default=PIPELINE_DIR, help="stage cache (default: %(default)s)")
+    parser.add_argument("--export-dir", default=BASE_DIR, help="where the pickles are written (default: %(default)s)")
+    parser.add_argument("--no-export", action="store_true", help="train and evaluate only")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes fitting the models and calibration folds (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config, args.overrides, args.data)
+        unknown = set(config["models"]) - set(MODEL_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown model {', '.join(sorted(unknown))}; expected {', '.join(MODEL_KEYS)}")
+        pipeline = Pipeline(build_stages(config, None if args.no_export else args.export_dir), args.cache_dir)
+        if args.workers > 1:
+            from parallel_training import fit_pipeline_models
+            fit_pipeline_models(pipeline, args.workers)
+        results = pipeline.run()
+    except (OSError, ValueError) as e:
+        sys.exit(f"training_pipeline: {e}")
+
+    for kind in config["models"]:
+        print(f"{kind:<4} accuracy {results[f'evaluate_{kind}']['metrics']['accuracy']:.4f}")
+    if "export" in results:
+        for key, path in results["export"]["files"].items():
+            print(f"{key:<10} -> {path}")
+    print()
+    print(pipeline.summary())
+
+
+if __name__ == "__main__":
+    main()